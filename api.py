@@ -1,12 +1,35 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from api_utils.environment import setup_environment 
+from api_utils.environment import load_environment, setup_environment
+from api_utils.logging_setup import configure_logging
 
-setup_environment()  # <-- new, load environment at startup
+load_environment()  # .env first, so the LOG_* settings in it apply
+configure_logging()
+setup_environment()  # checks the loaded environment (.env is only read once, above)
 
 from api_utils.workflow import run_resume_enhancement_pipeline
+from api_utils.deadline import DeadlineExceeded, start_deadline
+from api_utils.metrics import REGISTRY, current_trace, stage, start_trace
+from api_utils.profiler import load_profile, profile_request, render_flamegraph_svg
+from api_utils.resume_store import load_resume, resume_id_from_digest, save_resume
+from api_utils.uploads import UPLOAD_ROUTES, UploadRejected, check_content_length, spool_upload
+from api_utils.warmup import start_background_warm_up, warm_up, warm_up_status
 from pydantic import BaseModel
-from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from contextlib import nullcontext
+from typing import List, Optional
+import contextvars
+import hmac
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Admin-only features (request profiling) are disabled unless this is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Load heavy dependencies and caches in the background at startup; /ready waits for it
+PREWARM_ON_STARTUP = os.getenv("PREWARM_ON_STARTUP", "false").lower() in ("1", "true", "yes")
 
 app = FastAPI()
 
@@ -19,52 +42,372 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Give each request a trace, then report its stage timings and latency."""
+    trace = start_trace()
+    start = time.perf_counter()
+    # Request deadlines count from here, not from when the handler gets to run
+    request.state.received_at = time.monotonic()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    REGISTRY.observe(
+        "rex_http_request_duration_seconds",
+        time.perf_counter() - start,
+        method=request.method,
+        path=getattr(route, "path", request.url.path),
+        status=response.status_code
+    )
+    server_timing = trace.server_timing()
+    if server_timing:
+        response.headers["Server-Timing"] = server_timing
+    return response
+
+@app.middleware("http")
+async def limit_upload_size(request, call_next):
+    """Answer 413 for an oversized upload from its Content-Length, before the body is received."""
+    if request.method == "POST" and request.url.path in UPLOAD_ROUTES:
+        try:
+            check_content_length(request.headers.get("content-length"))
+        except UploadRejected as e:
+            from fastapi.responses import JSONResponse
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    return await call_next(request)
+
+def require_admin(admin_token: Optional[str]):
+    if not ADMIN_TOKEN or not admin_token or not hmac.compare_digest(admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def profiling(profile: bool, admin_token: Optional[str], label: str):
+    """Profile the request when an admin asks for it (see profiler.py); a no-op otherwise."""
+    if not profile:
+        return nullcontext()
+    require_admin(admin_token)
+    return profile_request(label)
+
+async def run_in_request_context(fn, *args):
+    """
+    Run blocking work in the threadpool, in a copy of the request's context
+    so its trace, deadline and profiler follow it into the worker thread.
+    """
+    return await run_in_threadpool(contextvars.copy_context().run, fn, *args)
+
+async def read_upload(file: UploadFile):
+    """Spool an upload under the size cap (see uploads.py), answering 400/413/415 before any conversion."""
+    try:
+        return await spool_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
 class ResumeOptimizationRequest(BaseModel):
-    html_resume: str
+    html_resume: Optional[str] = None
+    resume_id: Optional[str] = None
     job_posting: str
+    deadline_seconds: Optional[float] = None  # defaults to REQUEST_DEADLINE_SECONDS
+
+class RankPostingsRequest(BaseModel):
+    html_resume: Optional[str] = None
+    resume_id: Optional[str] = None
+    top_k: int = 10
+
+class ExportRequest(BaseModel):
+    resume_text: str
+    style: str = "ATS-Friendly"
+    format: str = "PDF"
+    contact_info: Optional[dict] = None
+
+class ExportBundleRequest(BaseModel):
+    resume_text: str
+    job_posting: str = ""
+    score_report: Optional[dict] = None
+    contact_info: Optional[dict] = None
+    styles: Optional[List[str]] = None  # defaults to every available style
+    formats: List[str] = ["PDF", "DOCX", "TXT"]
+
+@app.on_event("startup")
+def prewarm():
+    if PREWARM_ON_STARTUP:
+        start_background_warm_up()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Resume Optimizer API"}
 
+@app.get("/ready")
+def ready(warm: bool = False):
+    """
+    Readiness probe. Returns 503 while the startup pre-warm (PREWARM_ON_STARTUP)
+    is still running. With warm=true, loads every lazy dependency and cache first.
+    """
+    from fastapi.responses import JSONResponse
+
+    status = warm_up() if warm else warm_up_status()
+    if PREWARM_ON_STARTUP and not status["warmed"]:
+        return JSONResponse(status_code=503, content={"ready": False, **status})
+    return {"ready": True, **status}
+
 @app.post("/extract-text")
-async def extract_text(file: UploadFile = File(...)):
+async def extract_text(file: UploadFile = File(...), compact: bool = True, profile: bool = False,
+                       x_admin_token: Optional[str] = Header(None)):
+    """
+    Convert an uploaded resume to HTML. By default the HTML is compacted
+    (see html_converter.compact_html): only headings, paragraphs and list
+    items remain, with attributes, inline formatting, links and tables
+    unwrapped to their text, since that is all the parser needs. Pass
+    compact=false for the converter's full HTML.
+    """
+    profiler_context = profiling(profile, x_admin_token, "/extract-text")
+    upload = await read_upload(file)
     try:
-        # Save uploaded file temporarily
-        temp_path = f"temp_upload.{file.filename.split('.')[-1]}"
-        with open(temp_path, "wb") as f_out:
-            content = await file.read()
-            f_out.write(content)
+        # Convert to HTML straight from the spooled upload, in the format its bytes declare
+        from api_utils.html_converter import convert_resume_file
+        with upload, profiler_context as profiler, stage("convert"):
+            html = convert_resume_file(upload.file, upload.format, compact=compact, name=file.filename or "upload")
+
+        result = {"html_resume": html}
+        if profiler:
+            result["profile_id"] = profiler.profile_id
+        return result
+    except Exception as e:
+        upload.close()
+        logger.exception("Error during /extract-text")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def store_resume(upload, filename: str, profiler_context) -> dict:
+    """
+    Convert, parse and store a spooled upload unless it is already stored.
+    Blocking (conversion and the LLM parse), so /resumes runs it in the threadpool.
+    """
+    resume_id = resume_id_from_digest(upload.sha256)
 
-        # Convert to HTML using updated converter
-        from api_utils.html_converter import convert_resume_to_html
-        html = convert_resume_to_html(temp_path)
+    stored = load_resume(resume_id)
+    if stored is not None:
+        upload.close()
+        return {"resume_id": resume_id, "html_resume": stored["html_resume"], "reused": True}
 
-        return {"html_resume": html}
+    # Convert straight from the spooled upload, so concurrent uploads never share a path
+    from api_utils.html_converter import convert_resume_file
+    from api_utils.gpt_parser import parse_resume_with_gpt
+
+    # Entered here so the profiler samples the worker thread doing the work
+    with profiler_context as profiler:
+        with upload, stage("convert"):
+            html = convert_resume_file(upload.file, upload.format, name=filename)
+
+        with stage("parse"):
+            sections = parse_resume_with_gpt(html)
+        if not sections:
+            raise ValueError("Resume could not be parsed into sections")
+
+        save_resume(resume_id, html, sections)
+    result = {"resume_id": resume_id, "html_resume": html, "reused": False}
+    if profiler:
+        result["profile_id"] = profiler.profile_id
+    return result
+
+
+@app.post("/resumes")
+async def create_resume(file: UploadFile = File(...), profile: bool = False,
+                        x_admin_token: Optional[str] = Header(None)):
+    """
+    Convert, parse and store a resume once so later optimizations can
+    reference it by resume_id instead of re-sending and re-parsing it.
+    """
+    profiler_context = profiling(profile, x_admin_token, "/resumes")
+    upload = await read_upload(file)
+    try:
+        return await run_in_request_context(store_resume, upload, file.filename or "upload", profiler_context)
     except Exception as e:
-        import traceback
-        print("❌ Error during /extract-text:")
-        traceback.print_exc()
+        upload.close()
+        logger.exception("Error during /resumes")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage, LLM and HTTP histograms plus token/cache counters."""
+    from fastapi.responses import PlainTextResponse
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def enhance_resume(html_resume: str, job_posting: str, sections: Optional[dict], profiler_context):
+    """
+    Run the enhancement pipeline under the request's deadline. Blocking (LLM
+    calls, waits of up to the deadline), so /optimize-resume runs it in the
+    threadpool. Returns the pipeline's result and the profiler, if any.
+    """
+    # Entered here so the profiler samples the worker thread driving the pipeline
+    with profiler_context as profiler:
+        result = run_resume_enhancement_pipeline(html_resume, job_posting, sections=sections)
+    return result, profiler
+
+
 @app.post("/optimize-resume")
-async def optimize_resume(request: ResumeOptimizationRequest):
+async def optimize_resume(request: ResumeOptimizationRequest, http_request: Request, debug: bool = False,
+                          profile: bool = False, x_admin_token: Optional[str] = Header(None)):
+    # Resolve the resume source: a stored resume_id skips conversion and parsing
+    sections = None
+    html_resume = request.html_resume
+    if request.resume_id:
+        stored = load_resume(request.resume_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail=f"Unknown resume_id: {request.resume_id}")
+        html_resume = stored["html_resume"]
+        sections = stored["sections"]
+    elif not html_resume:
+        raise HTTPException(status_code=422, detail="Provide either html_resume or resume_id")
+
+    profiler_context = profiling(profile, x_admin_token, "/optimize-resume")
+
+    # Every stage below runs against this deadline, counted from the request's arrival;
+    # slow ones degrade instead of hanging the request
+    deadline = start_deadline(request.deadline_seconds, started_at=http_request.state.received_at)
     try:
-        # Run enhancement pipeline
-        final_resume, score_report, contact_info = run_resume_enhancement_pipeline(
-            request.html_resume,
-            request.job_posting
+        # Run enhancement pipeline off the event loop, so concurrent requests run concurrently
+        (final_resume, score_report, contact_info), profiler = await run_in_request_context(
+            enhance_resume, html_resume, request.job_posting, sections, profiler_context
         )
 
-        # Return result
-        return {
+        # Return result (stage timings are also sent in the Server-Timing header)
+        result = {
             "enhanced_resume": final_resume,
             "score_report": score_report,
-            "contact_info": contact_info
+            "contact_info": contact_info,
+            "partial": deadline.partial,
+            "degraded_stages": deadline.degraded_stages
         }
+        if debug:
+            result["timings"] = current_trace().summary()
+        if profiler:
+            result["profile_id"] = profiler.profile_id
+        return result
+    except DeadlineExceeded as e:
+        # Nothing usable came back in time (the resume parse itself ran out)
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        import traceback
-        print("❌ API Error during resume optimization:")
-        traceback.print_exc()
+        logger.exception("Error during /optimize-resume")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/rank-postings")
+def rank_postings(request: RankPostingsRequest):
+    """
+    The stored postings (see posting_corpus.py) this resume fits best, each
+    with the per-category scores /optimize-resume would report for it.
+    No LLM calls are made.
+    """
+    from api_utils.posting_corpus import get_corpus
+
+    html_resume = request.html_resume
+    if request.resume_id:
+        stored = load_resume(request.resume_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail=f"Unknown resume_id: {request.resume_id}")
+        html_resume = stored["html_resume"]
+    elif not html_resume:
+        raise HTTPException(status_code=422, detail="Provide either html_resume or resume_id")
+    if not 1 <= request.top_k <= 100:
+        raise HTTPException(status_code=422, detail="top_k must be between 1 and 100")
+
+    try:
+        corpus = get_corpus()
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="No posting corpus; build one with scripts/build_posting_corpus.py")
+
+    with stage("rank"):
+        postings = corpus.rank(html_resume, request.top_k)
+    return {"postings": postings, "corpus_size": len(corpus)}
+
+
+@app.post("/export")
+def export_resume_file(request: ExportRequest, if_none_match: Optional[str] = Header(None), profile: bool = False,
+                       x_admin_token: Optional[str] = Header(None)):
+    """
+    Render the resume in one style and format. Results are cached by a hash of
+    the inputs, which is also returned as the ETag; a matching If-None-Match
+    gets a 304 without rendering. A profiled export always renders and
+    returns its profile id in the X-Profile-Id header.
+    """
+    from fastapi import Response
+    from app.export.export_cache import etag_matches
+    from app.export.resume_export import EXPORT_MEDIA_TYPES, export_etag, export_resume, get_available_styles
+
+    fmt = request.format.upper()
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=422, detail=f"Unknown format: {request.format}. Available: {list(EXPORT_MEDIA_TYPES)}")
+    if request.style not in get_available_styles():
+        raise HTTPException(status_code=422, detail=f"Unknown style: {request.style}. Available: {get_available_styles()}")
+
+    profiler_context = profiling(profile, x_admin_token, "/export")
+    etag = export_etag(request.resume_text, request.style, fmt, request.contact_info)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag) and not profile:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        with profiler_context as profiler:
+            etag, data = export_resume(request.resume_text, style=request.style, fmt=fmt,
+                                       contact_info=request.contact_info, use_cache=not profile)
+    except Exception as e:
+        logger.exception("Error during /export")
+        raise HTTPException(status_code=500, detail=str(e))
+    if profiler:
+        headers["X-Profile-Id"] = profiler.profile_id
+
+    headers["Content-Disposition"] = f'attachment; filename="resume.{fmt.lower()}"'
+    return Response(content=data, media_type=EXPORT_MEDIA_TYPES[fmt], headers=headers)
+
+
+@app.post("/export-bundle")
+def export_bundle(request: ExportBundleRequest):
+    """
+    Render the resume in every requested style × format and stream the files
+    back as a ZIP, along with the job posting and score report.
+    """
+    from fastapi.responses import StreamingResponse
+    from app.export.export_bundle import build_export_bundle
+
+    try:
+        chunks = build_export_bundle(
+            request.resume_text,
+            job_posting=request.job_posting,
+            score_report=request.score_report,
+            contact_info=request.contact_info,
+            styles=request.styles,
+            formats=request.formats
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resume_bundle.zip"'}
+    )
+
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = "json", x_admin_token: Optional[str] = Header(None)):
+    """
+    A stored request profile (admin only): the JSON report by default,
+    format=svg for the flame graph, or format=folded for the folded stacks.
+    """
+    from fastapi.responses import PlainTextResponse, Response
+
+    require_admin(x_admin_token)
+    report = load_profile(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile_id: {profile_id}")
+    if format == "svg":
+        title = f"{report['label']} profile {profile_id} ({report['samples']} samples)"
+        return Response(render_flamegraph_svg(report["folded"], title), media_type="image/svg+xml")
+    if format == "folded":
+        return PlainTextResponse("\n".join(report["folded"]) + "\n")
+    if format != "json":
+        raise HTTPException(status_code=422, detail="format must be json, svg or folded")
+    return report
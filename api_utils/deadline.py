@@ -0,0 +1,107 @@
+# deadline.py
+"""
+Per-request deadlines.
+
+Each /optimize-resume request runs under a Deadline. The Deadline is held in
+a context variable, like the metrics trace, so every stage sees it without
+extra arguments, and so does every worker thread submitted with
+`submit_in_context`. LLM calls never wait past it: chat_completion clamps
+each call's timeout to the time left and will not start a call once the time
+is up. A stage that gives up because of the deadline falls back to its local
+result (the original section text, or unfiltered and unclassified keywords)
+and is recorded as degraded, so the response can be marked partial.
+"""
+import contextvars
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from api_utils.metrics import REGISTRY
+
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "60"))
+# Time held back from LLM calls for assembling and scoring the final resume
+DEADLINE_FINALIZE_RESERVE = float(os.getenv("DEADLINE_FINALIZE_RESERVE", "1.0"))
+# With less time than this left, an LLM call is not worth starting
+DEADLINE_MIN_CALL_SECONDS = 0.5
+
+REGISTRY.describe("rex_degraded_stages_total", "Stages that fell back to a local result, by stage and reason.")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting (or retrying) an LLM call after the request's time is up."""
+
+
+class Deadline:
+    """Time budget of one request plus the stages that degraded to stay within it."""
+
+    def __init__(self, seconds: float = None, started_at: float = None):
+        self.seconds = REQUEST_DEADLINE_SECONDS if seconds is None else seconds
+        self.expires_at = (time.monotonic() if started_at is None else started_at) + self.seconds
+        self._lock = threading.Lock()
+        self.degraded: Dict[str, str] = {}
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def llm_time_left(self) -> float:
+        """Time LLM work may still take, keeping DEADLINE_FINALIZE_RESERVE for the rest of the request."""
+        return max(0.0, self.remaining() - DEADLINE_FINALIZE_RESERVE)
+
+    def degrade(self, stage_name: str, reason: str):
+        """Record that a stage fell back to its local result (first reason wins)."""
+        with self._lock:
+            if stage_name in self.degraded:
+                return
+            self.degraded[stage_name] = reason
+        REGISTRY.inc("rex_degraded_stages_total", stage=stage_name, reason=reason)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.degraded)
+
+    @property
+    def degraded_stages(self) -> List[str]:
+        with self._lock:
+            return sorted(self.degraded)
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("rex_deadline", default=None)
+
+
+def start_deadline(seconds: float = None, started_at: float = None) -> Deadline:
+    """
+    Give the current request a deadline `seconds` (REQUEST_DEADLINE_SECONDS by
+    default) after `started_at`, a time.monotonic() reading such as when the
+    request arrived; from now if not given.
+    """
+    deadline = Deadline(seconds, started_at)
+    _current_deadline.set(deadline)
+    return deadline
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def deadline_reached(stage_name: str) -> bool:
+    """True (and the stage recorded as degraded) when the current request has no time left for LLM calls."""
+    deadline = current_deadline()
+    if deadline is None or deadline.llm_time_left() >= DEADLINE_MIN_CALL_SECONDS:
+        return False
+    deadline.degrade(stage_name, "deadline")
+    return True
+
+
+def llm_call_timeout(stage_name: str, timeout: float) -> float:
+    """
+    Clamp an LLM call's timeout to the current request's deadline.
+
+    Raises:
+        DeadlineExceeded: if too little time is left to start the call
+            (the stage is recorded as degraded).
+    """
+    if deadline_reached(stage_name):
+        raise DeadlineExceeded(f"{stage_name}: request deadline reached")
+    deadline = current_deadline()
+    return timeout if deadline is None else min(timeout, deadline.llm_time_left())
@@ -1,8 +1,26 @@
+import logging
 import os
-from dotenv import load_dotenv
+import threading
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_environment():
+    """Load .env into the process environment, once per process."""
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import load_dotenv
+        load_dotenv()
+        _loaded = True
+
 
 def setup_environment():
-    load_dotenv()
+    load_environment()
     if not os.getenv("OPENAI_API_KEY"):
         raise ValueError("❌ OPENAI_API_KEY not found in .env file")
-    print("✅ Environment loaded.")
+    logger.info("Environment loaded.")
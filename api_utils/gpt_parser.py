@@ -1,14 +1,264 @@
-import os
-import openai
-import dotenv
 import json
+import logging
 import re
+from typing import Iterator, List
 
-# Load environment variables from .env file
-dotenv.load_dotenv()
+from api_utils.json_stream import SectionEvent, SectionStreamParser
+from api_utils.llm_client import chat_completion
+from api_utils.logging_setup import log_sampled, truncated
+
+logger = logging.getLogger(__name__)
+
+class ResumeParseError(ValueError):
+    """Raised when GPT output cannot be turned into any resume sections."""
+
+
+# === Declared output schema (sent to the API and used to validate each streamed section) ===
+JOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "company": {"type": "string"},
+        "date_range": {"type": "string"},
+        "bullets": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["title", "company", "date_range", "bullets"],
+}
+
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "contact_info": {
+            "type": "object",
+            "properties": {
+                field: {"type": "string"}
+                for field in ("name", "title", "email", "phone", "location", "linkedin", "github", "website")
+            },
+        },
+        "summary": {"type": "string"},
+        "skills": {"type": ["string", "array", "object"]},
+        "experience": {"type": "array", "items": JOB_SCHEMA},
+        "education": {"type": ["string", "array"]},
+        "projects": {"type": ["string", "array"]},
+    },
+    "required": ["contact_info", "summary", "skills", "experience", "education", "projects"],
+}
+
+# Arrays whose elements are handed downstream one by one as they stream in
+STREAMED_ARRAYS = {"experience"}
+
+_JSON_TYPES = {
+    "string": str,
+    "array": list,
+    "object": dict,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def schema_errors(schema: dict, value, path: str = "$") -> List[str]:
+    """
+    Validate `value` against the subset of JSON Schema used in RESUME_SCHEMA
+    (type, properties, required, items). Returns a list of error strings.
+    """
+    errors = []
+
+    types = schema.get("type")
+    if types:
+        types = types if isinstance(types, list) else [types]
+        if not any(isinstance(value, _JSON_TYPES[t]) for t in types):
+            return [f"{path}: expected {' or '.join(types)}, got {type(value).__name__}"]
+
+    if isinstance(value, dict):
+        for field in schema.get("required", []):
+            if field not in value:
+                errors.append(f"{path}: missing required field '{field}'")
+        for field, subschema in schema.get("properties", {}).items():
+            if field in value:
+                errors.extend(schema_errors(subschema, value[field], f"{path}.{field}"))
+
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(schema_errors(schema["items"], item, f"{path}[{i}]"))
+
+    return errors
+
+
+def _event_schema(event: SectionEvent) -> dict:
+    section_schema = RESUME_SCHEMA["properties"].get(event.key, {})
+    if event.index is not None:
+        return section_schema.get("items", {})
+    return section_schema
+
+
+def _build_parse_messages(html_resume: str) -> list:
+    system_prompt = (
+        "You are a resume parser. Given a resume in HTML format, extract each logical section and return it as structured JSON. "
+        "Do not modify, rewrite, summarize, or enhance any content. Preserve original bullet points and section text exactly as-is.\n\n"
+        "🎯 JSON output must include:\n"
+        "- contact_info (see format below)\n"
+        "- summary\n"
+        "- skills\n"
+        "- experience (as list of jobs)\n"
+        "- education\n"
+        "- projects\n\n"
+
+        "🧾 For `contact_info`, infer any of the following fields from the top of the resume:\n"
+        "  'name', 'title', 'email', 'phone', 'location', 'linkedin', 'github', 'website'\n"
+        "Only include fields that can be reasonably inferred.\n\n"
+                "Normalize similar section headers as follows:\n"
+                "- 'Professional Summary', 'Objective', 'Overview' → 'summary'\n"
+                "- 'Technical Skills', 'Tools', 'Tech Stack' → 'skills'\n"
+                "- 'Work History', 'Professional Experience', 'Employment' → 'experience'\n"
+                "- 'Education and Certifications', 'Certifications', 'Degrees' → 'education'\n"
+                "- 'Projects', 'Capstone Projects', 'Independent Work', 'Freelance', 'Other Work' → 'projects'\n\n"
+                "Return only a JSON object with keys: summary, skills, education, experience, and projects."
+    )
+
+
+    user_prompt = f"""HTML RESUME:
+    {html_resume}
+
+    Return only a JSON object with keys: summary, skills, education, experience, and projects.
+
+    👉 Treat all non-standard sections (e.g., 'Independent Learning', 'Training', 'Other Work', 'Capstones', 'Certifications') as part of `projects` if they contain relevant bullets or work.
+
+    👉 For certifications or short courses that don’t belong in `projects`, fold them into the `education` field as a bullet or short list.
+
+    Do not return extra keys beyond those listed. Reclassify or discard irrelevant/unstructured text.
+
+
+    For the `experience` key:
+    - Return a list of job objects.
+    - Each job object MUST contain:
+    - "title"
+    - "company"
+    - "date_range"
+    - "bullets" ← (this must be the field name)
+    - Do NOT use any alternative keys like "responsibilities" or "tasks".
+
+    """
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _retry_section_with_gpt(html_resume: str, event: SectionEvent, problems: List[str]):
+    """
+    Re-request a single malformed section (or a single experience job)
+    instead of re-parsing the whole resume.
+    """
+    schema = _event_schema(event)
+    target = f"job #{event.index + 1} of `{event.key}`" if event.index is not None else f"`{event.key}`"
+
+    prompt = (
+        f"You previously extracted {target} from the resume below, but the JSON was invalid.\n"
+        f"Problems: {'; '.join(problems)}\n\n"
+        f"Invalid fragment:\n{event.raw}\n\n"
+        f"HTML RESUME:\n{html_resume}\n\n"
+        f"Return only a JSON object of the form {{\"value\": ...}} where value matches this JSON schema:\n"
+        f"{json.dumps(schema)}\n"
+        "Do not modify, rewrite, summarize, or enhance any content."
+    )
+
+    response = chat_completion(
+        "parse",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0,
+        response_format={"type": "json_object"},
+    )
+    value = json.loads(response.choices[0].message.content)["value"]
+
+    retry_problems = schema_errors(schema, value)
+    if retry_problems:
+        raise ResumeParseError(f"Retry for {target} still invalid: {'; '.join(retry_problems)}")
+    return value
+
+
+def stream_resume_sections(html_resume: str) -> Iterator[SectionEvent]:
+    """
+    Stream the GPT parse of a resume and yield each section as soon as it is complete.
+
+    Yields SectionEvent(key, value, index): one per top-level section, plus one per
+    experience job (index set) before the full 'experience' section event. Every
+    yielded value has been validated against RESUME_SCHEMA; a malformed section or
+    job gets one targeted retry and is dropped if that retry also fails.
+
+    Raises:
+        ResumeParseError: if the response contained no JSON object at all.
+    """
+    parser = SectionStreamParser(stream_arrays=STREAMED_ARRAYS)
+
+    response = chat_completion(
+        "parse",
+        messages=_build_parse_messages(html_resume),
+        temperature=0.3,
+        stream=True,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "resume", "schema": RESUME_SCHEMA},
+        },
+    )
+
+    emitted_any = False
+    # Validated (or repaired) array items per key; None marks a dropped item
+    streamed_items = {}
+
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.get("content") or ""
+        if not delta:
+            continue
+
+        for event in parser.feed(delta):
+            if event.key not in RESUME_SCHEMA["properties"]:
+                continue  # prompt forbids extra keys; ignore any that slip through
+
+            if event.index is None and event.key in streamed_items:
+                # Items were already validated and retried one by one as they streamed
+                items = streamed_items.pop(event.key)
+                emitted_any = True
+                yield event._replace(value=[items[i] for i in sorted(items) if items[i] is not None], error=None)
+                continue
+
+            problems = [event.error] if event.error else schema_errors(_event_schema(event), event.value)
+            if problems:
+                logger.warning("Malformed resume section %s[%s]: %s; fragment: %s",
+                               event.key, event.index, problems, truncated(event.raw))
+                try:
+                    event = event._replace(value=_retry_section_with_gpt(html_resume, event, problems), error=None)
+                except Exception as e:
+                    logger.warning("Section retry failed for %s[%s]: %s", event.key, event.index, e)
+                    if event.index is not None:
+                        streamed_items.setdefault(event.key, {})[event.index] = None
+                    continue
+
+            if event.index is not None:
+                streamed_items.setdefault(event.key, {})[event.index] = event.value
+
+            emitted_any = True
+            yield event
+
+    if not emitted_any:
+        raise ResumeParseError("GPT did not return a parseable resume JSON object.")
+
+
+def sections_to_events(sections: dict) -> Iterator[SectionEvent]:
+    """
+    Replay an already-parsed sections dict (e.g. from the resume store)
+    as the same event sequence stream_resume_sections() produces.
+    """
+    for key, value in sections.items():
+        if key in STREAMED_ARRAYS and isinstance(value, list):
+            for i, item in enumerate(value):
+                yield SectionEvent(key, item, i)
+        yield SectionEvent(key, value)
 
-# Set the OpenAI API key
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 def parse_resume_with_gpt(html_resume: str) -> dict:
     """
@@ -21,105 +271,18 @@ def parse_resume_with_gpt(html_resume: str) -> dict:
         dict: A dictionary with keys: summary, skills, experience, education.
               The 'experience' value should be a list of job dictionaries:
               Each job should have: title, company, date_range, and bullets (list of strings).
+
+    Raises:
+        ResumeParseError: if GPT did not return a usable JSON object.
     """
-    try:
-        # Construct the system and user prompts
-        system_prompt = (
-            "You are a resume parser. Given a resume in HTML format, extract each logical section and return it as structured JSON. "
-            "Do not modify, rewrite, summarize, or enhance any content. Preserve original bullet points and section text exactly as-is.\n\n"
-            "🎯 JSON output must include:\n"
-            "- contact_info (see format below)\n"
-            "- summary\n"
-            "- skills\n"
-            "- experience (as list of jobs)\n"
-            "- education\n"
-            "- projects\n\n"
-
-            "🧾 For `contact_info`, infer any of the following fields from the top of the resume:\n"
-            "  'name', 'title', 'email', 'phone', 'location', 'linkedin', 'github', 'website'\n"
-            "Only include fields that can be reasonably inferred.\n\n"
-                    "Normalize similar section headers as follows:\n"
-                    "- 'Professional Summary', 'Objective', 'Overview' → 'summary'\n"
-                    "- 'Technical Skills', 'Tools', 'Tech Stack' → 'skills'\n"
-                    "- 'Work History', 'Professional Experience', 'Employment' → 'experience'\n"
-                    "- 'Education and Certifications', 'Certifications', 'Degrees' → 'education'\n"
-                    "- 'Projects', 'Capstone Projects', 'Independent Work', 'Freelance', 'Other Work' → 'projects'\n\n"
-                    "Return only a JSON object with keys: summary, skills, education, experience, and projects."
-        )
-
-
-        user_prompt = f"""HTML RESUME:
-        {html_resume}
-
-        Return only a JSON object with keys: summary, skills, education, experience, and projects.
-
-        👉 Treat all non-standard sections (e.g., 'Independent Learning', 'Training', 'Other Work', 'Capstones', 'Certifications') as part of `projects` if they contain relevant bullets or work.
-
-        👉 For certifications or short courses that don’t belong in `projects`, fold them into the `education` field as a bullet or short list.
-
-        Do not return extra keys beyond those listed. Reclassify or discard irrelevant/unstructured text.
-
-
-        For the `experience` key:
-        - Return a list of job objects.
-        - Each job object MUST contain:
-        - "title"
-        - "company"
-        - "date_range"
-        - "bullets" ← (this must be the field name)
-        - Do NOT use any alternative keys like "responsibilities" or "tasks".
-
-        """
-
-        # Call the OpenAI API
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3
-        )
-
-        # Parse the response
-        parsed_response = response.choices[0].message.content.strip()
-        # DEBUG
-        print("GPT RAW RESPONSE:\n", parsed_response)
-        # Strip markdown-style triple backticks
-
-        if parsed_response.startswith("```json"):
-            parsed_response = parsed_response.replace("```json", "").strip()
-        if parsed_response.endswith("```"):
-            parsed_response = parsed_response[:-3].strip()
-
-        # Try JSON parse
-        # Sanitize GPT output before parsing
-        if parsed_response.startswith("```json"):
-            parsed_response = parsed_response.replace("```json", "").strip()
-        if parsed_response.endswith("```"):
-            parsed_response = parsed_response[:-3].strip()
-
-        # Strip leading/trailing junk
-        parsed_response = parsed_response.strip().strip("`").strip()
-
-        # Try to extract valid JSON from middle of a mess
-        try:
-            json_start = parsed_response.find('{')
-            json_end = parsed_response.rfind('}') + 1
-            clean_json = parsed_response[json_start:json_end]
-            parsed_json = json.loads(clean_json)
-            return parsed_json
-        except Exception as e:
-            print("❌ GPT did not return valid JSON.")
-            print(parsed_response)
-            print("Error:", e)
-            return {}
-
-
-    except Exception as e:
-        print(f"Error parsing resume: {e}")
-        return {}
+    sections = {
+        event.key: event.value
+        for event in stream_resume_sections(html_resume)
+        if event.index is None
+    }
+    log_sampled(logger, "Parsed resume sections: %s", truncated(sections))
+    return sections
+
 
 if __name__ == "__main__":
     # Load a sample HTML resume from a file for testing
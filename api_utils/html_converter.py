@@ -1,61 +1,227 @@
+import io
+import logging
 import os
 import subprocess
-import tempfile
-import mammoth
-import pypandoc
-from pdf2docx import Converter
 import re
+from html import escape
+from html.parser import HTMLParser
 
+logger = logging.getLogger(__name__)
 
-def convert_resume_to_html(file_path: str) -> str:
+# Tags kept by compact_html(); everything else is unwrapped to its text
+COMPACT_BLOCK_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "p", "li"}
+
+# Tags that end the current block of text even though they are not kept
+COMPACT_SEPARATOR_TAGS = {
+    "br", "div", "ul", "ol", "table", "thead", "tbody", "tr", "td", "th",
+    "section", "article", "header", "footer", "blockquote", "hr", "dl", "dt", "dd",
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Line prefixes that mark a bullet in PDF text
+PDF_BULLET_CHARS = ("•", "●", "▪", "◦", "■", "□", "◆", "♦", "-", "–", "*")
+
+
+def _discard_image(image) -> list:
     """
-    Converts a resume file (.pdf, .docx, or .txt) to clean, readable HTML.
-    Returns HTML string content for downstream GPT-based parsing.
+    mammoth image handler that drops every image at the source.
+
+    Returning no nodes means mammoth never opens the image part, so nothing
+    is read, base64-encoded or written into the HTML.
+    """
+    return []
+
+
+def _docx_to_html(docx_file) -> str:
+    import mammoth  # imported on first DOCX upload, not at startup
+
+    result = mammoth.convert_to_html(docx_file, convert_image=_discard_image)
+    return result.value
+
+
+def _pdf_to_html(pdf_file) -> str:
+    """
+    Extract PDF text with pdfminer and emit one <p> per text box and one <li>
+    per bullet. Image XObjects are never decoded or rasterized.
+    """
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer, LTTextLine
+
+    blocks = []
+    for page in extract_pages(pdf_file):
+        for element in page:
+            if not isinstance(element, LTTextContainer):
+                continue  # images, figures and drawings carry no resume text
+
+            current_tag, current_lines = "p", []
+            for line in element:
+                text = line.get_text().strip() if isinstance(line, LTTextLine) else ""
+                if not text:
+                    continue
+                if text.startswith(PDF_BULLET_CHARS):
+                    if current_lines:
+                        blocks.append((current_tag, " ".join(current_lines)))
+                    current_tag, current_lines = "li", [text.lstrip("".join(PDF_BULLET_CHARS) + " \t")]
+                else:
+                    # Wrapped continuation lines stay with the current paragraph/bullet
+                    current_lines.append(text)
+            if current_lines:
+                blocks.append((current_tag, " ".join(current_lines)))
+
+    return "".join(f"<{tag}>{escape(text, quote=False)}</{tag}>" for tag, text in blocks)
+
+
+class _CompactingParser(HTMLParser):
+    """Flattens arbitrary HTML into a list of (tag, text) blocks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._stack = []  # (open tag, tag its text is emitted as)
+        self._buffer = []
+
+    def _flush(self):
+        text = _WHITESPACE_RE.sub(" ", "".join(self._buffer)).strip()
+        self._buffer = []
+        if text:
+            tag = self._stack[-1][1] if self._stack else "p"
+            self.blocks.append((tag, text))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in COMPACT_BLOCK_TAGS:
+            self._flush()
+            # mammoth wraps list item text in <p>; keep it a list item
+            inside_li = self._stack and self._stack[-1][1] == "li"
+            self._stack.append((tag, "li" if tag == "p" and inside_li else tag))
+        elif tag in COMPACT_SEPARATOR_TAGS:
+            self._flush()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in COMPACT_BLOCK_TAGS or tag in COMPACT_SEPARATOR_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in COMPACT_BLOCK_TAGS:
+            self._flush()
+            # Pop back to the matching open tag; tolerate unbalanced markup
+            if any(open_tag == tag for open_tag, _ in self._stack):
+                while self._stack.pop()[0] != tag:
+                    pass
+        elif tag in COMPACT_SEPARATOR_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Count GPT tokens with tiktoken when available, else approximate (~4 chars/token).
     """
     try:
-        file_extension = os.path.splitext(file_path)[1].lower()
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except ImportError:
+        return (len(text) + 3) // 4
 
-        if file_extension == '.pdf':
-            from pdf2docx import Converter
-            import uuid
 
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Convert PDF to temporary .docx
-                docx_path = os.path.join(temp_dir, f"{uuid.uuid4().hex}.docx")
-                converter = Converter(file_path)
-                converter.convert(docx_path, start=0, end=None)
-                converter.close()
+def compact_html_with_stats(html_content: str) -> tuple[str, dict]:
+    """
+    Reduce HTML to a minimal semantic form for GPT: only headings, paragraphs
+    and list items, with whitespace collapsed and empty nodes dropped.
+
+    Returns:
+        (compact_html, stats) where stats reports character and token counts
+        before/after and the percentage reduction of each.
+    """
+    parser = _CompactingParser()
+    parser.feed(html_content)
+    parser.close()
+
+    compact = "".join(f"<{tag}>{escape(text, quote=False)}</{tag}>" for tag, text in parser.blocks)
+
+    chars_before, chars_after = len(html_content), len(compact)
+    tokens_before, tokens_after = estimate_tokens(html_content), estimate_tokens(compact)
+    stats = {
+        "chars_before": chars_before,
+        "chars_after": chars_after,
+        "char_reduction_pct": round((1 - chars_after / chars_before) * 100, 1) if chars_before else 0.0,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "token_reduction_pct": round((1 - tokens_after / tokens_before) * 100, 1) if tokens_before else 0.0,
+    }
+    return compact, stats
+
+
+def compact_html(html_content: str) -> str:
+    """Compact HTML for GPT input. See compact_html_with_stats()."""
+    return compact_html_with_stats(html_content)[0]
+
 
-                # Use mammoth to convert DOCX to HTML
-                with open(docx_path, "rb") as docx_file:
-                    result = mammoth.convert_to_html(docx_file)
-                    html_content = result.value
+def convert_resume_to_html(file_path: str, compact: bool = True) -> str:
+    """
+    Converts a resume file (.pdf, .docx, or .txt) to clean, readable HTML.
+    Returns HTML string content for downstream GPT-based parsing.
+
+    With compact=True (default) the HTML is reduced to headings, paragraphs
+    and list items to minimize tokens sent to GPT.
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+    try:
+        with open(file_path, 'rb') as resume_file:
+            return convert_resume_file(resume_file, file_extension, compact=compact,
+                                       name=os.path.basename(file_path))
+    except OSError as e:
+        logger.error("Error converting %s: %s", os.path.basename(file_path), e)
+        return ""
 
 
+def convert_resume_file(resume_file, file_extension: str, compact: bool = True, name: str = "upload") -> str:
+    """
+    convert_resume_to_html() for an open binary file (e.g. a spooled upload)
+    whose format is already known. `file_extension` is '.pdf', '.docx' or '.txt';
+    `name` is only used in log messages.
+    """
+    try:
+        if file_extension == '.pdf':
+            # Text-only extraction: no PDF → DOCX round trip, no image rendering
+            html_content = _pdf_to_html(resume_file)
+
         elif file_extension == '.docx':
-            with open(file_path, 'rb') as docx_file:
-                result = mammoth.convert_to_html(docx_file)
-                html_content = result.value
+            # Images are dropped by the handler, so no base64 ever enters the HTML
+            html_content = _docx_to_html(resume_file)
 
         elif file_extension == '.txt':
+            data = resume_file.read()
             try:
-                with open(file_path, 'r', encoding='utf-8') as txt_file:
-                    lines = txt_file.readlines()
+                text = data.decode('utf-8')
             except UnicodeDecodeError:
-                with open(file_path, 'r', encoding='latin-1') as txt_file:
-                    lines = txt_file.readlines()
+                text = data.decode('latin-1')
+            lines = io.StringIO(text, newline=None).readlines()
 
-            html_content = ''.join(f'<p>{line.strip()}</p>' for line in lines)
+            html_content = ''.join(f'<p>{escape(line.strip(), quote=False)}</p>' for line in lines)
 
 
         else:
             raise ValueError("Unsupported file format")
-    
-        html_content = re.sub(r'<img\s+src="data:image/[^>]+>', '', html_content)
+
+        if compact:
+            html_content, stats = compact_html_with_stats(html_content)
+            logger.info(
+                "Compacted %s: %s -> %s chars (-%s%%), %s -> %s tokens (-%s%%)",
+                name,
+                stats['chars_before'], stats['chars_after'], stats['char_reduction_pct'],
+                stats['tokens_before'], stats['tokens_after'], stats['token_reduction_pct'],
+            )
         return html_content
 
     except Exception as e:
-        print(f"Error converting file: {e}")
+        logger.error("Error converting %s: %s", name, e)
         return ""
 
 
@@ -0,0 +1,166 @@
+# json_stream.py
+import json
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+
+class SectionEvent(NamedTuple):
+    """
+    A completed piece of a streamed top-level JSON object.
+
+    key:   Top-level key the value belongs to (e.g. 'summary', 'experience').
+    value: Decoded JSON value, or None if the fragment was not valid JSON.
+    index: Position within a streamed array (e.g. the n-th experience job),
+           None for whole sections.
+    raw:   The raw JSON text of the fragment, kept for targeted retries.
+    error: Decode error message if the fragment was malformed.
+    """
+    key: str
+    value: Any
+    index: Optional[int] = None
+    raw: str = ""
+    error: Optional[str] = None
+
+
+class SectionStreamParser:
+    """
+    Incremental parser for a JSON object streamed in arbitrary text chunks.
+
+    Emits a SectionEvent as soon as each top-level member is complete, and
+    for keys listed in `stream_arrays` also emits each array element as soon
+    as that element is complete. Leading junk before the first '{' (such as
+    a ```json fence) and anything after the closing '}' is ignored.
+    """
+
+    def __init__(self, stream_arrays: Iterable[str] = ()):
+        self.stream_arrays = set(stream_arrays)
+        self.done = False
+
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        # Top-level member state: 'key' → 'colon' → 'value' → 'in_value'
+        self._expect = "key"
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+        # Streamed array element state
+        self._in_stream_array = False
+        self._item_start = None
+        self._item_index = 0
+
+    def feed(self, chunk: str) -> List[SectionEvent]:
+        """Consume the next chunk of text and return any newly completed events."""
+        self._text += chunk
+        events = []
+
+        text = self._text
+        for i in range(self._pos, len(text)):
+            if self.done:
+                break
+            self._step(text, i, text[i], events)
+        self._pos = len(text)
+
+        return events
+
+    def _step(self, text: str, i: int, c: str, events: List[SectionEvent]) -> None:
+        if not self._started:
+            if c == "{":
+                self._started = True
+                self._depth = 1
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                if self._depth == 1 and self._expect == "key" and self._key_start is not None:
+                    self._key = json.loads(text[self._key_start:i + 1])
+                    self._key_start = None
+                    self._expect = "colon"
+            return
+
+        if c.isspace():
+            return
+
+        if c == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect == "key":
+                self._key_start = i
+                return
+            self._mark_value_start(i)
+            return
+
+        if c == ":" and self._depth == 1 and self._expect == "colon":
+            self._expect = "value"
+            return
+
+        if c in "{[":
+            opens_stream_array = (
+                c == "[" and self._depth == 1 and self._expect == "value"
+                and self._key in self.stream_arrays
+            )
+            self._mark_value_start(i)
+            if opens_stream_array:
+                self._in_stream_array = True
+                self._item_start = None
+                self._item_index = 0
+            self._depth += 1
+            return
+
+        if c in "}]":
+            self._depth -= 1
+            if self._depth == 1 and c == "]" and self._in_stream_array:
+                self._finish_item(text, i, events)
+                self._in_stream_array = False
+            elif self._depth == 0:
+                if self._expect == "in_value":
+                    self._finish_value(text, i, events)
+                self.done = True
+            return
+
+        if c == ",":
+            if self._depth == 1 and self._expect == "in_value":
+                self._finish_value(text, i, events)
+            elif self._depth == 2 and self._in_stream_array:
+                self._finish_item(text, i, events)
+            return
+
+        # Start of a bare scalar (number, true, false, null)
+        self._mark_value_start(i)
+
+    def _mark_value_start(self, i: int) -> None:
+        if self._depth == 1 and self._expect == "value":
+            self._value_start = i
+            self._expect = "in_value"
+        elif self._depth == 2 and self._in_stream_array and self._item_start is None:
+            self._item_start = i
+
+    def _finish_value(self, text: str, end: int, events: List[SectionEvent]) -> None:
+        raw = text[self._value_start:end].strip()
+        events.append(self._decode(self._key, raw, None))
+        self._key = None
+        self._value_start = None
+        self._expect = "key"
+
+    def _finish_item(self, text: str, end: int, events: List[SectionEvent]) -> None:
+        if self._item_start is None:
+            return  # empty array or trailing comma
+        raw = text[self._item_start:end].strip()
+        events.append(self._decode(self._key, raw, self._item_index))
+        self._item_start = None
+        self._item_index += 1
+
+    @staticmethod
+    def _decode(key: str, raw: str, index: Optional[int]) -> SectionEvent:
+        try:
+            return SectionEvent(key, json.loads(raw), index, raw)
+        except json.JSONDecodeError as e:
+            return SectionEvent(key, None, index, raw, str(e))
@@ -0,0 +1,69 @@
+# keyword_cache.py
+"""
+Persistent caches of LLM keyword answers (filtered keyword lists, keyword
+categories), each a JSON file in the working directory.
+
+A cache file is only read on first use, so importing the pipeline stays
+cheap and a process that never filters or classifies never parses it.
+Request threads write entries concurrently; `save()` serializes a snapshot
+taken under the lock and swaps it in with os.replace, so readers never see
+a partial file.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class KeywordCache:
+    """A JSON object on disk, loaded on first access and rewritten by `save()`."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # snapshots reach the file in the order they were taken
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _entries(self) -> dict:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    if self.path.exists():
+                        with open(self.path, "r") as f:
+                            self._data = json.load(f)
+                    else:
+                        self._data = {}
+        return self._data
+
+    def load(self) -> "KeywordCache":
+        """Read the file now (e.g. while warming up) instead of on first lookup."""
+        self._entries()
+        return self
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries()
+
+    def __getitem__(self, key):
+        return self._entries()[key]
+
+    def __setitem__(self, key, value):
+        entries = self._entries()
+        with self._lock:
+            entries[key] = value
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def save(self):
+        entries = self._entries()
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(entries)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_path, self.path)
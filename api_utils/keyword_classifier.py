@@ -1,18 +1,15 @@
 # keyword_classifier.py
-import json
-from pathlib import Path
-import os
+import logging
 from typing import List, Dict
-import openai
-from dotenv import load_dotenv
 
-# Persistent GPT classification cache
-CACHE_PATH = Path("classified_keywords_cache.json")
-if CACHE_PATH.exists():
-    with open(CACHE_PATH, "r") as f:
-        keyword_cache = json.load(f)
-else:
-    keyword_cache = {}
+from api_utils.keyword_cache import KeywordCache
+from api_utils.llm_client import chat_completion
+from api_utils.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# Persistent GPT classification cache (read on first use)
+keyword_cache = KeywordCache("classified_keywords_cache.json")
 
 
 # === Normalize fuzzy keyword variants ===
@@ -90,14 +87,13 @@ CATEGORIES = {
 }
 
 
-# Load key for fallback GPT use
-load_dotenv()
-
-def fallback_classify_with_gpt(keyword: str, model="gpt-4") -> str:
+def fallback_classify_with_gpt(keyword: str, model=None) -> str:
     norm_kw = keyword.lower().strip()
     
     if norm_kw in keyword_cache:
+        record_cache_lookup("classify", hit=True)
         return keyword_cache[norm_kw]
+    record_cache_lookup("classify", hit=False)
     
     prompt = (
         f"Classify the term '{keyword}' into one of the following categories:\n"
@@ -110,7 +106,8 @@ def fallback_classify_with_gpt(keyword: str, model="gpt-4") -> str:
     )
 
     try:
-        response = openai.ChatCompletion.create(
+        response = chat_completion(
+            "classify",
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.0,
@@ -121,17 +118,16 @@ def fallback_classify_with_gpt(keyword: str, model="gpt-4") -> str:
 
         # Force fallback to 'other' if it doesn't match any known category
         if label not in CATEGORIES:
-            print(f"[Fallback Warning] Unexpected GPT label: '{label}' → defaulting to 'other'")
+            logger.warning("Unexpected GPT label %r for %r, defaulting to 'other'", label, norm_kw)
             label = "other"
         
         keyword_cache[norm_kw] = label
-        with open(CACHE_PATH, "w") as f:
-            json.dump(keyword_cache, f, indent=2)
+        keyword_cache.save()
 
         return label
     
     except Exception as e:
-        print(f"[GPT fallback error] {e}")
+        logger.warning("GPT keyword classification failed for %r: %s", norm_kw, e)
         return "other"
 
 def classify_keywords(keywords: List[str]) -> Dict[str, List[str]]:
@@ -155,7 +151,7 @@ def classify_keywords(keywords: List[str]) -> Dict[str, List[str]]:
 
         if not matched:
             gpt_category = fallback_classify_with_gpt(norm_kw)
-            print(f"[GPT fallback] '{kw}' → {gpt_category}")  # 🔍 Optional debug log
+            logger.debug("GPT fallback classified %r as %s", kw, gpt_category)
             if gpt_category in result:
                 result[gpt_category].append(kw)
             else:
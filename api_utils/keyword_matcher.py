@@ -1,15 +1,13 @@
 import re
-import openai
-from dotenv import load_dotenv
-import os
-import json
+import logging
 from hashlib import md5
-from pathlib import Path
 from typing import List
+from api_utils.keyword_cache import KeywordCache
 from api_utils.keyword_classifier import normalize_keyword
+from api_utils.llm_client import chat_completion
+from api_utils.metrics import record_cache_lookup
 
-MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4")
-
+logger = logging.getLogger(__name__)
 
 # === STOPWORDS for filtering generic words ===
 STOPWORDS = {
@@ -64,14 +62,9 @@ def extract_keywords(job_text: str) -> set:
     return keywords
 
 # === GPT filter to remove irrelevant keywords ===
-FILTER_CACHE_PATH = Path("filtered_keywords_cache.json")
-if FILTER_CACHE_PATH.exists():
-    with open(FILTER_CACHE_PATH, "r") as f:
-        filter_cache = json.load(f)
-else:
-    filter_cache = {}
-
-def filter_relevant_keywords(all_keywords: List[str], model=MODEL_NAME, job_id=None, debug: bool = False) -> List[str]:
+filter_cache = KeywordCache("filtered_keywords_cache.json")  # read on first use
+
+def filter_relevant_keywords(all_keywords: List[str], model=None, job_id=None, debug: bool = False) -> List[str]:
     # === Normalize and dedupe ===
     filtered_input = sorted(set(normalize_keyword(k) for k in all_keywords if len(k) > 3))
     
@@ -81,7 +74,9 @@ def filter_relevant_keywords(all_keywords: List[str], model=MODEL_NAME, job_id=N
 
     # === Cache hit ===
     if job_id in filter_cache:
+        record_cache_lookup("filter", hit=True)
         return filter_cache[job_id]
+    record_cache_lookup("filter", hit=False)
 
     prompt = (
         "You are helping clean a list of job posting keywords for a resume enhancement tool.\n"
@@ -106,37 +101,33 @@ def filter_relevant_keywords(all_keywords: List[str], model=MODEL_NAME, job_id=N
     )
 
 
-    load_dotenv()
-    
-
-    response = openai.ChatCompletion.create(
-        model=model,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.0,
-    )
-
     try:
+        # Also covers provider errors and a spent request deadline: keep every keyword
+        response = chat_completion(
+            "filter",
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.0,
+        )
         filtered = eval(response.choices[0].message.content.strip())
         filtered = [k.lower().strip() for k in filtered]
 
         if debug:
-            print(f"\n🧠 Filtered Keywords:\n{filtered}\n")
-            removed = set(filtered_input) - set(filtered)
-            print(f"❌ Removed Keywords:\n{sorted(removed)}\n")
+            logger.info("Filtered keywords: %s", filtered)
+            logger.info("Removed keywords: %s", sorted(set(filtered_input) - set(filtered)))
 
         # ✅ Cache the result
         filter_cache[job_id] = filtered
-        with open(FILTER_CACHE_PATH, "w") as f:
-            json.dump(filter_cache, f, indent=2)
+        filter_cache.save()
 
         return filtered
 
     except Exception as e:
-        print(f"[GPT keyword filter error] {e}")
+        logger.warning("GPT keyword filter failed, keeping all keywords: %s", e)
         return all_keywords
     
 # === Match GPT-filtered keywords against full resume text ===
-def compute_keyword_match(resume_text: str, job_text: str, model="gpt-4") -> dict:
+def compute_keyword_match(resume_text: str, job_text: str, model=None) -> dict:
     raw_keywords = extract_keywords(job_text)
     job_keywords = filter_relevant_keywords(raw_keywords, model=model)
     resume_text_lower = resume_text.lower()
@@ -1,5 +1,8 @@
+import logging
 from typing import List,Dict
 
+logger = logging.getLogger(__name__)
+
 #Define weights for each keyword category (importance in scoring)
 
 CATEGORY_WEIGHTS = {
@@ -92,25 +95,16 @@ def score_keywords(
     category_stats = compute_category_matches(classified_keywords, matched_keywords)
     weighted_scores = compute_weighted_score(category_stats)
 
-     # ✅ Inserted block here:
-    print("\n📊 Detailed Scoring Breakdown:")
-    for category, score in weighted_scores.items():
-        matched = category_stats.get(category, {}).get("matched", 0)
-        total = category_stats.get(category, {}).get("total", 0)
-        percent = category_stats.get(category, {}).get("percent", 0)
-        weight = CATEGORY_WEIGHTS.get(category, 1.0)
-
-        print(f"\n{category.upper()}")
-        print(f"  Matched: {matched} / {total}")
-        print(f"  Match %: {percent}%")
-        print(f"  Weight : {weight}")
-        print(f"  Score  : {score}")
-
-        matched_words = category_stats.get(category, {}).get("matched_words", [])
-        unmatched_words = category_stats.get(category, {}).get("unmatched_words", [])
-
-        print(f"  ✅ Matched Terms   : {', '.join(matched_words) if matched_words else 'None'}")
-        print(f"  ❌ Unmatched Terms : {', '.join(unmatched_words) if unmatched_words else 'None'}")
+    # The breakdown is only built when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        for category, score in weighted_scores.items():
+            stats = category_stats.get(category, {})
+            logger.debug(
+                "Score %s: matched %s/%s (%s%%), weight %s, score %s; matched=%s unmatched=%s",
+                category, stats.get("matched", 0), stats.get("total", 0), stats.get("percent", 0),
+                CATEGORY_WEIGHTS.get(category, 1.0), score,
+                stats.get("matched_words", []), stats.get("unmatched_words", []),
+            )
 
     return weighted_scores
 
@@ -0,0 +1,188 @@
+# llm_client.py
+"""
+Single entry point for chat completions.
+
+Every LLM call in the pipeline goes through `chat_completion`. It sends the
+call to the provider and model that the routing table assigns to the stage
+(see llm_routing.py) and retries transient provider errors. When the primary
+route exceeds its latency budget or keeps failing, it fails over to the
+stage's fallback route. It also records latency, token usage, model and retry
+count for the stage that made the call (see metrics.py). Stages marked for
+hedging race slow non-streaming calls against a duplicate (see llm_hedging.py).
+
+Calls made under a request deadline (see deadline.py) never wait past it. A
+call that fails, or that runs out of time, marks its stage as degraded; the
+caller then falls back to its local result.
+"""
+import logging
+import os
+import time
+from dataclasses import replace
+from functools import partial
+
+from api_utils.deadline import DeadlineExceeded, current_deadline, deadline_reached, llm_call_timeout
+from api_utils.llm_hedging import hedged_call, observe_latency
+from api_utils.llm_routing import get_provider, is_hedged, stage_routes, suspend_primary
+from api_utils.metrics import REGISTRY, record_llm_call
+
+logger = logging.getLogger(__name__)
+
+# Transient-error retries per call; override with environment variables
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+
+
+def _transient_errors() -> tuple:
+    import openai  # deferred so importing the pipeline doesn't pay for the client
+
+    error = openai.error
+    return (
+        error.RateLimitError,
+        error.Timeout,
+        error.APIConnectionError,
+        error.ServiceUnavailableError,
+        error.TryAgain,
+    )
+
+
+def _estimate_prompt_tokens(messages) -> int:
+    # Streams carry no usage block; ~4 characters per token is close enough for metrics
+    return sum(len(m.get("content") or "") for m in messages) // 4
+
+
+def chat_completion(stage: str, messages: list, model: str = None, **kwargs):
+    """
+    openai.ChatCompletion.create on the stage's route, with retries, failover and instrumentation.
+
+    Args:
+        stage: Pipeline stage making the call (filter, classify, parse, summary, ...)
+        messages: Chat messages
+        model: Overrides the routed model (normally left to the routing table)
+        **kwargs: Passed through to openai.ChatCompletion.create (temperature, stream, ...)
+
+    Returns:
+        The OpenAI response, or for stream=True an iterator over its chunks
+        (the call is recorded once the stream has been consumed).
+
+    Raises:
+        DeadlineExceeded: if the request's deadline left no time for the call.
+    """
+    try:
+        return _routed_completion(stage, messages, model, **kwargs)
+    except DeadlineExceeded:
+        raise  # already recorded as degraded by the deadline
+    except Exception:
+        deadline = current_deadline()
+        if deadline is not None and not deadline_reached(stage):
+            deadline.degrade(stage, "error")
+        raise
+
+
+def _routed_completion(stage: str, messages: list, model: str = None, **kwargs):
+    """Try the stage's routes in order, failing over on transient errors and budget breaches."""
+    routes = stage_routes(stage)
+    if model:
+        routes[0] = replace(routes[0], model=model)
+    hedge = is_hedged(stage) and not kwargs.get("stream")
+
+    for i, route in enumerate(routes):
+        has_fallback = i < len(routes) - 1
+        call = partial(_call_route, stage, route, messages, retry_timeouts=not has_fallback, **kwargs)
+        try:
+            return hedged_call(stage, route.model, call) if hedge else call()
+        except _transient_errors() as e:
+            if not has_fallback:
+                raise
+            if deadline_reached(stage):
+                # The request ran out of time, not the route; keep the primary in rotation
+                raise DeadlineExceeded(f"{stage}: request deadline reached") from e
+            suspend_primary(stage)
+            REGISTRY.inc("rex_llm_failovers_total", stage=stage, reason=type(e).__name__)
+            logger.warning("%s: %s on %s/%s, failing over to %s/%s", stage, type(e).__name__,
+                           route.provider, route.model, routes[i + 1].provider, routes[i + 1].model)
+
+
+def _call_route(stage: str, route, messages: list, retry_timeouts: bool, **kwargs):
+    """One route: retry transient errors, except a timeout (budget breach) when a fallback is waiting."""
+    import openai
+
+    provider = get_provider(route.provider)
+    if route.max_tokens and "max_tokens" not in kwargs:
+        kwargs["max_tokens"] = route.max_tokens
+    timeout = kwargs.pop("request_timeout", route.timeout)
+
+    start = time.perf_counter()
+    retries = 0
+
+    while True:
+        try:
+            kwargs["request_timeout"] = llm_call_timeout(stage, timeout)
+        except DeadlineExceeded:
+            if retries:
+                record_llm_call(stage, route.model, time.perf_counter() - start, retries=retries, outcome="error",
+                                error="DeadlineExceeded", provider=route.provider)
+            raise
+
+        try:
+            response = openai.ChatCompletion.create(
+                model=route.model,
+                messages=messages,
+                api_base=provider.api_base,
+                api_key=provider.api_key,
+                **kwargs
+            )
+            break
+        except _transient_errors() as e:
+            budget_breached = isinstance(e, openai.error.Timeout) and not retry_timeouts
+            if retries >= LLM_MAX_RETRIES or budget_breached:
+                record_llm_call(stage, route.model, time.perf_counter() - start, retries=retries, outcome="error",
+                                error=type(e).__name__, provider=route.provider)
+                raise
+            retries += 1
+            time.sleep(LLM_RETRY_BACKOFF * 2 ** (retries - 1))
+        except Exception as e:
+            record_llm_call(stage, route.model, time.perf_counter() - start, retries=retries, outcome="error",
+                            error=type(e).__name__, provider=route.provider)
+            raise
+
+    if kwargs.get("stream"):
+        return _instrumented_stream(response, stage, route, messages, start, retries)
+
+    elapsed = time.perf_counter() - start
+    observe_latency(stage, route.model, elapsed)
+    usage = response.get("usage") or {}
+    record_llm_call(
+        stage, route.model, elapsed,
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=usage.get("completion_tokens", 0),
+        retries=retries,
+        provider=route.provider,
+    )
+    return response
+
+
+def _instrumented_stream(response, stage, route, messages, start, retries):
+    """Yield stream chunks, recording the call (with time to first token) when the stream ends."""
+    first_token_at = None
+    content_chunks = 0
+    outcome = "ok"
+    try:
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.get("content"):
+                content_chunks += 1  # one streamed delta is roughly one token
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+            yield chunk
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        record_llm_call(
+            stage, route.model, time.perf_counter() - start,
+            prompt_tokens=_estimate_prompt_tokens(messages),
+            completion_tokens=content_chunks,
+            retries=retries,
+            outcome=outcome,
+            ttft_ms=round((first_token_at - start) * 1000, 1) if first_token_at else None,
+            provider=route.provider,
+        )
@@ -1,14 +1,13 @@
 # llm_enhancer.py
 
+import logging
 import os
-import openai
-from dotenv import load_dotenv
 from typing import List
 from api_utils.keyword_matcher import extract_keywords, filter_relevant_keywords
+from api_utils.llm_client import chat_completion
 
+logger = logging.getLogger(__name__)
 
-# Load your OpenAI key securely
-load_dotenv()
 
 def enhance_summary_with_gpt(summary_text: str, missing_keywords: list) -> str:
     """
@@ -45,14 +44,14 @@ Return ONLY the improved summary. No bullet points. No “Summary:” label. No
 """
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = chat_completion(
+            "summary",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.0,
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"[Summary Enhancement Error] {e}")
+        logger.warning("Summary enhancement failed, keeping original text: %s", e)
         return summary_text  # fallback to original
 
 
@@ -126,15 +125,15 @@ def enhance_skills_with_gpt(skills_text: str, missing_keywords: list) -> str:
     prompt = build_skills_prompt(skills_text, missing_keywords, format_type)
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = chat_completion(
+            "skills",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.0,
         )
         return response.choices[0].message.content.strip()
     
     except Exception as e:
-        print(f"[Skills Enhancement Error] {e}")
+        logger.warning("Skills enhancement failed, keeping original text: %s", e)
         return skills_text  # fallback to original
 
 # Assembles the instruction to GPT
@@ -207,8 +206,6 @@ def enhance_experience_job(
     Returns:
         New job dict with same structure but enhanced bullet points
     """
-    import openai  # Ensure OpenAI is loaded after dotenv
-    
 
     bullets = job["bullets"]
     if isinstance(bullets, str):
@@ -221,8 +218,8 @@ def enhance_experience_job(
     )
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = chat_completion(
+            "experience",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
         )
@@ -249,7 +246,7 @@ def enhance_experience_job(
         }
 
     except Exception as e:
-        print(f"[Experience Enhancement Error] {e}")
+        logger.warning("Experience enhancement failed, keeping original text: %s", e)
         return job  # fallback to original
 
 def build_projects_prompt(projects_text, missing_keywords: list) -> str:
@@ -293,12 +290,12 @@ Return only the improved Projects section — no section header, no explanations
 def enhance_projects_with_gpt(projects_text, missing_keywords: list) -> str:
     prompt = build_projects_prompt(projects_text, missing_keywords)
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = chat_completion(
+            "projects",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"[Projects Enhancement Error] {e}")
+        logger.warning("Projects enhancement failed, keeping original text: %s", e)
         return projects_text  # fallback
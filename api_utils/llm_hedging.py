@@ -0,0 +1,158 @@
+# llm_hedging.py
+"""
+Hedged LLM requests.
+
+For stages with `"hedge": true` in the routing table (see llm_routing.py),
+a call that has not returned after the p90 of that stage's recent latencies
+gets a duplicate, and whichever response arrives first is used. This bounds
+the tail latency caused by the occasional request that hangs while its
+siblings finish quickly.
+
+Hedging is capped: every hedgeable call earns LLM_HEDGE_MAX_EXTRA_LOAD of a
+token (up to LLM_HEDGE_BURST tokens) and a hedge spends one, so duplicates
+stay under that fraction of the stage's calls. A stage isn't hedged until it
+has LLM_HEDGE_MIN_SAMPLES latencies to estimate its p90 from.
+
+The blocking HTTP client cannot abort a request that is already in flight.
+The losing attempt runs to completion on its worker thread and its response
+is discarded.
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, Optional
+
+from api_utils.metrics import REGISTRY, submit_in_context
+
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.9"))
+LLM_HEDGE_MAX_EXTRA_LOAD = float(os.getenv("LLM_HEDGE_MAX_EXTRA_LOAD", "0.1"))
+LLM_HEDGE_BURST = float(os.getenv("LLM_HEDGE_BURST", "5"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))
+LLM_HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", "32"))
+
+REGISTRY.describe("rex_llm_hedges_total",
+                  "Hedged LLM calls by stage and result (issued, won, lost, throttled).")
+
+
+class LatencyWindow:
+    """The most recent successful call latencies for one stage and model."""
+
+    def __init__(self, size: int = LLM_HEDGE_WINDOW):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = LLM_HEDGE_MIN_SAMPLES) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """Token bucket that holds hedges to a fraction of calls."""
+
+    def __init__(self, ratio: float = LLM_HEDGE_MAX_EXTRA_LOAD, burst: float = LLM_HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+_lock = threading.Lock()
+_windows: Dict[tuple, LatencyWindow] = {}
+_budgets: Dict[str, HedgeBudget] = {}
+_executor = None
+
+
+def _window(stage_name: str, model: str) -> LatencyWindow:
+    key = (stage_name, model)
+    with _lock:
+        if key not in _windows:
+            _windows[key] = LatencyWindow()
+        return _windows[key]
+
+
+def _budget(stage_name: str) -> HedgeBudget:
+    with _lock:
+        if stage_name not in _budgets:
+            _budgets[stage_name] = HedgeBudget()
+        return _budgets[stage_name]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LLM_HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+        return _executor
+
+
+def observe_latency(stage_name: str, model: str, seconds: float):
+    """Feed a successful call's latency into the stage's hedge delay estimate."""
+    _window(stage_name, model).observe(seconds)
+
+
+def hedge_delay(stage_name: str, model: str) -> Optional[float]:
+    """Seconds to wait before hedging (the stage's recent p90), or None while there is too little data."""
+    return _window(stage_name, model).quantile(LLM_HEDGE_QUANTILE)
+
+
+def hedged_call(stage_name: str, model: str, call):
+    """
+    Run `call()` and, if it is still pending after the hedge delay and the
+    budget allows, race it against one duplicate.
+
+    Returns:
+        The first successful result. Raises the last error if both attempts fail.
+    """
+    budget = _budget(stage_name)
+    budget.deposit()
+    delay = hedge_delay(stage_name, model)
+    if delay is None:
+        return call()
+
+    executor = _get_executor()
+    primary = submit_in_context(executor, call)
+    try:
+        return primary.result(timeout=delay)
+    except FutureTimeout:
+        pass
+
+    if not budget.try_spend():
+        REGISTRY.inc("rex_llm_hedges_total", stage=stage_name, result="throttled")
+        return primary.result()
+
+    REGISTRY.inc("rex_llm_hedges_total", stage=stage_name, result="issued")
+    hedge = submit_in_context(executor, call)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+            for loser in pending:
+                loser.cancel()  # no-op once running; its response is dropped
+            REGISTRY.inc("rex_llm_hedges_total", stage=stage_name, result="won" if future is hedge else "lost")
+            return future.result()
+    raise error
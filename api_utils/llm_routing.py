@@ -0,0 +1,198 @@
+# llm_routing.py
+"""
+Per-stage routing table for LLM calls.
+
+Each pipeline stage (filter, classify, parse, summary, skills, experience,
+projects) maps to a primary route and an optional fallback route. A route
+names a provider, a model, max_tokens and a timeout. The timeout is the
+route's latency budget. A provider is any OpenAI-compatible endpoint: the
+OpenAI API, or a local server such as vLLM, llama.cpp or Ollama.
+
+The built-in table sends the one-word and list answers (filter, classify) to
+a small model and leaves parsing and enhancement on the larger ones. Override
+any part of it with a JSON file named by LLM_ROUTES_FILE:
+
+    {
+      "providers": {"local": {"api_base": "http://localhost:11434/v1"}},
+      "stages": {
+        "classify": {
+          "primary": {"provider": "local", "model": "llama3.1:8b", "max_tokens": 8, "timeout": 3},
+          "fallback": {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 8, "timeout": 10}
+        }
+      }
+    }
+
+A stage's fields are merged over its built-in route, so an override only needs
+the fields it changes. Add `"hedge": true` to a stage to enable hedged requests
+for it (see llm_hedging.py).
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Optional
+
+from api_utils.environment import load_environment
+
+# After a primary route blows its budget, send the stage to its fallback for this long
+ROUTE_FAILOVER_COOLDOWN = float(os.getenv("ROUTE_FAILOVER_COOLDOWN", "30"))
+
+
+@dataclass(frozen=True)
+class Provider:
+    """An OpenAI-compatible endpoint."""
+    name: str
+    api_base: str
+    api_key_env: str = "OPENAI_API_KEY"
+
+    @property
+    def api_key(self) -> str:
+        # Local servers usually ignore the key, but the client refuses to send a request without one
+        return os.getenv(self.api_key_env) or "unused"
+
+
+@dataclass(frozen=True)
+class Route:
+    """Where one stage's call goes and how long it may take."""
+    provider: str
+    model: str
+    max_tokens: Optional[int] = None
+    timeout: float = 60.0
+
+
+@dataclass(frozen=True)
+class StageRoute:
+    primary: Route
+    fallback: Optional[Route] = None
+    hedge: bool = False  # race slow calls against a duplicate (see llm_hedging.py)
+
+
+def default_providers() -> Dict[str, Provider]:
+    """Providers configured by the environment (read when the routing table is built, after .env)."""
+    providers = {"openai": Provider("openai", os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"))}
+    if os.getenv("LOCAL_LLM_API_BASE"):
+        providers["local"] = Provider("local", os.getenv("LOCAL_LLM_API_BASE"), "LOCAL_LLM_API_KEY")
+    return providers
+
+DEFAULT_ROUTES = {
+    "filter": StageRoute(Route("openai", "gpt-4o-mini", max_tokens=600, timeout=20)),
+    "classify": StageRoute(Route("openai", "gpt-4o-mini", max_tokens=8, timeout=10)),
+    "parse": StageRoute(
+        Route("openai", "gpt-4o", max_tokens=4096, timeout=90),
+        Route("openai", "gpt-4o-mini", max_tokens=4096, timeout=90),
+    ),
+    "summary": StageRoute(
+        Route("openai", "gpt-4", max_tokens=300, timeout=30),
+        Route("openai", "gpt-4o-mini", max_tokens=300, timeout=30),
+    ),
+    "skills": StageRoute(
+        Route("openai", "gpt-4", max_tokens=600, timeout=30),
+        Route("openai", "gpt-4o-mini", max_tokens=600, timeout=30),
+    ),
+    "experience": StageRoute(
+        Route("openai", "gpt-4", max_tokens=800, timeout=40),
+        Route("openai", "gpt-4o-mini", max_tokens=800, timeout=40),
+    ),
+    "projects": StageRoute(
+        Route("openai", "gpt-4", max_tokens=800, timeout=30),
+        Route("openai", "gpt-4o-mini", max_tokens=800, timeout=30),
+    ),
+}
+
+_ROUTE_FIELDS = {f.name for f in fields(Route)}
+
+
+def _merge_route(base: Optional[Route], override) -> Optional[Route]:
+    if override is None:
+        return None  # explicit null removes the fallback
+    unknown = set(override) - _ROUTE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown route fields: {sorted(unknown)}")
+    if base is None:
+        return Route(**override)
+    return replace(base, **override)
+
+
+def load_routing_table(config: dict = None):
+    """
+    Build (providers, routes) from the defaults plus an override config
+    (by default the JSON file named by LLM_ROUTES_FILE, if set).
+
+    Raises:
+        ValueError: for unknown stages, fields or providers.
+    """
+    if config is None:
+        path = os.getenv("LLM_ROUTES_FILE")
+        config = {}
+        if path:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+
+    providers = default_providers()
+    for name, spec in (config.get("providers") or {}).items():
+        providers[name] = Provider(name, **spec)
+
+    routes = dict(DEFAULT_ROUTES)
+    for stage_name, spec in (config.get("stages") or {}).items():
+        base = routes.get(stage_name)
+        if base is None:
+            raise ValueError(f"Unknown stage in routing table: {stage_name}")
+        primary = _merge_route(base.primary, spec["primary"]) if "primary" in spec else base.primary
+        fallback = _merge_route(base.fallback, spec["fallback"]) if "fallback" in spec else base.fallback
+        routes[stage_name] = StageRoute(primary, fallback, bool(spec.get("hedge", base.hedge)))
+
+    for stage_name, stage_route in routes.items():
+        for route in (stage_route.primary, stage_route.fallback):
+            if route is not None and route.provider not in providers:
+                raise ValueError(f"Stage {stage_name} routes to unknown provider {route.provider!r}")
+    return providers, routes
+
+
+_lock = threading.Lock()
+_table = None
+_suspended_until: Dict[str, float] = {}
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        load_environment()  # scripts reach here without going through api.py's setup
+        with _lock:
+            if _table is None:
+                _table = load_routing_table()
+    return _table
+
+
+def set_routing_table(config: dict = None):
+    """Replace the active table (None reloads defaults and LLM_ROUTES_FILE)."""
+    global _table
+    with _lock:
+        _table = load_routing_table(config)
+        _suspended_until.clear()
+
+
+def get_provider(name: str) -> Provider:
+    return _get_table()[0][name]
+
+
+def is_hedged(stage_name: str) -> bool:
+    return _get_table()[1][stage_name].hedge
+
+
+def stage_routes(stage_name: str) -> list:
+    """
+    Routes to try for a stage, in order. While the primary is cooling down
+    after a budget breach, only the fallback is returned.
+    """
+    stage_route = _get_table()[1][stage_name]
+    if stage_route.fallback is None:
+        return [stage_route.primary]
+    if _suspended_until.get(stage_name, 0) > time.monotonic():
+        return [stage_route.fallback]
+    return [stage_route.primary, stage_route.fallback]
+
+
+def suspend_primary(stage_name: str):
+    """Send a stage to its fallback route for ROUTE_FAILOVER_COOLDOWN seconds."""
+    _suspended_until[stage_name] = time.monotonic() + ROUTE_FAILOVER_COOLDOWN
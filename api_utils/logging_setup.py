@@ -0,0 +1,153 @@
+# logging_setup.py
+"""
+Logging for the API and the enhancement pipeline.
+
+Modules log through the standard library (`logging.getLogger(__name__)`)
+with %-style arguments, so a message below the active level is never
+formatted. `configure_logging` routes every record through a QueueHandler
+to a background QueueListener: request threads only enqueue records and
+never wait on stderr. If the queue is full, records are dropped and counted
+rather than blocking the request.
+
+Large payloads (resumes, model output) are wrapped in `truncated`, and full
+debug dumps go through `log_sampled`, which emits only a fraction of them.
+
+Environment (read when configure_logging runs, so call it after .env is loaded):
+    LOG_LEVEL              DEBUG, INFO (default), WARNING, ...
+    LOG_FORMAT             "text" (default) or "json" (one object per line)
+    LOG_PAYLOAD_MAX_CHARS  payload characters kept by `truncated` (default 500)
+    LOG_DUMP_SAMPLE_RATE   fraction of debug dumps emitted (default 0.01)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+
+# Defaults until configure_logging reads the environment
+LOG_PAYLOAD_MAX_CHARS = 500
+LOG_DUMP_SAMPLE_RATE = 0.01
+LOG_QUEUE_SIZE = 10_000
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class truncated:
+    """
+    Log argument that shortens a large payload, only when the record is emitted.
+
+        logger.debug("GPT response: %s", truncated(raw))
+    """
+
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload, limit: int = None):
+        self.payload = payload
+        self.limit = LOG_PAYLOAD_MAX_CHARS if limit is None else limit
+
+    def __str__(self):
+        text = self.payload if isinstance(self.payload, str) else repr(self.payload)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+    __repr__ = __str__
+
+
+def log_sampled(logger: logging.Logger, msg: str, *args, rate: float = None):
+    """Emit a DEBUG dump for a random `rate` fraction of calls (LOG_DUMP_SAMPLE_RATE by default)."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if random.random() >= (LOG_DUMP_SAMPLE_RATE if rate is None else rate):
+        return
+    logger.debug(msg, *args)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any fields passed with `extra=`."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records that do not fit in the queue are counted and dropped."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+
+
+def configure_logging(level: str = None, fmt: str = None, stream=None) -> DroppingQueueHandler:
+    """
+    Send all logging through a background queue listener (idempotent).
+
+    `level` and `fmt` default to LOG_LEVEL and LOG_FORMAT; the LOG_* settings
+    are read from the environment here, not at import.
+
+    Returns:
+        The queue handler installed on the root logger.
+    """
+    global _listener, _queue_handler, LOG_PAYLOAD_MAX_CHARS, LOG_DUMP_SAMPLE_RATE
+    with _lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+        fmt = fmt or os.getenv("LOG_FORMAT", "text")
+        LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", str(LOG_PAYLOAD_MAX_CHARS)))
+        LOG_DUMP_SAMPLE_RATE = float(os.getenv("LOG_DUMP_SAMPLE_RATE", str(LOG_DUMP_SAMPLE_RATE)))
+
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            logging.getLogger().removeHandler(_queue_handler)
+        _listener = _queue_handler = None
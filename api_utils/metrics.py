@@ -0,0 +1,254 @@
+# metrics.py
+"""
+In-process metrics: per-request stage timings and Prometheus-format
+histograms/counters for pipeline stages and LLM calls.
+
+Each request gets a RequestTrace (held in a context variable) that collects
+its stage spans and LLM calls; the same measurements also feed the
+process-wide registry exposed by /metrics. Worker threads see the request's
+trace when their tasks are submitted with `submit_in_context`.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from api_utils.profiler import run_profiled
+
+# Latency buckets in seconds: sub-millisecond local stages up to slow LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile (upper bound of the bucket holding it); None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for upper, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return upper
+        return float("inf")
+
+
+def _label_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for upper, n in zip(histogram.buckets, histogram.counts):
+                        cumulative += n
+                        le = f'le="{upper}"'
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{name}_bucket{_format_labels(key, le)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+            for name in sorted(self._counters):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("rex_stage_duration_seconds", "Wall time of each pipeline stage.")
+REGISTRY.describe("rex_llm_call_duration_seconds", "Latency of each LLM call, by stage and model.")
+REGISTRY.describe("rex_llm_calls_total", "LLM calls by stage, model and outcome.")
+REGISTRY.describe("rex_llm_tokens_total", "Prompt and completion tokens by stage and model.")
+REGISTRY.describe("rex_llm_retries_total", "Retried LLM attempts by stage and model.")
+REGISTRY.describe("rex_llm_failovers_total", "Calls moved to a stage's fallback route, by stage and reason.")
+REGISTRY.describe("rex_cache_lookups_total", "Cache lookups in front of LLM stages, by stage and result.")
+REGISTRY.describe("rex_http_request_duration_seconds", "HTTP request latency by method, path and status.")
+
+
+# === Per-request traces ===
+
+class RequestTrace:
+    """Stage spans and LLM calls recorded while serving one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stages: List[dict] = []
+        self.llm_calls: List[dict] = []
+        self.cache_lookups: Dict[str, Dict[str, int]] = {}
+
+    def add_stage(self, name: str, seconds: float, **attrs):
+        with self._lock:
+            self.stages.append({"stage": name, "ms": round(seconds * 1000, 1), **attrs})
+
+    def add_llm_call(self, record: dict):
+        with self._lock:
+            self.llm_calls.append(record)
+
+    def add_cache_lookup(self, name: str, hit: bool):
+        with self._lock:
+            counts = self.cache_lookups.setdefault(name, {"hit": 0, "miss": 0})
+            counts["hit" if hit else "miss"] += 1
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Milliseconds per stage name (summed when a stage ran several times, e.g. experience jobs)."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for span in self.stages:
+                totals[span["stage"]] = round(totals.get(span["stage"], 0) + span["ms"], 1)
+        return totals
+
+    def summary(self) -> dict:
+        """JSON-friendly summary for debug responses."""
+        with self._lock:
+            llm_calls = list(self.llm_calls)
+            cache_lookups = {name: dict(counts) for name, counts in self.cache_lookups.items()}
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "stages_ms": self.stage_totals(),
+            "llm_calls": llm_calls,
+            "cache_lookups": cache_lookups,
+        }
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.stage_totals().items())
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("rex_trace", default=None)
+
+
+def start_trace() -> RequestTrace:
+    """Begin collecting spans for the current request."""
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """
+    executor.submit that carries the caller's context (and so its trace) into
+    the worker thread. The worker is also sampled if the request is being
+    profiled (see profiler.py).
+    """
+    context = contextvars.copy_context()
+    return executor.submit(context.run, run_profiled, fn, *args, **kwargs)
+
+
+@contextmanager
+def stage(name: str, **attrs):
+    """Time a pipeline stage into the stage histogram and the current request's trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe("rex_stage_duration_seconds", elapsed, stage=name)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_stage(name, elapsed, **attrs)
+
+
+def record_llm_call(stage_name: str, model: str, seconds: float, prompt_tokens: int = 0,
+                    completion_tokens: int = 0, retries: int = 0, outcome: str = "ok", **attrs):
+    """Record one LLM call (after any retries) in the registry and the current trace."""
+    REGISTRY.observe("rex_llm_call_duration_seconds", seconds, stage=stage_name, model=model)
+    REGISTRY.inc("rex_llm_calls_total", stage=stage_name, model=model, outcome=outcome)
+    REGISTRY.inc("rex_llm_tokens_total", prompt_tokens, stage=stage_name, model=model, kind="prompt")
+    REGISTRY.inc("rex_llm_tokens_total", completion_tokens, stage=stage_name, model=model, kind="completion")
+    if retries:
+        REGISTRY.inc("rex_llm_retries_total", retries, stage=stage_name, model=model)
+
+    trace = current_trace()
+    if trace is not None:
+        trace.add_llm_call({
+            "stage": stage_name,
+            "model": model,
+            "ms": round(seconds * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "outcome": outcome,
+            **attrs,
+        })
+
+
+def record_cache_lookup(stage_name: str, hit: bool):
+    """Count a cache hit or miss in front of an LLM stage."""
+    REGISTRY.inc("rex_cache_lookups_total", stage=stage_name, result="hit" if hit else "miss")
+    trace = current_trace()
+    if trace is not None:
+        trace.add_cache_lookup(stage_name, hit)
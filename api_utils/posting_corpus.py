@@ -0,0 +1,270 @@
+# posting_corpus.py
+"""
+Rank a resume against a stored corpus of job postings.
+
+Each posting is stored as its keyword profile: the posting's filtered
+keywords grouped by category, the same `classified_keywords` the
+pipeline builds with filter_relevant_keywords and classify_keywords. A
+term is one (category, keyword) pair. The corpus directory holds:
+
+    meta.json          categories, counts, row width
+    postings.json      per-posting metadata (posting_id, title, company, ...)
+    vocab.json         [category index, keyword] for each term id
+    term_offsets.npy   CSR inverted index: postings of term t are
+    term_postings.npy      term_postings[term_offsets[t]:term_offsets[t + 1]]
+    totals.npy         keywords per (posting, category); -1 when the posting
+                       has no such category
+    incidence.bits     posting x term incidence, one bit per term, rows packed
+                       big-endian (np.packbits) and memory-mapped on open
+
+Ranking follows keyword_scorer. A posting keyword counts as matched when it
+occurs in the lowercased resume text, as in compute_keyword_match. Every
+category in the posting's profile counts toward the weighted average, even
+an empty one, and categories without an entry in CATEGORY_WEIGHTS (such as
+"other") weigh 1. Matched counts for all postings come from the inverted
+index in one bincount per category, and the scores are vectorized. Only the
+top-k postings are then rebuilt from their incidence rows and rescored with
+compute_category_matches and compute_weighted_score. The reported numbers
+are therefore exactly what the pipeline would report for that posting.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from api_utils.keyword_scorer import CATEGORY_WEIGHTS, compute_category_matches, compute_weighted_score
+
+POSTING_CORPUS_DIR = Path(os.getenv("POSTING_CORPUS_DIR", "posting_corpus"))
+CORPUS_FORMAT_VERSION = 1
+
+# Categories every profile from classify_keywords has; others found at build time are appended
+BASE_CATEGORIES = ("tool_platform", "certification_license", "domain_knowledge", "soft_skill", "other")
+
+
+def _normalize(keyword: str) -> str:
+    # The same normalization compute_category_matches applies to both sides
+    return keyword.lower().strip()
+
+
+def posting_profile(job_text: str) -> Dict[str, List[str]]:
+    """The pipeline's classified keywords for a posting (uses the LLM filter/classify caches)."""
+    from api_utils.keyword_classifier import classify_keywords
+    from api_utils.keyword_matcher import extract_keywords, filter_relevant_keywords
+
+    return classify_keywords(filter_relevant_keywords(list(extract_keywords(job_text))))
+
+
+def build_corpus(postings: Iterable[dict], out_dir=None) -> "PostingCorpus":
+    """
+    Write a corpus directory from postings and open it.
+
+    Args:
+        postings: dicts with "classified_keywords" ({category: [keywords]}) or,
+            to have it computed with posting_profile(), "text". Every other
+            field (posting_id, title, company, ...) is kept as metadata.
+        out_dir: Target directory (POSTING_CORPUS_DIR by default); existing
+            corpus files in it are replaced.
+    """
+    out_dir = Path(out_dir or POSTING_CORPUS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    categories = list(BASE_CATEGORIES)
+    category_index = {name: i for i, name in enumerate(categories)}
+    term_ids: Dict[tuple, int] = {}
+    vocab = []
+    metadata = []
+    rows = []  # (posting, term) pairs
+    cols = []
+    totals_rows = []
+
+    for posting in postings:
+        profile = posting.get("classified_keywords")
+        if profile is None:
+            profile = posting_profile(posting["text"])
+        p = len(metadata)
+        metadata.append({k: v for k, v in posting.items() if k not in ("classified_keywords", "text")})
+
+        totals = {}
+        for category, keywords in profile.items():
+            if category not in category_index:
+                category_index[category] = len(categories)
+                categories.append(category)
+            c = category_index[category]
+            unique = {_normalize(k) for k in keywords}
+            totals[c] = len(unique)
+            for keyword in unique:
+                key = (c, keyword)
+                t = term_ids.get(key)
+                if t is None:
+                    t = term_ids[key] = len(vocab)
+                    vocab.append([c, keyword])
+                rows.append(p)
+                cols.append(t)
+        totals_rows.append(totals)
+
+    n_postings, n_terms = len(metadata), len(vocab)
+    totals = np.full((n_postings, len(categories)), -1, dtype=np.int32)
+    for p, counts in enumerate(totals_rows):
+        for c, total in counts.items():
+            totals[p, c] = total
+
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+
+    # Inverted index: sort the pairs by term (then posting) and keep the offsets
+    order = np.lexsort((rows, cols))
+    term_postings = rows[order]
+    term_offsets = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cols, minlength=n_terms), out=term_offsets[1:])
+
+    row_bytes = max(1, (n_terms + 7) // 8)
+    incidence = np.memmap(out_dir / "incidence.bits", dtype=np.uint8, mode="w+",
+                          shape=(max(n_postings, 1), row_bytes))
+    incidence[:] = 0
+    np.bitwise_or.at(incidence, (rows, cols >> 3), (np.uint8(0x80) >> (cols & 7).astype(np.uint8)))
+    incidence.flush()
+    del incidence
+
+    np.save(out_dir / "term_offsets.npy", term_offsets)
+    np.save(out_dir / "term_postings.npy", term_postings)
+    np.save(out_dir / "totals.npy", totals)
+    for name, payload in (("vocab.json", vocab), ("postings.json", metadata)):
+        (out_dir / name).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    (out_dir / "meta.json").write_text(json.dumps({
+        "version": CORPUS_FORMAT_VERSION,
+        "postings": n_postings,
+        "terms": n_terms,
+        "row_bytes": row_bytes,
+        "categories": categories,
+    }), encoding="utf-8")
+    return PostingCorpus(out_dir)
+
+
+class PostingCorpus:
+    """A corpus directory opened for ranking. Arrays are memory-mapped, not read into memory."""
+
+    def __init__(self, corpus_dir=None):
+        self.dir = Path(corpus_dir or POSTING_CORPUS_DIR)
+        meta = json.loads((self.dir / "meta.json").read_text(encoding="utf-8"))
+        if meta["version"] != CORPUS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported posting corpus version {meta['version']} in {self.dir}")
+
+        self.categories: List[str] = meta["categories"]
+        self.size: int = meta["postings"]
+        self.postings: List[dict] = json.loads((self.dir / "postings.json").read_text(encoding="utf-8"))
+        vocab = json.loads((self.dir / "vocab.json").read_text(encoding="utf-8"))
+        self.term_category = np.array([c for c, _ in vocab], dtype=np.int32)
+        self.term_keyword = [keyword for _, keyword in vocab]
+
+        self.term_offsets = np.load(self.dir / "term_offsets.npy", mmap_mode="r")
+        self.term_postings = np.load(self.dir / "term_postings.npy", mmap_mode="r")
+        self.totals = np.load(self.dir / "totals.npy", mmap_mode="r")
+        self.incidence = np.memmap(self.dir / "incidence.bits", dtype=np.uint8, mode="r",
+                                   shape=(max(self.size, 1), meta["row_bytes"]))
+
+        self.weights = np.array([CATEGORY_WEIGHTS.get(name, 1) for name in self.categories], dtype=np.float64)
+        # keyword -> term ids (one per category it was filed under)
+        keyword_terms: Dict[str, List[int]] = {}
+        for t, keyword in enumerate(self.term_keyword):
+            keyword_terms.setdefault(keyword, []).append(t)
+        # (keyword, first trigram, last trigram, term ids); short keywords skip the trigram check
+        self._keywords = [(keyword, keyword[:3], keyword[-3:], terms) if len(keyword) >= 3
+                          else (keyword, None, None, terms)
+                          for keyword, terms in keyword_terms.items()]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def matched_terms(self, resume_text: str) -> np.ndarray:
+        """Term ids whose keyword occurs in the resume (substring match, as in compute_keyword_match)."""
+        text = resume_text.lower()
+        # Cheap prefilter: a keyword can only occur if its first and last three characters do
+        trigrams = {text[i:i + 3] for i in range(len(text) - 2)}
+        matched = []
+        for keyword, head, tail, terms in self._keywords:
+            if head is not None and (head not in trigrams or tail not in trigrams):
+                continue
+            if keyword in text:
+                matched.extend(terms)
+        return np.array(sorted(matched), dtype=np.int64)
+
+    def _matched_counts(self, terms: np.ndarray) -> np.ndarray:
+        counts = np.zeros((self.size, len(self.categories)), dtype=np.int32)
+        for c in range(len(self.categories)):
+            category_terms = terms[self.term_category[terms] == c]
+            if not len(category_terms):
+                continue
+            postings = np.concatenate([
+                self.term_postings[self.term_offsets[t]:self.term_offsets[t + 1]] for t in category_terms
+            ])
+            counts[:, c] = np.bincount(postings, minlength=self.size)
+        return counts
+
+    def scores(self, terms: np.ndarray) -> np.ndarray:
+        """Approximate final_score of every posting (vectorized compute_weighted_score)."""
+        totals = np.asarray(self.totals)
+        present = totals >= 0
+        matched = self._matched_counts(terms)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(totals > 0, np.round(matched / totals * 100, 1), 0.0)
+        weights = present * self.weights
+        weight_sums = weights.sum(axis=1)
+        weighted = (percent * weights).sum(axis=1)
+        return np.divide(weighted, weight_sums, out=np.zeros(self.size), where=weight_sums > 0)
+
+    def posting_keywords(self, p: int) -> Dict[str, List[str]]:
+        """A posting's classified keywords, rebuilt from its incidence row."""
+        row = np.unpackbits(self.incidence[p])[:len(self.term_keyword)]
+        classified = {name: [] for c, name in enumerate(self.categories) if self.totals[p, c] >= 0}
+        for t in np.flatnonzero(row):
+            classified[self.categories[self.term_category[t]]].append(self.term_keyword[t])
+        return classified
+
+    def rank(self, resume_text: str, top_k: int = 10) -> List[dict]:
+        """
+        The top_k postings for a resume, best first.
+
+        Returns:
+            One dict per posting: its metadata, "score" (final_score),
+            "category_scores" (compute_weighted_score output without
+            final_score) and "categories" (compute_category_matches output).
+        """
+        if not self.size or top_k <= 0:
+            return []
+        terms = self.matched_terms(resume_text)
+        scores = self.scores(terms)
+
+        k = min(top_k, self.size)
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < self.size else np.arange(self.size)
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        matched_keywords = sorted({self.term_keyword[t] for t in terms})
+        results = []
+        for p in candidates:
+            category_stats = compute_category_matches(self.posting_keywords(p), matched_keywords)
+            category_scores = compute_weighted_score(category_stats)
+            results.append({
+                **self.postings[p],
+                "score": category_scores.pop("final_score"),
+                "category_scores": category_scores,
+                "categories": category_stats,
+            })
+        results.sort(key=lambda r: -r["score"])  # exact scores can reorder near-ties
+        return results
+
+
+_lock = threading.Lock()
+_corpus: Optional[PostingCorpus] = None
+
+
+def get_corpus() -> PostingCorpus:
+    """The corpus in POSTING_CORPUS_DIR, opened on first use."""
+    global _corpus
+    if _corpus is None:
+        with _lock:
+            if _corpus is None:
+                _corpus = PostingCorpus()
+    return _corpus
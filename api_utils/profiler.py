@@ -0,0 +1,354 @@
+# profiler.py
+"""
+On-demand sampling profiler for single requests.
+
+An admin can ask for one request to be profiled (see the `profile` flag on
+the API endpoints). While it runs, a background thread reads the stacks of
+the request's threads from `sys._current_frames()` every
+PROFILE_INTERVAL_MS. Those threads are the one serving the request plus every
+worker submitted with `metrics.submit_in_context`: enhancers, hedged LLM
+calls, and so on. Nothing is traced or instrumented, so the request runs at
+normal speed. When no profile is active, the only cost is one context-variable
+lookup per worker submission.
+
+Each sample is counted under its full stack and under a category taken from
+the innermost Rex frame: conversion, keyword, llm_wait, export, pipeline,
+or waiting for worker threads. Network I/O under any Rex frame counts as
+llm_wait. The report holds the category breakdown and the per-function self
+and total hot spots. It also holds the stacks in folded format, which
+flamegraph.pl and speedscope accept and `render_flamegraph_svg` draws.
+Reports are stored on disk under a random profile id.
+"""
+import contextvars
+import gzip
+import html
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# A runaway request stops being sampled after this long; the report keeps what was collected
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "300"))
+PROFILE_MAX_DEPTH = 128
+PROFILE_TOP_N = 40
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Innermost Rex module -> category (first matching prefix wins)
+_REX_CATEGORIES = (
+    ("api_utils/html_converter.py", "conversion"),
+    ("api_utils/keyword_", "keyword"),
+    ("api_utils/llm_client.py", "llm_wait"),
+    ("api_utils/llm_hedging.py", "llm_wait"),
+    ("app/export/", "export"),
+)
+# Leaf frames in these modules mean the thread is blocked on the network (an LLM call)
+_NETWORK_MODULES = ("socket.py", "ssl.py", "http/client.py", "urllib3/", "requests/", "openai/", "aiohttp/")
+# Leaf frames in these modules mean the thread is parked waiting on other threads
+_WAIT_MODULES = ("threading.py", "queue.py", "concurrent/futures/")
+
+
+def _short_path(filename: str) -> str:
+    path = filename.replace("\\", "/")
+    root = str(ROOT).replace("\\", "/") + "/"
+    if path.startswith(root):
+        return path[len(root):]
+    for marker in ("site-packages/", "dist-packages/"):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    lib = path.rfind("/lib/python")
+    if lib != -1:
+        return path[lib:].split("/", 3)[-1]
+    return os.path.basename(path)
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_rex(path: str) -> bool:
+    return not os.path.isabs(path) and path.split("/", 1)[0] in ("api_utils", "app", "api.py")
+
+
+def categorize(paths) -> str:
+    """Category of one sample, given its stack's module paths from root to leaf."""
+    leaf = paths[-1] if paths else ""
+    for path in reversed(paths):
+        if not _is_rex(path):
+            continue
+        category = "pipeline"
+        for prefix, name in _REX_CATEGORIES:
+            if path.startswith(prefix):
+                category = name
+                break
+        if any(module in leaf for module in _NETWORK_MODULES):
+            return "llm_wait"
+        if category == "pipeline" and any(module in leaf for module in _WAIT_MODULES):
+            return "waiting"
+        return category
+    return "other"
+
+
+class SamplingProfiler:
+    """Samples the stacks of a registered set of threads on a background thread."""
+
+    def __init__(self, label: str = "", interval_ms: float = PROFILE_INTERVAL_MS,
+                 max_seconds: float = PROFILE_MAX_SECONDS):
+        self.profile_id = secrets.token_hex(8)
+        self.label = label
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()  # tuple of (label, path) root->leaf -> samples
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._threads: Dict[int, int] = {}  # ident -> nesting depth
+        self._seen_threads = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._labels: Dict[object, tuple] = {}
+
+    def add_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+            self._seen_threads.add(ident)
+
+    def remove_thread(self, ident: int):
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.profile_id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _frame_key(self, code) -> tuple:
+        key = self._labels.get(code)
+        if key is None:
+            key = self._labels[code] = (_frame_label(code), _short_path(code.co_filename))
+        return key
+
+    def _run(self):
+        deadline = time.perf_counter() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.perf_counter() > deadline:
+                logger.warning("Profile %s stopped sampling after %ss", self.profile_id, self.max_seconds)
+                return
+            with self._lock:
+                idents = list(self._threads)
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                    stack.append(self._frame_key(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[tuple(reversed(stack))] += 1
+                    self.samples += 1
+            del frames
+
+    def report(self, top_n: int = PROFILE_TOP_N) -> dict:
+        """Category breakdown, hot spots and folded stacks of what was sampled."""
+        total = max(self.samples, 1)
+        categories = Counter()
+        self_counts = Counter()
+        total_counts = Counter()
+        folded = []
+        for stack, count in self.stacks.items():
+            categories[categorize([path for _, path in stack])] += count
+            self_counts[stack[-1][0]] += count
+            for label in {label for label, _ in stack}:
+                total_counts[label] += count
+            folded.append(f"{';'.join(label.replace(';', ',') for label, _ in stack)} {count}")
+
+        def pct(count):
+            return round(100 * count / total, 1)
+
+        return {
+            "profile_id": self.profile_id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_s": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "threads": len(self._seen_threads),
+            "categories": {name: {"samples": n, "percent": pct(n)} for name, n in categories.most_common()},
+            "hot_spots": [
+                {
+                    "function": label,
+                    "self": n,
+                    "self_percent": pct(n),
+                    "total": total_counts[label],
+                    "total_percent": pct(total_counts[label]),
+                }
+                for label, n in self_counts.most_common(top_n)
+            ],
+            "folded": sorted(folded),
+        }
+
+
+_current_profile: contextvars.ContextVar[Optional[SamplingProfiler]] = contextvars.ContextVar(
+    "rex_profile", default=None)
+
+
+def current_profile() -> Optional[SamplingProfiler]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profiled_thread(profiler: SamplingProfiler):
+    """Sample the calling thread for the duration of the block."""
+    ident = threading.get_ident()
+    profiler.add_thread(ident)
+    try:
+        yield
+    finally:
+        profiler.remove_thread(ident)
+
+
+def run_profiled(fn, *args, **kwargs):
+    """Run fn on this thread, sampled by the context's profile if there is one (see submit_in_context)."""
+    profiler = _current_profile.get()
+    if profiler is None:
+        return fn(*args, **kwargs)
+    with profiled_thread(profiler):
+        return fn(*args, **kwargs)
+
+
+@contextmanager
+def profile_request(label: str = ""):
+    """
+    Profile the calling thread, and workers submitted from it, for the
+    duration of the block. Yields the profiler, whose report is saved
+    when the block exits.
+    """
+    profiler = SamplingProfiler(label)
+    token = _current_profile.set(profiler)
+    profiler.start()
+    try:
+        with profiled_thread(profiler):
+            yield profiler
+    finally:
+        profiler.stop()
+        _current_profile.reset(token)
+        try:
+            save_profile(profiler.report())
+        except OSError:
+            logger.exception("Could not save profile %s", profiler.profile_id)
+
+
+# === Storage ===
+
+def _profile_path(profile_id: str) -> Path:
+    # Ids are hex tokens; reject anything else so callers can't escape PROFILE_DIR
+    if not profile_id or not all(c in "0123456789abcdef" for c in profile_id):
+        raise ValueError(f"Invalid profile_id: {profile_id!r}")
+    return PROFILE_DIR / f"{profile_id}.json.gz"
+
+
+def save_profile(report: dict) -> None:
+    path = _profile_path(report["profile_id"])
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(json.dumps(report, separators=(",", ":")).encode("utf-8")))
+    os.replace(tmp_path, path)
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    """A stored report, or None if the id is unknown."""
+    try:
+        path = _profile_path(profile_id)
+    except ValueError:
+        return None
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        return json.loads(gzip.decompress(f.read()).decode("utf-8"))
+
+
+# === Flame graph ===
+
+_SVG_WIDTH = 1200
+_SVG_ROW = 16
+_SVG_COLORS = {
+    "conversion": "#e8a33d", "keyword": "#6bb36b", "llm_wait": "#6f9fd8",
+    "export": "#c77dd1", "pipeline": "#e06c5a", "waiting": "#b0b0b0", "other": "#d9c27a",
+}
+
+
+def render_flamegraph_svg(folded, title: str = "Rex request profile") -> str:
+    """A self-contained SVG flame graph from folded stacks ("a;b;c count" lines)."""
+    tree = {"children": {}, "count": 0}
+    for line in folded:
+        frames, _, count = line.rpartition(" ")
+        count = int(count)
+        tree["count"] += count
+        node = tree
+        for frame in frames.split(";"):
+            node = node["children"].setdefault(frame, {"children": {}, "count": 0})
+            node["count"] += count
+
+    rects = []
+    max_depth = 0
+
+    def layout(node, depth, x, path):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        for name, child in sorted(node["children"].items()):
+            width = child["count"] / tree["count"] * _SVG_WIDTH
+            if width >= 0.5:
+                child_path = path + [name.rsplit(" (", 1)[-1].rsplit(":", 1)[0]]
+                rects.append((name, child["count"], depth, x, width, categorize(child_path)))
+                layout(child, depth + 1, x, child_path)
+            x += width
+
+    if tree["count"]:
+        layout(tree, 0, 0.0, [])
+    height = (max_depth + 1) * _SVG_ROW + 40
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_SVG_WIDTH}" height="{height}" '
+        f'font-family="Verdana" font-size="11">',
+        f'<text x="{_SVG_WIDTH / 2}" y="20" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+    ]
+    for name, count, depth, x, width, category in rects:
+        y = height - (depth + 1) * _SVG_ROW - 4
+        pct = 100 * count / tree["count"]
+        label = html.escape(name)
+        parts.append(
+            f'<g><title>{label} [{category}] {count} samples ({pct:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{_SVG_ROW - 1}" '
+            f'fill="{_SVG_COLORS[category]}" rx="2"/>'
+        )
+        if width > 40:
+            max_chars = int(width / 7)
+            text = name if len(name) <= max_chars else name[:max_chars - 2] + ".."
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + _SVG_ROW - 4}">{html.escape(text)}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts)
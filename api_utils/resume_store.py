@@ -0,0 +1,74 @@
+# resume_store.py
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+# Parsed resumes live on disk as one gzip-compressed JSON file per resume_id
+STORE_DIR = Path(os.getenv("RESUME_STORE_DIR", "resume_store"))
+
+
+def compute_resume_id(content: bytes) -> str:
+    """
+    Derive a stable resume_id from the raw uploaded file bytes.
+    The same file uploaded twice always maps to the same id.
+    """
+    return resume_id_from_digest(hashlib.sha256(content).hexdigest())
+
+
+def resume_id_from_digest(sha256_hex: str) -> str:
+    """compute_resume_id() for content whose SHA-256 was computed while streaming it in."""
+    return sha256_hex[:32]
+
+
+def _resume_path(resume_id: str) -> Path:
+    # Ids are hex digests; reject anything else so callers can't escape STORE_DIR
+    if not resume_id or not all(c in "0123456789abcdef" for c in resume_id):
+        raise ValueError(f"Invalid resume_id: {resume_id!r}")
+    return STORE_DIR / f"{resume_id}.json.gz"
+
+
+def save_resume(resume_id: str, html_resume: str, sections: dict) -> None:
+    """
+    Store the converted HTML and the parsed sections for a resume.
+
+    Args:
+        resume_id: Id returned by compute_resume_id().
+        html_resume: Cleaned HTML produced by convert_resume_to_html().
+        sections: Structured output of parse_resume_with_gpt().
+    """
+    path = _resume_path(resume_id)
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+
+    payload = json.dumps(
+        {"html_resume": html_resume, "sections": sections},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    # Write to a temp file first so concurrent readers never see a partial file
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(payload))
+    os.replace(tmp_path, path)
+
+
+def load_resume(resume_id: str) -> Optional[dict]:
+    """
+    Load a stored resume.
+
+    Returns:
+        dict with keys 'html_resume' and 'sections', or None if the id is unknown.
+    """
+    try:
+        path = _resume_path(resume_id)
+    except ValueError:
+        return None
+
+    if not path.exists():
+        return None
+
+    with open(path, "rb") as f:
+        return json.loads(gzip.decompress(f.read()).decode("utf-8"))
@@ -0,0 +1,169 @@
+# uploads.py
+"""
+Bounded handling of resume uploads.
+
+An upload is read in UPLOAD_CHUNK_BYTES chunks into a SpooledTemporaryFile.
+The file stays in memory up to UPLOAD_SPOOL_BYTES and spills to a private
+temp file beyond that, so a worker holds at most one spool's worth of each
+upload in memory, however large the file is. The format comes from the
+first bytes, not the filename: PDF, DOCX, or plain text. Anything else is
+rejected (415) before conversion starts.
+
+UPLOAD_MAX_BYTES is enforced at two points. check_content_length() runs in
+api.py's middleware and answers 413 from the request's Content-Length
+before any of the body is received. Starlette parses the multipart form,
+and so receives and spools the whole body, before the handler runs. For a
+request without a Content-Length (chunked), spool_upload()'s cap therefore
+bounds what the handler reads, hashes and converts, not what the server
+receives.
+"""
+import hashlib
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from typing import Optional
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Bytes inspected for the format signature (PDF allows junk before %PDF- within the first 1 KiB)
+SNIFF_BYTES = 1024
+
+SUPPORTED_FORMATS = (".pdf", ".docx", ".txt")
+# Routes that take a resume upload; their Content-Length is checked before the body is read
+UPLOAD_ROUTES = ("/extract-text", "/resumes")
+# Allowance for the multipart envelope (boundaries, part headers) around the file
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class UploadRejected(ValueError):
+    """An upload that is refused before conversion; `status_code` is the HTTP status to answer with."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class SpooledUpload:
+    file: tempfile.SpooledTemporaryFile
+    format: str  # one of SUPPORTED_FORMATS
+    size: int
+    sha256: str
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check_content_length(content_length: Optional[str], max_bytes: int = None) -> None:
+    """
+    Reject an upload request by its Content-Length header, before the body is read.
+
+    Raises:
+        UploadRejected: 413 when the declared body is larger than max_bytes
+            (UPLOAD_MAX_BYTES by default) plus MULTIPART_OVERHEAD_BYTES,
+            400 when the header is not a number. A missing header passes.
+    """
+    if content_length is None:
+        return
+    max_bytes = UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        declared = int(content_length)
+    except ValueError:
+        raise UploadRejected(400, "Invalid Content-Length header")
+    if declared > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise UploadRejected(413, f"Upload exceeds the {max_bytes // 1024} KiB limit")
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """The resume format implied by a file's first bytes, or None if unsupported."""
+    if b"%PDF-" in head[:SNIFF_BYTES]:
+        return ".pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return ".docx"  # confirmed to be a Word document once the whole zip is in (see _check_docx)
+    if not head or b"\x00" in head:
+        return None  # empty, or binary (images, legacy .doc, UTF-16 text, ...)
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A chunk boundary can split a multi-byte character; anything else is not UTF-8 text
+        if e.start < len(head) - 3:
+            return ".txt" if _looks_like_latin1_text(head) else None
+    return ".txt"
+
+
+def _looks_like_latin1_text(head: bytes) -> bool:
+    # The converter falls back to latin-1; accept it when control characters are only whitespace
+    return all(b >= 0x20 or b in b"\t\n\r\x0c" for b in head)
+
+
+def _check_docx(file):
+    try:
+        with zipfile.ZipFile(file) as archive:
+            names = set(archive.namelist())
+    except zipfile.BadZipFile:
+        raise UploadRejected(415, "Upload looks like a ZIP archive but is not a valid DOCX file")
+    if "word/document.xml" not in names:
+        raise UploadRejected(415, "ZIP upload is not a Word document (.docx)")
+    file.seek(0)
+
+
+async def spool_upload(upload, max_bytes: int = None) -> SpooledUpload:
+    """
+    Stream a FastAPI UploadFile into a size-capped spool and detect its format.
+
+    Raises:
+        UploadRejected: 413 when larger than max_bytes (UPLOAD_MAX_BYTES by default),
+            415 when not a PDF, DOCX or text file, 400 when empty.
+    """
+    max_bytes = UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    too_large = UploadRejected(413, f"Upload exceeds the {max_bytes // 1024} KiB limit")
+    if getattr(upload, "size", None) and upload.size > max_bytes:
+        raise too_large  # declared size is already over: don't read a byte of it into the spool
+
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    file_format = None
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large
+            if file_format is None and len(head) < SNIFF_BYTES:
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    file_format = _sniff_or_reject(head)
+            spool.write(chunk)
+            digest.update(chunk)
+
+        if size == 0:
+            raise UploadRejected(400, "Uploaded file is empty")
+        if file_format is None:
+            file_format = _sniff_or_reject(head)
+        spool.seek(0)
+        if file_format == ".docx":
+            _check_docx(spool)
+        return SpooledUpload(spool, file_format, size, digest.hexdigest())
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _sniff_or_reject(head: bytes) -> str:
+    file_format = sniff_format(head)
+    if file_format is None:
+        raise UploadRejected(415, f"Unsupported file type; upload one of {', '.join(SUPPORTED_FORMATS)}")
+    return file_format
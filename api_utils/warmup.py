@@ -0,0 +1,92 @@
+# warmup.py
+"""
+Readiness and optional pre-warming for the backend.
+
+Heavy dependencies (the OpenAI client, the DOCX/PDF converters, the export
+renderers) and the keyword caches are loaded on first use, so the API
+process starts quickly. The first request that needs one of them pays for
+the import. `warm_up()` pays those costs up front. api.py runs it in the
+background at startup when PREWARM_ON_STARTUP is set, and /ready reports
+not-ready until it has finished, so an autoscaled replica only gets traffic
+once it is warm.
+"""
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Modules deliberately kept out of the import of api.py (see test_startup.py)
+DEFERRED_MODULES = ("openai", "mammoth", "pdfminer", "pdf2docx", "pypandoc", "docx", "jinja2", "pdfkit", "numpy")
+
+
+def _import(*modules):
+    def step():
+        for module in modules:
+            importlib.import_module(module)
+    return step
+
+
+def _load_keyword_caches():
+    from api_utils.keyword_classifier import keyword_cache
+    from api_utils.keyword_matcher import filter_cache
+    filter_cache.load()
+    keyword_cache.load()
+
+
+def _load_routing_table():
+    from api_utils.llm_routing import stage_routes
+    stage_routes("parse")
+
+
+def _load_export():
+    from app.export.resume_export import get_available_styles
+    get_available_styles()
+
+
+WARMUP_STEPS = (
+    ("llm_client", _import("openai")),
+    ("routing_table", _load_routing_table),
+    ("keyword_caches", _load_keyword_caches),
+    ("converters", _import("mammoth", "pdfminer.high_level", "pdfminer.layout")),
+    ("export", _load_export),
+)
+
+_lock = threading.Lock()
+_state = {"warmed": False, "warming": False, "steps": {}}
+
+
+def warm_up() -> dict:
+    """
+    Run every warm-up step once per process; later calls return the first run's status.
+    A failing step (e.g. an optional dependency that isn't installed) is logged, not raised.
+    """
+    with _lock:
+        if _state["warmed"]:
+            return warm_up_status()
+        _state["warming"] = True
+
+        for name, step in WARMUP_STEPS:
+            start = time.perf_counter()
+            try:
+                step()
+                _state["steps"][name] = {"ms": round((time.perf_counter() - start) * 1000, 1)}
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                _state["steps"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+        _state["warming"] = False
+        _state["warmed"] = True
+        logger.info("Warm-up finished: %s", _state["steps"])
+    return warm_up_status()
+
+
+def start_background_warm_up() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def warm_up_status() -> dict:
+    return {"warmed": _state["warmed"], "warming": _state["warming"], "steps": dict(_state["steps"])}
@@ -1,9 +1,15 @@
+import contextvars
+import logging
 import os
-from dotenv import load_dotenv
-from api_utils.gpt_parser import parse_resume_with_gpt
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from api_utils.deadline import Deadline, current_deadline, deadline_reached, start_deadline
+from api_utils.gpt_parser import RESUME_SCHEMA, stream_resume_sections, sections_to_events
 from api_utils.keyword_matcher import extract_keywords, filter_relevant_keywords, compute_keyword_match
 from api_utils.keyword_classifier import classify_keywords
 from api_utils.keyword_scorer import score_keywords
+from api_utils.logging_setup import log_sampled, truncated
+from api_utils.metrics import stage, submit_in_context
 from api_utils.llm_enhancer import (
     enhance_summary_with_gpt,
     enhance_skills_with_gpt,
@@ -12,25 +18,175 @@ from api_utils.llm_enhancer import (
 )
 from api_utils.resume_formatter import format_experience_section, assemble_resume
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-def run_resume_enhancement_pipeline(resume_text: str, job_posting: str) -> tuple[str, dict]:
+# Concurrent GPT enhancement calls per pipeline run
+ENHANCER_WORKERS = int(os.getenv("ENHANCER_WORKERS", "6"))
+
+
+def _summary_text(summary) -> str:
+    if isinstance(summary, list):
+        return " ".join(str(s) for s in summary)
+    return summary if isinstance(summary, str) else str(summary)
+
+
+def _skills_text(skills) -> str:
+    if isinstance(skills, list):
+        return ", ".join(str(s) for s in skills)
+    return skills if isinstance(skills, str) else str(skills)
+
+
+def _projects_text(projects) -> str:
+    if isinstance(projects, list):
+        return "\n".join(str(p) for p in projects)
+    return projects if isinstance(projects, str) else str(projects)
+
+
+def _timed(stage_name, fn):
+    """Wrap an enhancer so its wall time is recorded as a pipeline stage."""
+    def run(*args, **kwargs):
+        with stage(stage_name):
+            return fn(*args, **kwargs)
+    return run
+
+
+def _collect(deadline: Deadline, stage_name: str, future, original):
+    """An enhancer's result, or the original section if it failed or the deadline ran out first."""
+    try:
+        return future.result(timeout=deadline.llm_time_left())
+    except FutureTimeout:
+        future.cancel()
+        deadline.degrade(stage_name, "deadline")
+    except Exception as e:
+        logger.warning("%s enhancement failed, keeping original text: %s", stage_name, e)
+        deadline.degrade(stage_name, "error")
+    return original
+
+
+def run_resume_enhancement_pipeline(resume_text: str, job_posting: str, sections: dict | None = None) -> tuple[str, dict]:
     """
     Executes the full resume enhancement pipeline and scoring logic.
     Returns enhanced resume string and a scoring summary dictionary.
+
+    If `sections` is given (e.g. loaded from the resume store), the GPT
+    parse step is skipped and those sections are used as-is.
+
+    The run is bounded by the request's deadline (see deadline.py; one is
+    started here if the caller has none). Enhancements still pending when
+    it runs out keep their original text, keyword filtering and
+    classification fall back to local results, and the stages that did so
+    are listed in the deadline's `degraded_stages`.
     """
-        
+    if current_deadline() is None:
+        # Callers outside a request (scripts, notebooks) get a default deadline for this run only
+        context = contextvars.copy_context()
+        context.run(start_deadline)
+        return context.run(run_resume_enhancement_pipeline, resume_text, job_posting, sections)
+    deadline = current_deadline()
+
         # Extract and filter job description keywords
-    raw_keywords = extract_keywords(job_posting)
-    filtered_keywords = filter_relevant_keywords(list(raw_keywords))
-    classified_keywords = classify_keywords(filtered_keywords)
+    with stage("filter"):
+        raw_keywords = extract_keywords(job_posting)
+        filtered_keywords = filter_relevant_keywords(list(raw_keywords))
+    with stage("classify"):
+        classified_keywords = classify_keywords(filtered_keywords)
 
         # Compute pre-enhancement keyword match and score
-    pre_match = compute_keyword_match(resume_text, job_posting)
-    pre_scores = score_keywords(classified_keywords, pre_match["matched_keywords"])
+    with stage("pre_score"):
+        pre_match = compute_keyword_match(resume_text, job_posting)
+        pre_scores = score_keywords(classified_keywords, pre_match["matched_keywords"])
+
+    missing_keywords = pre_match["missing_keywords"]
+
+    # Step 1: Parse resume sections, handing each one to its enhancer as soon as
+    # it has streamed in. Stored sections are replayed through the same path.
+    stored = sections is not None
+    if stored:
+        section_events = sections_to_events(sections)
+    else:
+        section_events = stream_resume_sections(resume_text)
+
+    sections = {}
+    section_futures = {}
+    jobs = []
+    job_futures = []
+
+    # Not a `with` block: shutting down must not wait for enhancers the deadline gave up on
+    executor = ThreadPoolExecutor(max_workers=ENHANCER_WORKERS)
+    try:
+
+        def submit_job(job):
+            original_bullet_count = len(job.get("bullets", []))
+            jobs.append(job)
+            job_futures.append(submit_in_context(
+                executor,
+                _timed("experience", enhance_experience_job),
+                job,
+                missing_keywords,
+                job_posting,
+                original_bullet_count
+            ))
 
-    # Step 1: Parse resume sections
-    sections = parse_resume_with_gpt(resume_text)
+        def submit_section(key, value):
+            if key == "summary":
+                section_futures[key] = submit_in_context(
+                    executor, _timed("summary", enhance_summary_with_gpt), _summary_text(value), missing_keywords)
+            elif key == "skills":
+                section_futures[key] = submit_in_context(
+                    executor, _timed("skills", enhance_skills_with_gpt), _skills_text(value), missing_keywords)
+            elif key == "projects":
+                section_futures[key] = submit_in_context(
+                    executor, _timed("projects", enhance_projects_with_gpt), _projects_text(value), missing_keywords)
+
+        # Enhancers run while the parse is still streaming, so "parse" is the
+        # time until the last section arrived
+        with stage("parse", stored=stored):
+            try:
+                for event in section_events:
+                    if event.index is not None:
+                        if event.key == "experience" and isinstance(event.value, dict):
+                            submit_job(event.value)
+                        continue
+                    sections[event.key] = event.value
+                    submit_section(event.key, event.value)
+                    if len(sections) < len(RESUME_SCHEMA["required"]) and deadline_reached("parse"):
+                        break  # use what has streamed in so far
+            except Exception as e:
+                if not sections and not jobs:
+                    raise
+                logger.warning("Resume parse stopped after %d sections: %s", len(sections), e)
+                if not deadline_reached("parse"):
+                    deadline.degrade("parse", "error")
+            finally:
+                close = getattr(section_events, "close", None)
+                if close:
+                    close()
+
+        # Sections GPT left out still go through their enhancer with an empty input
+        for key in ("summary", "skills", "projects"):
+            if key not in section_futures:
+                submit_section(key, sections.get(key, ""))
+
+        # Experience that was repaired as a whole section never streamed per job
+        experience_jobs = sections.get("experience", [])
+        if not job_futures:
+            for job in experience_jobs:
+                submit_job(job)
+
+        logger.debug("Parsed %d experience jobs", len(experience_jobs))
+
+        # Step 4: Collect enhanced sections, keeping the original of any that fail or run out of time
+        enhanced_projects = _collect(
+            deadline, "projects", section_futures["projects"], _projects_text(sections.get("projects", "")))
+        enhanced_summary = _collect(
+            deadline, "summary", section_futures["summary"], _summary_text(sections.get("summary", "")))
+        enhanced_skills = _collect(
+            deadline, "skills", section_futures["skills"], _skills_text(sections.get("skills", "")))
+        enhanced_jobs = [
+            _collect(deadline, "experience", future, job) for job, future in zip(jobs, job_futures)
+        ]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     contact_info = sections.get("contact_info", {})
     # Robust fallback: sanitize to dict even if GPT returns weird types
@@ -50,36 +206,7 @@ def run_resume_enhancement_pipeline(resume_text: str, job_posting: str) -> tuple
             ""
         )
 
-    summary_text = sections.get("summary", "")
-    if isinstance(summary_text, list):
-        summary_text = " ".join(str(s) for s in summary_text)
-    elif not isinstance(summary_text, str):
-        summary_text = str(summary_text)
-
-    skills_text = sections.get("skills", "")
-    if isinstance(skills_text, list):
-        skills_text = ", ".join(str(s) for s in skills_text)
-    elif not isinstance(skills_text, str):
-        skills_text = str(skills_text)
-
-    experience_jobs = sections.get("experience", [])
-    print("Parsed Experience Jobs:")
-    for i, job in enumerate(experience_jobs):
-        print(f"{i+1}. {job.get('title', '?')} @ {job.get('company', '?')}")
-
     education_text = sections.get("education", "Available upon request")
-    projects_text = sections.get("projects", "")
-    if isinstance(projects_text, list):
-        projects_text = "\n".join(str(p) for p in projects_text)
-    elif not isinstance(projects_text, str):
-        projects_text = str(projects_text)
-
-    try:
-        enhanced_projects = enhance_projects_with_gpt(projects_text, pre_match["missing_keywords"])
-    except Exception as e:
-        print("\n🛑 ERROR: Projects enhancement failed")
-        print(e)
-        enhanced_projects = projects_text
 
     # Clean/flatten education if needed
     if isinstance(education_text, list):
@@ -92,39 +219,6 @@ def run_resume_enhancement_pipeline(resume_text: str, job_posting: str) -> tuple
                 formatted_edu.append(edu)
         education_text = "\n".join(formatted_edu)
 
-
-
-    # Step 4: Enhance each resume section
-    try:
-        enhanced_summary = enhance_summary_with_gpt(summary_text, pre_match["missing_keywords"])
-    except Exception as e:
-        print("\n🛑 ERROR: Summary enhancement failed")
-        print(e)
-        raise
-
-    try:
-        enhanced_skills = enhance_skills_with_gpt(skills_text, pre_match["missing_keywords"])
-    except Exception as e:
-        print("\n🛑 ERROR: Skills enhancement failed")
-        print(e)
-        raise
-
-    enhanced_jobs = []
-    try:
-        for job in experience_jobs:
-            original_bullet_count = len(job.get("bullets", []))
-            enhanced_job = enhance_experience_job(
-                job,
-                pre_match["missing_keywords"],
-                job_posting,
-                original_bullet_count
-            )
-            enhanced_jobs.append(enhanced_job)
-    except Exception as e:
-        print("\n🛑 ERROR: Experience enhancement failed")
-        print(e)
-        raise
-
             # === Build header block from contact_info ===
     header_lines = []
 
@@ -161,11 +255,12 @@ def run_resume_enhancement_pipeline(resume_text: str, job_posting: str) -> tuple
         education=education_text,
         projects=enhanced_projects
     )
-    print("[FINAL HTML for export]\n", final_resume)
+    log_sampled(logger, "Final resume (%d chars): %s", len(final_resume), truncated(final_resume))
 
     # Step 6: Post-enhancement scoring
-    post_match = compute_keyword_match(final_resume, job_posting)
-    post_scores = score_keywords(classified_keywords, post_match["matched_keywords"])
+    with stage("post_score"):
+        post_match = compute_keyword_match(final_resume, job_posting)
+        post_scores = score_keywords(classified_keywords, post_match["matched_keywords"])
 
     # Step 7: Return final resume + score report
     score_report = {
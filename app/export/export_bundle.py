@@ -0,0 +1,163 @@
+"""
+Export Bundle - Renders a resume in several styles and formats at once and
+streams the results back as one ZIP, together with the job posting and the
+score report.
+
+Renders run concurrently on a shared worker pool. Files are written to the
+archive in the order they finish. Only a bounded window of renders is in
+flight at a time, so a large style × format matrix never holds every file
+in memory at once.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+from .resume_export import (
+    EXPORT_FORMATS,
+    export_resume,
+    get_available_styles,
+    is_pdf_backend_available,
+)
+from .zip_stream import iter_zip
+
+logger = logging.getLogger(__name__)
+
+# Size of the shared pool; override with the environment variable
+EXPORT_BUNDLE_WORKERS = int(os.getenv("EXPORT_BUNDLE_WORKERS", "4"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_bundle_executor():
+    """Return the worker pool shared by all bundle exports."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_BUNDLE_WORKERS, thread_name_prefix="export-bundle")
+        return _executor
+
+
+def style_slug(style):
+    """File-name friendly form of a style name ("ATS-Friendly" → "ats-friendly")."""
+    return re.sub(r'[^a-z0-9]+', '-', style.lower()).strip('-')
+
+
+def plan_export_jobs(resume_text, styles, formats, contact_info=None):
+    """
+    Build the render jobs for a style × format matrix.
+
+    TXT output does not depend on the style, so it is rendered once. Renders
+    go through export_resume(), so files already produced by /export are reused.
+
+    Returns:
+        list: (arcname, zero-argument callable returning bytes) pairs
+    """
+    jobs = []
+    for fmt in formats:
+        if fmt == "TXT":
+            jobs.append(("resume.txt", partial(_render, resume_text, None, fmt, None)))
+            continue
+        for style in styles:
+            arcname = f"{fmt.lower()}/resume_{style_slug(style)}.{fmt.lower()}"
+            jobs.append((arcname, partial(_render, resume_text, style, fmt, contact_info)))
+    return jobs
+
+
+def _render(resume_text, style, fmt, contact_info):
+    _, data = export_resume(resume_text, style=style, fmt=fmt, contact_info=contact_info)
+    return data
+
+
+def _render_in_completion_order(jobs, errors, window):
+    """
+    Run jobs on the shared pool, keeping at most `window` in flight, and
+    yield (arcname, bytes) as each finishes. Failures go to `errors` instead.
+    """
+    executor = get_bundle_executor()
+    queued = iter(jobs)
+    pending = {}
+
+    def submit_next():
+        job = next(queued, None)
+        if job is not None:
+            arcname, render = job
+            pending[executor.submit(render)] = arcname
+
+    for _ in range(window):
+        submit_next()
+
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                arcname = pending.pop(future)
+                submit_next()
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.warning("Bundle export failed for %s: %s", arcname, e)
+                    errors.append(f"{arcname}: {e}")
+                    continue
+                yield arcname, data
+    finally:
+        # Client went away mid-stream: don't render files nobody will read
+        for future in pending:
+            future.cancel()
+
+
+def build_export_bundle(resume_text, job_posting="", score_report=None, contact_info=None,
+                        styles=None, formats=EXPORT_FORMATS):
+    """
+    Validate an export request and return a ZIP stream for it.
+
+    Args:
+        resume_text (str): Plain text resume content
+        job_posting (str): Posting the resume was tailored to, stored as job_posting.txt
+        score_report (dict, optional): Pipeline score report, stored as score_report.json
+        contact_info (dict, optional): Name and contact fields for the PDF/DOCX header
+        styles (list, optional): Styles from get_available_styles(); defaults to all
+        formats (iterable): Any of EXPORT_FORMATS
+
+    Returns:
+        iterator: ZIP archive chunks (bytes)
+
+    Raises:
+        ValueError: If a style or format is unknown, or nothing was requested
+        RuntimeError: If PDF output was requested but the PDF backend is unavailable
+    """
+    available_styles = get_available_styles()
+    styles = list(dict.fromkeys(styles or available_styles))
+    formats = list(dict.fromkeys(fmt.upper() for fmt in formats))
+
+    unknown_styles = [style for style in styles if style not in available_styles]
+    if unknown_styles:
+        raise ValueError(f"Unknown styles: {unknown_styles}. Available: {available_styles}")
+    unknown_formats = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown_formats:
+        raise ValueError(f"Unknown formats: {unknown_formats}. Available: {list(EXPORT_FORMATS)}")
+    if not formats:
+        raise ValueError("Request at least one export format")
+
+    # Fail before streaming starts; afterwards the response status is already sent
+    if "PDF" in formats and not is_pdf_backend_available():
+        raise RuntimeError("PDF export requested but wkhtmltopdf is not installed (set PDF_BACKEND=native or auto)")
+
+    jobs = plan_export_jobs(resume_text, styles, formats, contact_info)
+    return iter_zip(_bundle_entries(jobs, job_posting, score_report))
+
+
+def _bundle_entries(jobs, job_posting, score_report):
+    yield "job_posting.txt", job_posting or ""
+    if score_report is not None:
+        yield "score_report.json", json.dumps(score_report, indent=2)
+
+    errors = []
+    yield from _render_in_completion_order(jobs, errors, window=EXPORT_BUNDLE_WORKERS * 2)
+
+    if errors:
+        yield "export_errors.txt", "\n".join(errors) + "\n"
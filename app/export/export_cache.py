@@ -0,0 +1,99 @@
+"""
+Export Cache - Size-bounded LRU for rendered exports, keyed by a hash of the
+render inputs.
+
+The key also serves as the HTTP ETag. It is derived from the inputs alone,
+so a client that sends a matching If-None-Match can get a 304 without the
+resume being rendered or even looked up.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Total bytes of rendered files kept in memory; override with the environment variable
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def export_key(resume_text, style, fmt, contact_info=None, version=""):
+    """
+    Stable hash of everything that affects a rendered export.
+
+    `version` lets the caller fold in anything else that changes the output
+    (e.g. a template revision) so old ETags stop matching.
+    """
+    payload = json.dumps(
+        {
+            "resume_text": resume_text,
+            "style": style,
+            "format": fmt,
+            "contact_info": {k: v for k, v in (contact_info or {}).items() if v},
+            "version": version,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def format_etag(key):
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches `etag` (weak comparison, '*' allowed)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ExportCache:
+    """
+    Thread-safe LRU of rendered export bytes, bounded by total size.
+
+    Args:
+        max_bytes (int, optional): Evict least recently used entries beyond this size.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = EXPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        # A single file larger than the whole budget is not worth caching
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,364 @@
+"""
+Native PDF Backend - Lays out a parsed ResumeDocument directly to PDF, in
+process, without wkhtmltopdf.
+
+Text is set in the PDF standard-14 fonts (Helvetica and Times families),
+which every PDF viewer provides, so no font data is embedded at all. Line
+breaking uses the Adobe AFM glyph widths below. Page content streams are
+Flate-compressed. A typical resume renders in a few milliseconds.
+
+Only what resumes need is supported: a header with name and contact lines,
+section headings with optional rules, experience entries, paragraphs and
+bullet lists, with automatic page breaks.
+"""
+import html
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+
+from .resume_document import BulletList, ExperienceEntry
+
+# ---------------------------------
+# Font Metrics
+# ---------------------------------
+
+# Advance widths (1/1000 em) for ASCII 32..126, from the Adobe AFM files
+_ASCII_WIDTHS = {
+    "Helvetica": (
+        "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+        "278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 "
+        "667 611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 "
+        "222 833 556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584"
+    ),
+    "Helvetica-Bold": (
+        "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+        "333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 "
+        "667 611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 611 278 278 556 "
+        "278 889 611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584"
+    ),
+    "Times-Roman": (
+        "250 333 408 500 500 833 778 180 333 333 500 564 250 333 250 278 500 500 500 500 500 500 500 500 500 500 "
+        "278 278 564 564 564 444 921 722 667 667 722 611 556 722 722 333 389 722 611 889 722 722 556 722 667 "
+        "556 611 722 722 944 722 722 611 333 278 333 469 500 333 444 500 444 500 444 333 500 500 278 278 500 "
+        "278 778 500 500 500 500 333 389 278 500 500 722 500 500 444 480 200 480 541"
+    ),
+    "Times-Bold": (
+        "250 333 555 500 500 1000 833 278 333 333 500 570 250 333 250 278 500 500 500 500 500 500 500 500 500 500 "
+        "333 333 570 570 570 500 930 722 667 722 722 667 611 778 778 389 500 778 667 944 722 778 611 778 722 "
+        "556 667 722 722 1000 722 722 667 333 278 333 581 500 333 500 556 444 556 444 333 500 556 278 333 556 "
+        "278 833 556 500 556 556 444 389 333 556 500 722 500 500 444 394 220 394 520"
+    ),
+    "Times-Italic": (
+        "250 333 420 500 500 833 778 214 333 333 500 675 250 333 250 278 500 500 500 500 500 500 500 500 500 500 "
+        "333 333 675 675 675 500 920 611 611 667 722 611 611 722 722 333 444 667 556 833 667 722 611 722 611 "
+        "500 556 722 611 833 611 556 556 389 278 389 422 500 333 500 500 444 500 444 278 500 500 278 278 444 "
+        "278 722 500 500 500 500 389 389 278 500 444 667 444 444 389 400 275 400 541"
+    ),
+}
+# Obliques share the upright metrics
+_ASCII_WIDTHS["Helvetica-Oblique"] = _ASCII_WIDTHS["Helvetica"]
+_ASCII_WIDTHS["Helvetica-BoldOblique"] = _ASCII_WIDTHS["Helvetica-Bold"]
+
+# Common WinAnsi punctuation outside ASCII: (Helvetica width, Times width)
+_PUNCTUATION_WIDTHS = {
+    '•': (350, 350), '–': (556, 500), '—': (1000, 1000), '‘': (222, 333), '’': (222, 333),
+    '“': (333, 444), '”': (333, 444), '…': (1000, 1000), '·': (278, 250), '©': (737, 760),
+    '®': (737, 760), '°': (400, 400), '€': (556, 500), ' ': (278, 250),
+}
+
+FONT_WIDTHS = {
+    font: dict(zip(map(chr, range(32, 127)), map(int, table.split())))
+    for font, table in _ASCII_WIDTHS.items()
+}
+for _font, _widths in FONT_WIDTHS.items():
+    _column = 1 if _font.startswith("Times") else 0
+    _widths.update({char: widths[_column] for char, widths in _PUNCTUATION_WIDTHS.items()})
+
+
+def char_width(char, font):
+    widths = FONT_WIDTHS[font]
+    width = widths.get(char)
+    if width is None:
+        # Accented letters take the width of their base letter
+        base = unicodedata.normalize('NFKD', char)[:1]
+        width = widths.get(base, 556)
+    return width
+
+
+def text_width(text, font, size):
+    """Width of `text` in points when set in `font` at `size`."""
+    return sum(char_width(char, font) for char in text) * size / 1000
+
+
+def wrap_text(text, font, size, max_width):
+    """Greedy word wrap; words wider than a line are broken by character."""
+    space = char_width(' ', font) * size / 1000
+    lines, current, current_width = [], [], 0.0
+
+    for word in text.split():
+        width = text_width(word, font, size)
+        while width > max_width:
+            # Flush what we have, then hard-break the long word
+            if current:
+                lines.append(' '.join(current))
+                current, current_width = [], 0.0
+            cut = 1
+            while cut < len(word) and text_width(word[:cut + 1], font, size) <= max_width:
+                cut += 1
+            lines.append(word[:cut])
+            word = word[cut:]
+            width = text_width(word, font, size)
+        if not word:
+            continue
+        extra = width if not current else space + width
+        if current and current_width + extra > max_width:
+            lines.append(' '.join(current))
+            current, current_width = [word], width
+        else:
+            current.append(word)
+            current_width += extra
+
+    if current:
+        lines.append(' '.join(current))
+    return lines
+
+
+# ---------------------------------
+# Styles
+# ---------------------------------
+
+@dataclass(frozen=True)
+class PdfStyle:
+    """Typography for one resume style. Colors are hex strings, sizes are points."""
+    regular_font: str = "Helvetica"
+    bold_font: str = "Helvetica-Bold"
+    italic_font: str = "Helvetica-Oblique"
+    body_size: float = 9.5
+    name_size: float = 15
+    contact_size: float = 8.5
+    section_size: float = 12
+    entry_size: float = 10.5
+    line_height: float = 1.35
+    text_color: str = "000000"
+    muted_color: str = "000000"
+    heading_color: str = "000000"
+    rule_color: str = "000000"
+    header_rule_width: float = 0.75
+    section_rule_width: float = 0  # 0 disables the rule under section headings
+    centered: bool = False
+    uppercase_name: bool = False
+    margin: float = 54  # points (0.75in)
+    bullet_indent: float = 14
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # Letter
+
+
+# ---------------------------------
+# Layout
+# ---------------------------------
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _plain(text):
+    """Strip inline markup GPT sometimes leaves in resume text."""
+    return html.unescape(_TAG_RE.sub('', text)).strip()
+
+
+def _rgb(hex_color):
+    value = int(hex_color, 16)
+    return f"{(value >> 16 & 255) / 255:.3f} {(value >> 8 & 255) / 255:.3f} {(value & 255) / 255:.3f}"
+
+
+def _pdf_string(text):
+    data = text.encode('cp1252', 'replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class _Layout:
+    """Flows lines down the page, starting a new page when one is full."""
+
+    def __init__(self, style):
+        self.style = style
+        self.fonts = {}  # font name → resource name (F1, F2, ...)
+        self.pages = []
+        self.width = PAGE_WIDTH - 2 * style.margin
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - self.style.margin
+
+    def ensure(self, height):
+        if self.y - height < self.style.margin:
+            self.new_page()
+
+    def space(self, points):
+        # Whitespace at the top of a page is dropped
+        if self.y < PAGE_HEIGHT - self.style.margin:
+            self.y -= points
+
+    def _font_ref(self, font):
+        if font not in self.fonts:
+            self.fonts[font] = f"F{len(self.fonts) + 1}"
+        return self.fonts[font]
+
+    def line(self, text, font, size, color, indent=0.0, centered=False):
+        leading = size * self.style.line_height
+        self.ensure(leading)
+        self.y -= leading
+        x = self.style.margin + indent
+        if centered:
+            x = (PAGE_WIDTH - text_width(text, font, size)) / 2
+        baseline = self.y + (leading - size) / 2 + size * 0.22
+        self.ops.append(
+            b"%s rg BT /%s %.2f Tf %.2f %.2f Td %s Tj ET"
+            % (_rgb(color).encode(), self._font_ref(font).encode(), size, x, baseline, _pdf_string(text))
+        )
+
+    def paragraph(self, text, font, size, color, indent=0.0, centered=False, keep_with_next=0.0):
+        lines = wrap_text(text, font, size, self.width - indent) or ['']
+        # Keep a heading on the same page as at least the start of what follows
+        self.ensure(size * self.style.line_height * min(len(lines), 2) + keep_with_next)
+        for line in lines:
+            self.line(line, font, size, color, indent, centered)
+
+    def bullet(self, text, font, size, color):
+        indent = self.style.bullet_indent
+        lines = wrap_text(text, font, size, self.width - indent) or ['']
+        leading = size * self.style.line_height
+        self.ensure(leading)
+        self.line('•', font, size, color, indent=indent * 0.3)
+        self.y += leading  # bullet glyph shares the first line
+        for line in lines:
+            self.line(line, font, size, color, indent)
+
+    def rule(self, color, width):
+        self.y -= 2
+        self.ops.append(
+            b"%s RG %.2f w %.2f %.2f m %.2f %.2f l S"
+            % (_rgb(color).encode(), width, self.style.margin, self.y, PAGE_WIDTH - self.style.margin, self.y)
+        )
+        self.y -= 4
+
+
+def _layout_block(layout, block, style):
+    if isinstance(block, BulletList):
+        for item in block.items:
+            layout.bullet(_plain(item), style.regular_font, style.body_size, style.text_color)
+        layout.space(style.body_size * 0.3)
+    elif block.kind == "project-title":
+        layout.space(style.body_size * 0.3)
+        layout.paragraph(_plain(block.text), style.bold_font, style.body_size, style.heading_color,
+                         keep_with_next=style.body_size * style.line_height)
+    else:
+        layout.paragraph(_plain(block.text), style.regular_font, style.body_size, style.text_color)
+        layout.space(style.body_size * 0.3)
+
+
+def layout_document(document, style, name="Resume", contact_lines=()):
+    """Lay out the header and document tree; returns the filled _Layout."""
+    layout = _Layout(style)
+
+    header_name = name.upper() if style.uppercase_name else name
+    layout.paragraph(header_name, style.bold_font, style.name_size, style.heading_color, centered=style.centered)
+    for contact_line in contact_lines:
+        layout.paragraph(contact_line, style.regular_font, style.contact_size, style.muted_color, centered=style.centered)
+    if style.header_rule_width:
+        layout.rule(style.rule_color, style.header_rule_width)
+    layout.space(style.body_size * 0.5)
+
+    for block in document.preamble:
+        _layout_block(layout, block, style)
+
+    for section in document.sections:
+        layout.space(style.section_size * 0.5)
+        layout.paragraph(_plain(section.title).upper(), style.bold_font, style.section_size, style.heading_color,
+                         centered=style.centered, keep_with_next=style.body_size * style.line_height * 2)
+        if style.section_rule_width:
+            layout.rule(style.rule_color, style.section_rule_width)
+        layout.space(style.body_size * 0.3)
+
+        for block in section.blocks:
+            if not isinstance(block, ExperienceEntry):
+                _layout_block(layout, block, style)
+                continue
+            layout.space(style.body_size * 0.3)
+            layout.paragraph(_plain(block.title), style.bold_font, style.entry_size, style.heading_color,
+                             keep_with_next=style.body_size * style.line_height * 2)
+            if block.company:
+                layout.paragraph(_plain(block.company), style.italic_font, style.body_size, style.muted_color,
+                                 keep_with_next=style.body_size * style.line_height)
+            for inner in block.blocks:
+                _layout_block(layout, inner, style)
+
+    return layout
+
+
+# ---------------------------------
+# PDF Serialization
+# ---------------------------------
+
+def _serialize(layout, title):
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)  # filled in once the page tree exists
+    pages_id = add(None)
+
+    font_ids = {
+        ref: add(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % font.encode())
+        for font, ref in layout.fonts.items()
+    }
+    font_resources = b" ".join(b"/%s %d 0 R" % (ref.encode(), obj_id) for ref, obj_id in font_ids.items())
+
+    page_ids = []
+    for ops in layout.pages:
+        content = zlib.compress(b"\n".join(ops), 6)
+        content_id = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R /Resources << /Font << %s >> >> >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, content_id, font_resources)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    info_id = add(b"<< /Title %s /Producer (Rex) >>" % _pdf_string(title))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, info_id, xref_at
+    )
+    return bytes(out)
+
+
+def render_pdf(document, style=None, name="Resume", contact_lines=()):
+    """
+    Render a ResumeDocument to PDF bytes.
+
+    Args:
+        document (ResumeDocument): Parsed resume
+        style (PdfStyle, optional): Typography; defaults to PdfStyle()
+        name (str): Name shown in the header and used as the PDF title
+        contact_lines (iterable): Pre-joined contact lines shown under the name
+
+    Returns:
+        bytes: The PDF file
+    """
+    style = style or PdfStyle()
+    layout = layout_document(document, style, name=name, contact_lines=tuple(contact_lines))
+    return _serialize(layout, name)
@@ -0,0 +1,154 @@
+"""
+PDF Renderer - Runs wkhtmltopdf as a pooled service.
+
+The binary is probed once per process. Each render pipes HTML to wkhtmltopdf
+on stdin and reads the PDF from stdout, so no temp files are shared between
+concurrent renders. Renders run on a bounded worker pool with a per-render
+timeout; the work itself happens in the wkhtmltopdf child processes, so
+throughput scales with the number of cores.
+"""
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Defaults for the pool; override with environment variables
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 2)))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+
+class PdfRenderError(Exception):
+    """Raised when wkhtmltopdf is missing, fails, or times out."""
+
+
+def _startupinfo():
+    # On Windows, suppress the console window for each child process
+    if sys.platform.startswith('win'):
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return startupinfo
+    return None
+
+
+def probe_wkhtmltopdf(configured_path=None):
+    """
+    Locate a working wkhtmltopdf binary.
+
+    Tries the configured path first, then wkhtmltopdf on PATH.
+
+    Returns:
+        tuple: (binary path, version string), or (None, None) if not found.
+    """
+    candidates = []
+    if configured_path and os.path.exists(configured_path):
+        candidates.append(configured_path)
+    on_path = shutil.which('wkhtmltopdf')
+    if on_path:
+        candidates.append(on_path)
+
+    for binary in candidates:
+        try:
+            result = subprocess.run(
+                [binary, '-V'],
+                capture_output=True,
+                timeout=10,
+                startupinfo=_startupinfo()
+            )
+        except (subprocess.SubprocessError, OSError):
+            continue
+        if result.returncode == 0:
+            return binary, result.stdout.decode('utf-8', 'replace').strip()
+
+    return None, None
+
+
+# Page objects (not the /Pages tree node)
+_PAGE_OBJECT_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+
+def pdf_stats(pdf_bytes):
+    """
+    Size statistics for a rendered PDF.
+
+    Returns:
+        dict: bytes, pages and bytes_per_page
+    """
+    pages = len(_PAGE_OBJECT_RE.findall(pdf_bytes)) or 1
+    return {
+        "bytes": len(pdf_bytes),
+        "pages": pages,
+        "bytes_per_page": len(pdf_bytes) // pages,
+    }
+
+
+def options_to_args(options):
+    """Convert a pdfkit-style options dict ({'page-size': 'Letter', 'quiet': ''}) to CLI args."""
+    args = []
+    for key, value in (options or {}).items():
+        args.append(f"--{key}")
+        if value not in ('', None):
+            args.append(str(value))
+    return args
+
+
+class PdfRenderer:
+    """
+    A wkhtmltopdf-backed renderer with a bounded worker pool.
+
+    Args:
+        configured_path (str, optional): Preferred wkhtmltopdf location.
+        max_workers (int, optional): Maximum concurrent renders.
+        timeout (float, optional): Seconds before a render is killed.
+    """
+
+    def __init__(self, configured_path=None, max_workers=None, timeout=None):
+        self.configured_path = configured_path
+        self.binary, self.version = probe_wkhtmltopdf(configured_path)
+        self.timeout = timeout or PDF_RENDER_TIMEOUT
+        self.max_workers = max_workers or PDF_RENDER_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-render")
+
+    @property
+    def available(self):
+        return self.binary is not None
+
+    def submit(self, html, options=None) -> Future:
+        """Queue a render on the pool; the future resolves to PDF bytes."""
+        if not self.available:
+            raise PdfRenderError(
+                "wkhtmltopdf is not installed or not found in PATH.\n"
+                "Please install it from https://wkhtmltopdf.org/downloads.html\n"
+                "Or specify the correct path in resume_export.py (WKHTMLTOPDF_PATH)"
+            )
+        return self._executor.submit(self._render, html, options)
+
+    def render(self, html, options=None) -> bytes:
+        """Render HTML to PDF bytes, blocking until the pooled render finishes."""
+        return self.submit(html, options).result()
+
+    def _render(self, html, options):
+        cmd = [self.binary, *options_to_args(options), '-', '-']
+        try:
+            result = subprocess.run(
+                cmd,
+                input=html.encode('utf-8'),
+                capture_output=True,
+                timeout=self.timeout,
+                startupinfo=_startupinfo()
+            )
+        except subprocess.TimeoutExpired as e:
+            raise PdfRenderError(f"wkhtmltopdf timed out after {self.timeout:.0f}s") from e
+        except OSError as e:
+            raise PdfRenderError(f"Could not start wkhtmltopdf: {e}") from e
+
+        # wkhtmltopdf can exit non-zero on recoverable load errors but still produce a PDF
+        if not result.stdout.startswith(b'%PDF'):
+            stderr = result.stderr.decode('utf-8', 'replace').strip()
+            raise PdfRenderError(f"wkhtmltopdf failed (exit {result.returncode}): {stderr[-500:]}")
+
+        return result.stdout
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
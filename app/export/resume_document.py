@@ -0,0 +1,345 @@
+"""
+Resume Document Model - Parses plain-text resumes into a typed tree once,
+then renders that tree to HTML, plain text or Markdown (DOCX rendering lives
+in resume_export.py next to the python-docx styling).
+
+Parsed documents are cached by a hash of the text, so exporting the same
+resume in several formats and styles only parses it once.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+
+# ---------------------------------
+# Document Tree
+# ---------------------------------
+
+@dataclass(frozen=True)
+class Paragraph:
+    text: str
+    kind: str = "body"  # 'body' or 'project-title'
+
+
+@dataclass(frozen=True)
+class BulletList:
+    items: Tuple[str, ...]
+
+
+Block = Union[Paragraph, BulletList]
+
+
+@dataclass(frozen=True)
+class ExperienceEntry:
+    title: str
+    company: Optional[str] = None
+    blocks: Tuple[Block, ...] = ()
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    blocks: Tuple[Union[Block, ExperienceEntry], ...] = ()
+
+
+@dataclass(frozen=True)
+class ResumeDocument:
+    preamble: Tuple[Block, ...] = ()  # content before the first section header
+    sections: Tuple[Section, ...] = field(default_factory=tuple)
+
+
+# ---------------------------------
+# Precompiled Patterns
+# ---------------------------------
+
+EXPERIENCE_SECTION_TITLES = {"EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT", "PROFESSIONAL EXPERIENCE"}
+
+# Common job title words for detection
+JOB_TITLE_KEYWORDS = (
+    'Analyst', 'Engineer', 'Manager', 'Director', 'Specialist', 'Associate',
+    'Consultant', 'Developer', 'Accountant', 'Coordinator', 'Assistant',
+    'Supervisor', 'Representative', 'Administrator', 'Designer', 'Programmer',
+    'Budget'
+)
+
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)"
+SHORT_DATE_RANGE_RE = re.compile(
+    rf"\b{_MONTH}\s+'\d{{2}}\s*[-–—]\s*{_MONTH}\s+'\d{{2}}|\b{_MONTH}\s+'\d{{2}}\s*[-–—]\s*Present",
+    re.IGNORECASE
+)
+YEAR_RANGE_RE = re.compile(r"\b(19|20)\d{2}\s*[-–—]\s*(19|20)\d{2}|\b(19|20)\d{2}\s*[-–—]")
+AT_COMPANY_RE = re.compile(r"(.*?)\s+at\s+(.*?)$", re.IGNORECASE)
+SPECIAL_BULLET_RE = re.compile(r"^[□■◆📌]\s*(.*?)$")
+BULLET_RE = re.compile(r"^(?:[•\-*]|[1-9]\.)\s*")
+NUMBERED_RE = re.compile(r"^\d+\.")
+UNDERLINE_RE = re.compile(r"^[-=_\s]+$")
+PROJECT_TITLE_RE = re.compile(r'^<p class="project-title">(.*?)</p>$')
+BLANK_RUN_RE = re.compile(r'\n{3,}')
+
+
+def is_section_header(line):
+    """All-caps lines, or lines using dashes/equals as header decoration."""
+    return line.isupper() or line.startswith('---') or '=' in line
+
+
+def is_bullet(line):
+    return BULLET_RE.match(line) is not None
+
+
+def is_job_title(line):
+    if SHORT_DATE_RANGE_RE.search(line) or AT_COMPANY_RE.search(line):
+        return True
+    return any(keyword in line for keyword in JOB_TITLE_KEYWORDS) and YEAR_RANGE_RE.search(line) is not None
+
+
+# ---------------------------------
+# Parser
+# ---------------------------------
+
+class _Builder:
+    """Accumulates blocks for the section/entry currently being parsed."""
+
+    def __init__(self):
+        self.preamble = []
+        self.sections = []
+        self.section_title = None
+        self.section_blocks = []
+        self.entry = None  # [title, company, blocks]
+        self.bullets = []
+
+    def _target(self):
+        if self.entry is not None:
+            return self.entry[2]
+        if self.section_title is not None:
+            return self.section_blocks
+        return self.preamble
+
+    def flush_bullets(self):
+        if self.bullets:
+            self._target().append(BulletList(tuple(self.bullets)))
+            self.bullets = []
+
+    def flush_entry(self):
+        self.flush_bullets()
+        if self.entry is not None:
+            title, company, blocks = self.entry
+            self.section_blocks.append(ExperienceEntry(title, company, tuple(blocks)))
+            self.entry = None
+
+    def flush_section(self):
+        self.flush_entry()
+        if self.section_title is not None:
+            self.sections.append(Section(self.section_title, tuple(self.section_blocks)))
+        self.section_title = None
+        self.section_blocks = []
+
+    def add_paragraph(self, paragraph):
+        self.flush_bullets()
+        self._target().append(paragraph)
+
+    def document(self):
+        self.flush_section()
+        self.flush_bullets()
+        return ResumeDocument(tuple(self.preamble), tuple(self.sections))
+
+
+def _parse(resume_text):
+    builder = _Builder()
+    awaiting_company = False
+
+    for line in resume_text.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Underlines ("-------") only decorate the header above them
+        if UNDERLINE_RE.match(line):
+            continue
+
+        # Project titles are emitted as markup by the projects enhancer; check
+        # them before headers since the class attribute contains '='
+        project_title = PROJECT_TITLE_RE.match(line)
+        if project_title:
+            builder.add_paragraph(Paragraph(project_title.group(1), kind="project-title"))
+            awaiting_company = False
+            continue
+
+        if is_section_header(line):
+            builder.flush_section()
+            builder.section_title = line.replace('-', '').replace('=', '').strip()
+            awaiting_company = False
+            continue
+
+        in_experience = builder.section_title and builder.section_title.upper() in EXPERIENCE_SECTION_TITLES
+
+        if in_experience:
+            # Position with a special bullet (□, ■, ◆, 📌)
+            special = SPECIAL_BULLET_RE.match(line)
+            if special:
+                builder.flush_entry()
+                builder.entry = [special.group(1), None, []]
+                awaiting_company = True
+                continue
+
+            if not is_bullet(line) and is_job_title(line):
+                builder.flush_entry()
+                builder.entry = [line, None, []]
+                awaiting_company = True
+                continue
+
+            # Short non-bullet line right after a job title is the company
+            if awaiting_company and not is_bullet(line) and not NUMBERED_RE.match(line) and len(line) < 100:
+                builder.entry[1] = line[3:].strip() if line.lower().startswith('at ') else line
+                awaiting_company = False
+                continue
+
+        if is_bullet(line):
+            awaiting_company = False
+            builder.bullets.append(BULLET_RE.sub('', line, count=1))
+            continue
+
+        builder.add_paragraph(Paragraph(line))
+        awaiting_company = False
+
+    return builder.document()
+
+
+DOCUMENT_CACHE_SIZE = 128
+_document_cache = OrderedDict()
+_document_cache_lock = threading.Lock()
+
+
+def parse_resume_text(resume_text):
+    """
+    Parse plain resume text into a ResumeDocument.
+
+    Results are cached by a hash of the text (LRU, DOCUMENT_CACHE_SIZE entries),
+    so repeated exports of the same resume reuse one parse.
+    """
+    key = hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+    with _document_cache_lock:
+        document = _document_cache.get(key)
+        if document is not None:
+            _document_cache.move_to_end(key)
+            return document
+
+    document = _parse(resume_text)
+
+    with _document_cache_lock:
+        _document_cache[key] = document
+        while len(_document_cache) > DOCUMENT_CACHE_SIZE:
+            _document_cache.popitem(last=False)
+    return document
+
+
+# ---------------------------------
+# Renderers
+# ---------------------------------
+
+def _html_block(block, out):
+    if isinstance(block, BulletList):
+        out.append('<ul class="bullet-list">')
+        out.extend(f'<li>{item}</li>' for item in block.items)
+        out.append('</ul>')
+    elif block.kind == "project-title":
+        out.append(f'<p class="project-title">{block.text}</p>')
+    else:
+        out.append(f'<p>{block.text}</p>')
+
+
+def render_html(document):
+    """
+    Render the document body as HTML for the export templates.
+    Text is emitted as-is (GPT output may contain intentional markup).
+    """
+    out = []
+    for block in document.preamble:
+        _html_block(block, out)
+
+    for section in document.sections:
+        out.append(f'<h2>{section.title}</h2>')
+        out.append('<div class="section">')
+        for block in section.blocks:
+            if isinstance(block, ExperienceEntry):
+                out.append('<div class="experience-entry">')
+                out.append(f'<h3>{block.title}</h3>')
+                if block.company:
+                    out.append(f'<p class="company-name"><strong>{block.company}</strong></p>')
+                for inner in block.blocks:
+                    _html_block(inner, out)
+                out.append('</div>')
+            else:
+                _html_block(block, out)
+        out.append('</div>')
+
+    return '\n'.join(out)
+
+
+def _text_block(block, out, bullet):
+    if isinstance(block, BulletList):
+        out.extend(f'{bullet} {item}' for item in block.items)
+    else:
+        out.append(block.text)
+
+
+def render_text(document):
+    """Render the document as clean plain text with underlined section headers."""
+    out = []
+    for block in document.preamble:
+        _text_block(block, out, '•')
+
+    for section in document.sections:
+        if out:
+            out.append('')
+        out.append(section.title)
+        out.append('-' * len(section.title))
+        for block in section.blocks:
+            if isinstance(block, ExperienceEntry):
+                # Same job marker format_experience_section() uses
+                out.append(f'◆ {block.title}')
+                if block.company:
+                    out.append(block.company)
+                for inner in block.blocks:
+                    _text_block(inner, out, '•')
+                out.append('')
+            else:
+                _text_block(block, out, '•')
+
+    return BLANK_RUN_RE.sub('\n\n', '\n'.join(out)).strip() + '\n'
+
+
+def _markdown_block(block, out):
+    if isinstance(block, BulletList):
+        out.extend(f'- {item}' for item in block.items)
+        out.append('')
+    elif block.kind == "project-title":
+        out.append(f'**{block.text}**')
+        out.append('')
+    else:
+        out.append(block.text)
+        out.append('')
+
+
+def render_markdown(document, name=None):
+    """Render the document as Markdown, optionally with the name as a top-level heading."""
+    out = []
+    if name:
+        out.extend([f'# {name}', ''])
+    for block in document.preamble:
+        _markdown_block(block, out)
+
+    for section in document.sections:
+        out.extend([f'## {section.title}', ''])
+        for block in section.blocks:
+            if isinstance(block, ExperienceEntry):
+                out.extend([f'### {block.title}', ''])
+                if block.company:
+                    out.extend([f'*{block.company}*', ''])
+                for inner in block.blocks:
+                    _markdown_block(inner, out)
+            else:
+                _markdown_block(block, out)
+
+    return '\n'.join(out).strip() + '\n'
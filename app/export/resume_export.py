@@ -9,16 +9,42 @@ For macOS: brew install wkhtmltopdf
 For Ubuntu/Debian: sudo apt-get install wkhtmltopdf
 """
 import io
+import logging
 import os
-import sys
-import subprocess
+import threading
 from pathlib import Path
 import jinja2
-import pdfkit
 from docx import Document
-from docx.shared import Pt, Inches
+from docx.shared import Pt, Inches, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-import re
+from docx.oxml.ns import qn
+
+from .export_cache import ExportCache, export_key, format_etag
+from .pdf_native import PdfStyle, render_pdf
+from .pdf_renderer import PdfRenderer, PdfRenderError, pdf_stats
+from .resume_document import (
+    BulletList,
+    ExperienceEntry,
+    parse_resume_text,
+    render_html,
+    render_markdown,
+    render_text,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _ContactFields:
+    """Log argument naming the contact fields that are set, never their values."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, *values):
+        self.values = values
+
+    def __str__(self):
+        return ", ".join(field for field, value in zip(CONTACT_FIELDS, self.values) if value) or "none"
 
 # Disable WeasyPrint - We'll use only wkhtmltopdf
 WEASYPRINT_AVAILABLE = False
@@ -28,11 +54,6 @@ STYLE_ATS = "ATS-Friendly"
 STYLE_MODERN = "Modern"
 STYLE_PROFESSIONAL = "Professional"
 
-# Create a directory for templates if it doesn't exist
-template_dir = Path("templates")
-if not template_dir.exists():
-    template_dir.mkdir()
-
 # ---------------------------------
 # Global Configuration
 # ---------------------------------
@@ -45,385 +66,147 @@ WKHTMLTOPDF_PATH = "C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe"  # Pat
 # Flag to disable problematic imports for simpler deployment
 ENABLE_PDF_GENERATION = True  # PDF generation is now enabled
 
-# Force update of templates on startup
-def force_update_templates():
-    """Force update the template files with the current template definitions."""
-    print("Forcing update of template files...")
-    for style, filename in template_files.items():
-        file_path = template_dir / filename
-        template_content = None
-        if style == STYLE_ATS:
-            template_content = ATS_TEMPLATE
-        elif style == STYLE_MODERN:
-            template_content = MODERN_TEMPLATE
-        elif style == STYLE_PROFESSIONAL:
-            template_content = PROFESSIONAL_TEMPLATE
-        
-        if template_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(template_content)
-            print(f"Updated template: {filename}")
+# wkhtmltopdf options used for every PDF render
+PDF_OPTIONS = {
+    'page-size': 'Letter',
+    'margin-top': '0.5in',
+    'margin-right': '0.5in',
+    'margin-bottom': '0.5in',
+    'margin-left': '0.5in',
+    'encoding': 'UTF-8',
+    'quiet': '',
+    'print-media-type': '',
+    'no-background': '',
+}
+
+_pdf_renderer = None
+_pdf_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer():
+    """
+    Return the shared PdfRenderer, probing wkhtmltopdf only the first time
+    (or again if WKHTMLTOPDF_PATH has been changed since).
+    """
+    global _pdf_renderer
+    with _pdf_renderer_lock:
+        if _pdf_renderer is None or _pdf_renderer.configured_path != WKHTMLTOPDF_PATH:
+            if _pdf_renderer is not None:
+                _pdf_renderer.shutdown()
+            _pdf_renderer = PdfRenderer(configured_path=WKHTMLTOPDF_PATH)
+        return _pdf_renderer
+
 
 # Check if wkhtmltopdf is installed and accessible
 def is_wkhtmltopdf_installed():
-    """Check if wkhtmltopdf is installed and accessible in the PATH."""
-    try:
-        # Use custom path if provided
-        wkhtmltopdf_cmd = WKHTMLTOPDF_PATH if WKHTMLTOPDF_PATH else 'wkhtmltopdf'
-        
-        # Try to execute wkhtmltopdf to check if it's in the PATH
-        if sys.platform.startswith('win'):
-            # On Windows, we need to suppress the console window
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            process = subprocess.Popen(
-                [wkhtmltopdf_cmd, '-V'], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo
-            )
-        else:
-            # On Unix-like systems
-            process = subprocess.Popen(
-                [wkhtmltopdf_cmd, '-V'], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-        
-        # Wait for the process to complete and get output
-        stdout, stderr = process.communicate()
-        
-        # If the command ran successfully, wkhtmltopdf is installed
-        return process.returncode == 0
-    except (subprocess.SubprocessError, FileNotFoundError):
-        # If there was an error running the command, wkhtmltopdf is not installed
-        return False
+    """Check if wkhtmltopdf is installed and accessible (probed once per process)."""
+    return get_pdf_renderer().available
+
+# PDF backends: "wkhtmltopdf" renders the HTML templates in an external engine,
+# "native" lays out the parsed resume in-process (pdf_native.py), and "auto"
+# uses wkhtmltopdf when it is installed and native otherwise.
+PDF_BACKENDS = ("auto", "wkhtmltopdf", "native")
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+
+
+def resolve_pdf_backend(backend=None):
+    """Return the concrete backend ("wkhtmltopdf" or "native") a render would use."""
+    backend = backend or PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}. Available: {list(PDF_BACKENDS)}")
+    if backend == "auto":
+        return "wkhtmltopdf" if is_wkhtmltopdf_installed() else "native"
+    return backend
+
+
+def is_pdf_backend_available(backend=None):
+    """True if the selected PDF backend can render right now."""
+    return resolve_pdf_backend(backend) == "native" or is_wkhtmltopdf_installed()
 
 # ---------------------------------
 # HTML Templates for PDF Generation
 # ---------------------------------
 
-# ATS-Friendly Template - Simple, clean, no fancy formatting that could confuse ATS systems
-ATS_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{{ name }}</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            font-size: 12px;
-            line-height: 1.5;
-            margin: 0.75in;
-        }
-        .header {
-            margin-bottom: 15px;
-            border-bottom: 1px solid #000;
-            padding-bottom: 8px;
-        }
-        .header h1 {
-            font-size: 18px;
-            margin: 0 0 5px 0;
-            border-bottom: none;
-        }
-        .contact-info {
-            font-size: 11px;
-            margin: 5px 0;
-        }
-        .contact-item {
-            display: inline-block;
-            margin-right: 12px;
-        }
-        h1, h2, h3 {
-            margin-top: 12px;
-            margin-bottom: 6px;
-        }
-        h1 {
-            font-size: 18px;
-            border-bottom: 1px solid #000;
-            padding-bottom: 5px;
-        }
-        h2 {
-            font-size: 16px;
-            text-transform: uppercase;
-        }
-        .company-name {
-            margin-top: -5px;
-            margin-bottom: 8px;
-            font-style: normal;
-        }
-        .project-title {
-            font-weight: bold !important;
-            font-size: 12px;  /* match bullet size */
-            margin-top: 6px;
-            margin-bottom: 2px;
-        }
-
-        .section {
-            margin-bottom: 15px;
-        }
-        .bullet-list {
-            margin-left: 15px;
-            list-style-type: disc;
-        }
-        .experience-entry {
-            margin-bottom: 10px;
-        }
-    </style>
-</head>
-<body>
-  <div class="header">
-    <h1>{{ name }}</h1>
-    {% if title or location or phone or email %}
-    <p>
-      {% if title %}{{ title }}{% endif %}
-      {% if title and location %} | {% endif %}
-      {% if location %}{{ location }}{% endif %}
-      {% if phone %} | {{ phone }}{% endif %}
-      {% if email %} | {{ email }}{% endif %}
-    </p>
-    {% endif %}
-    {% if linkedin or github or website %}
-    <p>
-      {% if linkedin %}<a href="{{ linkedin }}">{{ linkedin }}</a>{% endif %}
-      {% if github %} | <a href="{{ github }}">{{ github }}</a>{% endif %}
-      {% if website %} | <a href="{{ website }}">{{ website }}</a>{% endif %}
-    </p>
-    {% endif %}
-  </div>
-
-  {{ content | safe }}
-</body>
-</html>
-"""
-
-# Modern Template - More whitespace, clean design, some color accents
-MODERN_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{{ name }}</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            font-size: 12px;
-            line-height: 1.6;
-            margin: 0.75in;
-            color: #333;
-        }
-        .header {
-            margin-bottom: 20px;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }
-        .header h1 {
-            font-size: 22px;
-            margin: 0 0 5px 0;
-            color: #2c3e50;
-            border-bottom: none;
-        }
-        .contact-info {
-            font-size: 11px;
-            margin: 5px 0;
-            color: #555;
-        }
-        .contact-item {
-            display: inline-block;
-            margin-right: 10px;
-        }
-        h1, h2, h3 {
-            margin-top: 15px;
-            margin-bottom: 8px;
-            color: #2c3e50;
-        }
-        h1 {
-            font-size: 20px;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 8px;
-        }
-        h2 {
-            font-size: 16px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        .company-name {
-            margin-top: -4px;
-            margin-bottom: 8px;
-            color: #555;
-            font-style: italic;
-        }
-        .project-title {
-            font-weight: bold !important;
-            font-size: 12px;
-            margin-top: 6px;
-            margin-bottom: 2px;
-            color: #2c3e50;  /* or match your bullet font color */
-        }
-
-        .section {
-            margin-bottom: 20px;
-        }
-        .bullet-list {
-            margin-left: 18px;
-            list-style-type: square;
-        }
-        .experience-entry {
-            margin-bottom: 15px;
-            padding-bottom: 10px;
-            border-bottom: 1px dotted #ddd;
-        }
-        h3 {
-            font-size: 14px;
-            font-weight: bold;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            color: #2c3e50;
-        }
-
-    </style>
-</head>
-<body>
-  <div class="header">
-    <h1>{{ name }}</h1>
-    {% if title or location or phone or email %}
-    <p>
-      {% if title %}{{ title }}{% endif %}
-      {% if title and location %} | {% endif %}
-      {% if location %}{{ location }}{% endif %}
-      {% if phone %} | {{ phone }}{% endif %}
-      {% if email %} | {{ email }}{% endif %}
-    </p>
-    {% endif %}
-    {% if linkedin or github or website %}
-    <p>
-      {% if linkedin %}<a href="{{ linkedin }}">{{ linkedin }}</a>{% endif %}
-      {% if github %} | <a href="{{ github }}">{{ github }}</a>{% endif %}
-      {% if website %} | <a href="{{ website }}">{{ website }}</a>{% endif %}
-    </p>
-    {% endif %}
-  </div>
-
-  {{ content | safe }}
-</body>
-</html>
-"""
-
-# Professional Template - Traditional, serif fonts, structured layout
-PROFESSIONAL_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{{ name }}</title>
-    <style>
-        body {
-            font-family: Georgia, 'Times New Roman', Times, serif;
-            font-size: 12px;
-            line-height: 1.5;
-            margin: 0.75in;
-            color: #222;
-        }
-        .header {
-            text-align: center;
-            margin-bottom: 15px;
-            border-bottom: 1px solid #444;
-            padding-bottom: 10px;
-        }
-        .header h1 {
-            font-size: 22px;
-            margin: 0 0 5px 0;
-            border-bottom: none;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        .contact-info {
-            font-size: 11px;
-            margin: 5px 0;
-        }
-        .contact-item {
-            display: inline-block;
-            margin: 0 8px;
-        }
-        h1, h2, h3 {
-            margin-top: 14px;
-            margin-bottom: 7px;
-            font-family: Cambria, Cochin, Georgia, Times, 'Times New Roman', serif;
-        }
-        h1 {
-            font-size: 18px;
-            border-bottom: 1px solid #444;
-            padding-bottom: 6px;
-            text-align: center;
-        }
-        h2 {
-            font-size: 16px;
-            text-transform: uppercase;
-            text-align: center;
-        }
-        .company-name {
-            margin-top: -3px;
-            margin-bottom: 10px;
-            font-style: italic;
-            text-align: center;
-        }
-
-        .project-title {
-            font-weight: bold !important;
-            font-size: 12px;
-            margin-top: 6px;
-            margin-bottom: 2px;
-            font-family: Georgia, 'Times New Roman', Times, serif;
-        }
-
-        .section {
-            margin-bottom: 18px;
-        }
-        .bullet-list {
-            margin-left: 20px;
-            list-style-type: disc;
-        }
-        .experience-entry {
-            margin-bottom: 12px;
-        }
-    </style>
-</head>
-<body>
-  <div class="header">
-    <h1>{{ name }}</h1>
-    {% if title or location or phone or email %}
-    <p>
-      {% if title %}{{ title }}{% endif %}
-      {% if title and location %} | {% endif %}
-      {% if location %}{{ location }}{% endif %}
-      {% if phone %} | {{ phone }}{% endif %}
-      {% if email %} | {{ email }}{% endif %}
-    </p>
-    {% endif %}
-    {% if linkedin or github or website %}
-    <p>
-      {% if linkedin %}<a href="{{ linkedin }}">{{ linkedin }}</a>{% endif %}
-      {% if github %} | <a href="{{ github }}">{{ github }}</a>{% endif %}
-      {% if website %} | <a href="{{ website }}">{{ website }}</a>{% endif %}
-    </p>
-    {% endif %}
-  </div>
-
-  {{ content | safe }}
-</body>
-</html>
-"""
+# Templates ship with the package in export/templates/ and are loaded through
+# a single Jinja2 environment: compiled once per process, kept in memory, and
+# backed by a bytecode cache so new processes skip recompilation.
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
 
-# Save templates to files
+# Style name → template file in TEMPLATE_DIR
 template_files = {
     STYLE_ATS: "ats_template.html",
     STYLE_MODERN: "modern_template.html",
     STYLE_PROFESSIONAL: "professional_template.html"
 }
 
-# Update template files (ensure they have the latest content)
-force_update_templates()
+_template_env = None
+
+
+def register_style(style, template_file):
+    """
+    Register a resume style backed by a template file in TEMPLATE_DIR.
+
+    Args:
+        style (str): Display name of the style (shown in get_available_styles()).
+        template_file (str): File name of the Jinja2 HTML template.
+    """
+    template_files[style] = template_file
+
+
+def get_template_environment():
+    """Return the shared Jinja2 environment, creating it on first use."""
+    global _template_env
+    if _template_env is None:
+        # PackageLoader resolves templates relative to this package however it
+        # was imported (export.* from Streamlit, app.export.* from the backend)
+        if __package__:
+            loader = jinja2.PackageLoader(__package__, "templates")
+        else:
+            loader = jinja2.FileSystemLoader(str(TEMPLATE_DIR))
+
+        _template_env = jinja2.Environment(
+            loader=loader,
+            bytecode_cache=jinja2.FileSystemBytecodeCache(os.getenv("JINJA_BYTECODE_CACHE_DIR")),
+            auto_reload=False,  # templates never change at runtime; skip per-render stat()
+            cache_size=-1,      # keep every compiled template for the life of the process
+        )
+    return _template_env
+
+
+def get_style_template(style):
+    """Return the compiled template for a style, falling back to ATS."""
+    template_file = template_files.get(style, template_files[STYLE_ATS])
+    return get_template_environment().get_template(template_file)
+
+# Typography for the native PDF backend, mirroring the HTML templates
+NATIVE_PDF_STYLES = {
+    STYLE_ATS: PdfStyle(),
+    STYLE_MODERN: PdfStyle(
+        text_color="333333",
+        muted_color="555555",
+        heading_color="2c3e50",
+        rule_color="3498db",
+        name_size=16.5,
+        header_rule_width=1.5,
+        section_rule_width=1.5,
+    ),
+    STYLE_PROFESSIONAL: PdfStyle(
+        regular_font="Times-Roman",
+        bold_font="Times-Bold",
+        italic_font="Times-Italic",
+        text_color="222222",
+        rule_color="444444",
+        name_size=16.5,
+        section_rule_width=0.75,
+        centered=True,
+        uppercase_name=True,
+    ),
+}
+
+
+def register_native_pdf_style(style, pdf_style):
+    """Register the native PDF typography for a style (see register_style for HTML)."""
+    NATIVE_PDF_STYLES[style] = pdf_style
 
 # ---------------------------------
 # Formatting Helper Functions
@@ -440,159 +223,13 @@ def format_text_to_html(resume_text):
     Returns:
         str: HTML formatted resume content
     """
-    # Split the resume into lines
-    lines = resume_text.strip().split('\n')
-    
-    # Initialize variables
-    html_output = []
-    current_section = None
-    in_bullet_list = False
-    in_experience_entry = False
-    
-    # Initialize job position tracking
-    previous_line_was_job_title = False
-    company_found = False
-    
-    # Common job title words for detection
-    job_title_keywords = [
-        'Analyst', 'Engineer', 'Manager', 'Director', 'Specialist', 'Associate', 
-        'Consultant', 'Developer', 'Accountant', 'Coordinator', 'Assistant',
-        'Supervisor', 'Representative', 'Administrator', 'Designer', 'Programmer',
-        'Budget'
-    ]
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-        
-        # Detect section headers (all caps, or with dashes/underscores)
-        if line.isupper() or line.startswith('---') or all(c in line for c in ['=', '=']):
-            # Close any open sections and lists
-            if in_bullet_list:
-                html_output.append('</ul>')
-                in_bullet_list = False
-            
-            # Start a new section
-            clean_line = line.replace('-', '').replace('=', '').strip()
-            html_output.append(f'<h2>{clean_line}</h2>')
-            html_output.append('<div class="section">')
-            if current_section:
-                html_output.append('</div>')  # Close previous section
-            current_section = clean_line
-            previous_line_was_job_title = False
-            company_found = False
-            continue
-        
-        # Special processing for experience section
-        if current_section and current_section.upper() in ["EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT", "PROFESSIONAL EXPERIENCE"]:
-            
-            # Check for position with special bullets (□, ■, ◆, 📌)
-            special_bullet_match = re.match(r'^([□■◆📌]\s*)(.*?)$', line)
-            if special_bullet_match:
-                # This is a job title line with a special bullet
-                if in_bullet_list:
-                    html_output.append('</ul>')
-                    in_bullet_list = False
-                
-                if in_experience_entry:
-                    html_output.append('</div>')  # Close previous experience entry
-                
-                bullet, position_text = special_bullet_match.groups()
-                html_output.append('<div class="experience-entry">')
-                html_output.append(f'<h3>{position_text}</h3>')
-                in_experience_entry = True
-                previous_line_was_job_title = True
-                company_found = False
-                continue
-            
-            # Check for date pattern directly indicating a job title line
-            date_pattern_match = re.search(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}\s*[-–—]\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}\s*[-–—]\s*Present', line, re.IGNORECASE)
-            
-            # Check for a job title format (Position at Company)
-            at_company_pattern = re.search(r'(.*?)\s+at\s+(.*?)$', line, re.IGNORECASE)
-            
-            # If a line contains a job title keyword followed by date pattern, it's likely a job title
-            job_title_with_date = False
-            if any(keyword in line for keyword in job_title_keywords) and re.search(r'\b(19|20)\d{2}\s*[-–—]\s*(19|20)\d{2}|\b(19|20)\d{2}\s*[-–—]', line):
-                job_title_with_date = True
-            
-            if date_pattern_match or at_company_pattern or job_title_with_date:
-                # Handle as job title
-                if in_bullet_list:
-                    html_output.append('</ul>')
-                    in_bullet_list = False
-                
-                if in_experience_entry:
-                    html_output.append('</div>')  # Close previous experience entry
-                
-                html_output.append('<div class="experience-entry">')
-                html_output.append(f'<h3>{line}</h3>')
-                in_experience_entry = True
-                previous_line_was_job_title = True
-                company_found = False
-                continue
-            
-            # Handle company name after job title
-            if previous_line_was_job_title and not company_found:
-                # If the next line doesn't look like a bullet point and is relatively short, it's likely a company name
-                if (not line.startswith(('•', '-', '*')) and 
-                    not re.match(r'^\d+\.', line) and 
-                    len(line) < 100):
-                    
-                    # Handle company with "at" format (e.g., "at Company Name")
-                    if line.lower().startswith('at '):
-                        company_name = line[3:].strip()  # Remove 'at ' prefix
-                    else:
-                        company_name = line
-                    
-                    html_output.append(f'<p class="company-name"><strong>{company_name}</strong></p>')
-                    previous_line_was_job_title = False
-                    company_found = True
-                    continue
-        
-        # Handle regular bullet points (lines starting with •, -, *, or numbers)
-        if line.startswith('•') or line.startswith('-') or line.startswith('*') or (line.strip().startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.'))):
-            # If the previous line was a job title and no company was found, this isn't a real bullet point yet
-            if previous_line_was_job_title and not company_found:
-                # We'll assume no company name was provided, so continue to bullet points
-                company_found = True
-                previous_line_was_job_title = False
-                
-            if not in_bullet_list:
-                html_output.append('<ul class="bullet-list">')
-                in_bullet_list = True
-            
-            # Clean the bullet character and add the item
-            bullet_text = line.lstrip('•-*123456789. \t')
-            html_output.append(f'<li>{bullet_text}</li>')
-            continue
-        
-        # Regular paragraph text
-        if in_bullet_list:
-            html_output.append('</ul>')
-            in_bullet_list = False
-        
-        html_output.append(f'<p>{line}</p>')
-        previous_line_was_job_title = False
-    
-    # Close any open tags
-    if in_bullet_list:
-        html_output.append('</ul>')
-    if in_experience_entry:
-        html_output.append('</div>')
-    if current_section:
-        html_output.append('</div>')
-    
-    return '\n'.join(html_output)
+    return render_html(parse_resume_text(resume_text))
 
 # ---------------------------------
 # Export Helper Functions
 # ---------------------------------
 
-def generate_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=None, location=None, linkedin=None, github=None, website=None):
+def generate_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=None, location=None, linkedin=None, github=None, website=None, backend=None):
     """
     Generate a PDF version of the resume using the specified style template.
     
@@ -606,10 +243,13 @@ def generate_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=
         linkedin (str, optional): LinkedIn profile URL
         github (str, optional): GitHub profile URL
         website (str, optional): Personal website URL
+        backend (str, optional): One of PDF_BACKENDS (defaults to PDF_BACKEND)
         
     Returns:
         bytes: The PDF file as bytes
     """
+    backend = resolve_pdf_backend(backend)
+
     # Check if PDF generation is disabled
     if not ENABLE_PDF_GENERATION:
         raise Exception(
@@ -619,29 +259,25 @@ def generate_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=
             "3. If needed, set WKHTMLTOPDF_PATH to the executable path"
         )
     
-    # Print debugging info for contact info
-    print(f"PDF Generation - Contact Info:")
-    print(f"  Name: {name}")
-    print(f"  Email: {email}")
-    print(f"  Phone: {phone}")
-    print(f"  Location: {location}")
-    print(f"  LinkedIn: {linkedin}")
-    print(f"  GitHub: {github}")
-    print(f"  Website: {website}")
-    
-    # Get the appropriate template based on style
-    template_file = template_files.get(style, template_files[STYLE_ATS])
-    template_path = template_dir / template_file
+    # Contact values are PII; log only which fields are present
+    logger.debug("PDF generation (%s, %s backend): contact fields %s", style, backend,
+                 _ContactFields(name, email, phone, location, linkedin, github, website))
+
+    if backend == "native":
+        pdf_bytes = generate_native_pdf(
+            resume_text, style=style, name=name, email=email, phone=phone, location=location,
+            linkedin=linkedin, github=github, website=website
+        )
+        stats = pdf_stats(pdf_bytes)
+        logger.debug("PDF (native): %s bytes, %s pages, %s bytes/page",
+                     stats['bytes'], stats['pages'], stats['bytes_per_page'])
+        return pdf_bytes
     
     # Format text to HTML
     html_content = format_text_to_html(resume_text)
     
-    # Load and render the template
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_text = f.read()
-    
-    # Create a Jinja2 template and render it
-    template = jinja2.Template(template_text)
+    # Render with the precompiled template for this style
+    template = get_style_template(style)
     rendered_html = template.render(
         name=name if name else "Resume",
         content=html_content,
@@ -653,83 +289,143 @@ def generate_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=
         website=website if website else None
     )
     
-    # Save the rendered HTML to a temporary file
-    temp_html = template_dir / "temp_resume.html"
-    with open(temp_html, 'w', encoding='utf-8') as f:
-        f.write(rendered_html)
-    
-    # Write debug HTML to a file for inspection
-    debug_html = template_dir / "debug_resume.html"
-    with open(debug_html, 'w', encoding='utf-8') as f:
-        f.write(rendered_html)
-    
-    # Convert HTML to PDF
-    pdf_bytes = io.BytesIO()
-    
-    # First check if wkhtmltopdf is installed
-    wkhtmltopdf_available = is_wkhtmltopdf_installed()
-    
-    if wkhtmltopdf_available:
-        # Try using pdfkit (wkhtmltopdf)
-        try:
-            # Options for PDF generation
-            options = {
-                'page-size': 'Letter',
-                'margin-top': '0.5in',
-                'margin-right': '0.5in',
-                'margin-bottom': '0.5in',
-                'margin-left': '0.5in',
-                'encoding': 'UTF-8',
-                'quiet': '',
-                'print-media-type': '',
-                'no-background': '',
-                'enable-local-file-access': ''
-            }
-            
-            # Configure pdfkit with custom path if provided
-            config = None
-            if WKHTMLTOPDF_PATH:
-                config = pdfkit.configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
-            
-            # Try direct conversion to bytes
-            if config:
-                pdf_data = pdfkit.from_file(str(temp_html), False, options=options, configuration=config)
-            else:
-                pdf_data = pdfkit.from_file(str(temp_html), False, options=options)
-            
-            pdf_bytes.write(pdf_data)
-        except Exception as e:
-            print(f"Error using pdfkit: {e}")
-            # Try fallback method for pdfkit
-            try:
-                output_path = template_dir / "temp_resume.pdf"
-                
-                if config:
-                    pdfkit.from_file(str(temp_html), str(output_path), options=options, configuration=config)
-                else:
-                    pdfkit.from_file(str(temp_html), str(output_path), options=options)
-                
-                with open(output_path, 'rb') as f:
-                    pdf_bytes.write(f.read())
-                # Clean up temporary PDF file
-                if os.path.exists(str(output_path)):
-                    os.remove(str(output_path))
-            except Exception as e:
-                print(f"PDF generation failed: {e}")
-                raise Exception("PDF generation failed. Check that wkhtmltopdf is properly installed.") from e
-    else:
+    # Render on the shared pool: HTML in over stdin, PDF bytes out over stdout
+    renderer = get_pdf_renderer()
+    if not renderer.available:
         raise Exception(
             "wkhtmltopdf is not installed or not found in PATH.\n"
             "Please install it from https://wkhtmltopdf.org/downloads.html\n"
             "Or specify the correct path in resume_export.py (WKHTMLTOPDF_PATH)"
         )
-    
-    # Clean up temporary HTML file
-    if os.path.exists(str(temp_html)):
-        os.remove(str(temp_html))
-    
-    pdf_bytes.seek(0)
-    return pdf_bytes.getvalue()
+
+    try:
+        pdf_bytes = renderer.render(rendered_html, PDF_OPTIONS)
+    except PdfRenderError as e:
+        logger.error("PDF generation failed: %s", e)
+        raise Exception("PDF generation failed. Check that wkhtmltopdf is properly installed.") from e
+
+    stats = pdf_stats(pdf_bytes)
+    logger.debug("PDF (wkhtmltopdf): %s bytes, %s pages, %s bytes/page",
+                 stats['bytes'], stats['pages'], stats['bytes_per_page'])
+    return pdf_bytes
+
+def generate_native_pdf(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=None, location=None, linkedin=None, github=None, website=None):
+    """
+    Generate a PDF in-process from the parsed resume, without wkhtmltopdf.
+
+    Takes the same arguments as generate_pdf(). Uses standard PDF fonts, so
+    the output embeds no font data and is already compact.
+
+    Returns:
+        bytes: The PDF file as bytes
+    """
+    # Same header lines as the HTML templates
+    contact_lines = [
+        " | ".join(value for value in (location, phone, email) if value),
+        " | ".join(value for value in (linkedin, github, website) if value),
+    ]
+    return render_pdf(
+        parse_resume_text(resume_text),
+        style=NATIVE_PDF_STYLES.get(style, NATIVE_PDF_STYLES[STYLE_ATS]),
+        name=name or "Resume",
+        contact_lines=[line for line in contact_lines if line]
+    )
+
+# ---------------------------------
+# DOCX Base Templates
+# ---------------------------------
+
+# Fonts, sizes, colors and alignment live in each style's styles.xml, defined
+# once per style. Generated paragraphs only reference a style, so no run-level
+# formatting is written per paragraph.
+DOCX_STYLE_SPECS = {
+    STYLE_ATS: {"font": "Arial", "heading_color": None, "centered": False},
+    STYLE_MODERN: {"font": "Calibri", "heading_color": "2c3e50", "centered": False},
+    STYLE_PROFESSIONAL: {"font": "Times New Roman", "heading_color": None, "centered": True},
+}
+
+# Custom paragraph styles added to the base template
+DOCX_CONTACT_STYLE = "Resume Contact"
+DOCX_COMPANY_STYLE = "Resume Company"
+DOCX_PROJECT_TITLE_STYLE = "Resume Project Title"
+
+_docx_templates = {}
+_docx_templates_lock = threading.Lock()
+
+# Theme font attributes take precedence over an explicit font name in Word
+_THEME_FONT_ATTRS = tuple(qn(f'w:{attr}') for attr in ('asciiTheme', 'hAnsiTheme', 'eastAsiaTheme', 'cstheme'))
+
+
+def _set_style_font(docx_style, font_name):
+    docx_style.font.name = font_name
+    rFonts = docx_style.element.rPr.rFonts
+    for attr in _THEME_FONT_ATTRS:
+        rFonts.attrib.pop(attr, None)
+
+
+def build_docx_template(style):
+    """
+    Build the base document for a style: margins plus the paragraph styles
+    used by generate_docx(), defined once in styles.xml.
+
+    Returns:
+        bytes: An empty DOCX package to open for each generated resume
+    """
+    spec = DOCX_STYLE_SPECS.get(style, DOCX_STYLE_SPECS[STYLE_ATS])
+    doc = Document()
+
+    for section in doc.sections:
+        section.top_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.5)
+
+    styles = doc.styles
+    alignment = WD_PARAGRAPH_ALIGNMENT.CENTER if spec["centered"] else None
+
+    normal = styles['Normal']
+    _set_style_font(normal, spec["font"])
+    normal.font.size = Pt(11)
+
+    for style_name, size in (('Title', 16), ('Heading 1', None), ('Heading 2', 12)):
+        heading = styles[style_name]
+        _set_style_font(heading, spec["font"])
+        if size:
+            heading.font.size = Pt(size)
+        if spec["heading_color"]:
+            heading.font.color.rgb = RGBColor.from_string(spec["heading_color"].upper())
+        heading.paragraph_format.alignment = alignment
+
+    contact = styles.add_style(DOCX_CONTACT_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    contact.base_style = normal
+    contact.font.size = Pt(10)
+    contact.paragraph_format.alignment = alignment
+
+    company = styles.add_style(DOCX_COMPANY_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    company.base_style = normal
+    company.font.italic = True
+    company.paragraph_format.alignment = alignment
+
+    project_title = styles.add_style(DOCX_PROJECT_TITLE_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    project_title.base_style = normal
+    project_title.font.bold = True
+
+    # Bullets inherit the body font from Normal
+    styles['List Bullet'].base_style = normal
+
+    template_bytes = io.BytesIO()
+    doc.save(template_bytes)
+    return template_bytes.getvalue()
+
+
+def get_docx_template(style):
+    """Return the base DOCX package for a style, building it on first use."""
+    with _docx_templates_lock:
+        template = _docx_templates.get(style)
+        if template is None:
+            template = _docx_templates[style] = build_docx_template(style)
+        return template
+
 
 def generate_docx(resume_text, style=STYLE_ATS, name="Resume", email=None, phone=None, location=None, linkedin=None, github=None, website=None):
     """
@@ -749,243 +445,74 @@ def generate_docx(resume_text, style=STYLE_ATS, name="Resume", email=None, phone
     Returns:
         bytes: The DOCX file as bytes
     """
-    # Print debugging info for contact info
-    print(f"DOCX Generation - Contact Info:")
-    print(f"  Name: {name}")
-    print(f"  Email: {email}")
-    print(f"  Phone: {phone}")
-    print(f"  Location: {location}")
-    print(f"  LinkedIn: {linkedin}")
-    print(f"  GitHub: {github}")
-    print(f"  Website: {website}")
-    
-    # Create a new Document
-    doc = Document()
-    
-    # Set up document styles based on the selected style
-    if style == STYLE_ATS:
-        # ATS-Friendly - Simple, no frills
-        font_name = "Arial"
-        heading_color = None  # Default black
-        bullet_type = 'bullet'  # Standard bullet
-    elif style == STYLE_MODERN:
-        # Modern - Sleek and contemporary
-        font_name = "Calibri"
-        heading_color = '2c3e50'  # Dark blue
-        bullet_type = 'square'  # Square bullets
-    else:  # Professional
-        # Professional - Traditional, serif
-        font_name = "Times New Roman"
-        heading_color = None  # Default black
-        bullet_type = 'bullet'  # Standard bullet
+    # Contact values are PII; log only which fields are present
+    logger.debug("DOCX generation (%s): contact fields %s", style,
+                 _ContactFields(name, email, phone, location, linkedin, github, website))
     
-    # Set up document margins
-    for section in doc.sections:
-        section.top_margin = Inches(0.5)
-        section.right_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.5)
+    # Start from the style's base template (margins and styles already defined)
+    doc = Document(io.BytesIO(get_docx_template(style)))
+
+    # Resolve styles once; passing style objects skips a name lookup per paragraph
+    styles = doc.styles
+    title_style = styles['Title']
+    heading1_style = styles['Heading 1']
+    heading2_style = styles['Heading 2']
+    bullet_style = styles['List Bullet']
+    contact_style = styles[DOCX_CONTACT_STYLE]
+    company_style = styles[DOCX_COMPANY_STYLE]
+    project_title_style = styles[DOCX_PROJECT_TITLE_STYLE]
     
     # Ensure name has a value
     if not name:
-        print("⚠️ Warning: No name detected for resume header.")
+        logger.warning("No name detected for resume header.")
         name = "Your Name"
 
-    
     # Add the header with name and contact information
-    # Name
-    heading = doc.add_heading(name, level=0)
-    if style == STYLE_PROFESSIONAL:
-        heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    for run in heading.runs:
-        run.font.name = font_name
-        run.font.size = Pt(16)
+    doc.add_paragraph(name, style=title_style)
     
     # Contact Information
-    contact_info = []
-    if email:
-        contact_info.append(email)
-    if phone:
-        contact_info.append(phone)
-    if location:
-        contact_info.append(location)
-        
-    # Add LinkedIn, GitHub, Website
-    links_info = []
-    if linkedin:
-        links_info.append(linkedin)
-    if github:
-        links_info.append(github)
-    if website:
-        links_info.append(website)
+    contact_info = [value for value in (email, phone, location) if value]
+    # LinkedIn, GitHub, Website
+    links_info = [value for value in (linkedin, github, website) if value]
     
-    # Add contact information line
     if contact_info:
-        p = doc.add_paragraph()
-        if style == STYLE_PROFESSIONAL:
-            p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        p.add_run(" | ".join(contact_info))
-        for run in p.runs:
-            run.font.name = font_name
-            run.font.size = Pt(10)
-    
-    # Add links line
+        doc.add_paragraph(" | ".join(contact_info), style=contact_style)
     if links_info:
-        p = doc.add_paragraph()
-        if style == STYLE_PROFESSIONAL:
-            p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        p.add_run(" | ".join(links_info))
-        for run in p.runs:
-            run.font.name = font_name
-            run.font.size = Pt(10)
+        doc.add_paragraph(" | ".join(links_info), style=contact_style)
     
     # Add a spacer
     doc.add_paragraph()
-    
-    # Split the resume into lines
-    lines = resume_text.strip().split('\n')
-    
-    # Process each line
-    in_bullet_list = False
-    current_section = None
-    previous_line_was_job_title = False
-    company_found = False
-    
-    job_title_keywords = [
-        'Analyst', 'Engineer', 'Manager', 'Director', 'Specialist', 'Associate', 
-        'Consultant', 'Developer', 'Accountant', 'Coordinator', 'Assistant',
-        'Supervisor', 'Representative', 'Administrator', 'Designer', 'Programmer',
-        'Budget'
-    ]
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-        
-        # Detect section headers (all caps, or with dashes/underscores)
-        if line.isupper() or line.startswith('---') or all(c in line for c in ['=', '=']):
-            # Add a section header
-            clean_line = line.replace('-', '').replace('=', '').strip()
-            heading = doc.add_heading(clean_line, level=1)
-            
-            # Customize heading based on style
-            for run in heading.runs:
-                run.font.name = font_name
-                if style == STYLE_PROFESSIONAL:
-                    heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                
-            current_section = clean_line
-            in_bullet_list = False
-            previous_line_was_job_title = False
-            company_found = False
-            continue
-        
-        # Special processing for experience section
-        if current_section and current_section.upper() in ["EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT", "PROFESSIONAL EXPERIENCE"]:
-            
-            # Check for position with special bullets (□, ■, ◆, 📌)
-            special_bullet_match = re.match(r'^([□■◆📌]\s*)(.*?)$', line)
-            if special_bullet_match:
-                # This is a job title line with a special bullet
-                bullet, position_text = special_bullet_match.groups()
-                heading = doc.add_heading(position_text, level=2)
-                
-                # Customize heading based on style
-                for run in heading.runs:
-                    run.font.name = font_name
-                    run.font.size = Pt(12)
-                    if style == STYLE_PROFESSIONAL:
-                        heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                
-                previous_line_was_job_title = True
-                company_found = False
-                in_bullet_list = False
-                continue
-            
-            # Check for date pattern directly indicating a job title line
-            date_pattern_match = re.search(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}\s*[-–—]\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\'\d{2}\s*[-–—]\s*Present', line, re.IGNORECASE)
-            
-            # Check for a job title format (Position at Company)
-            at_company_pattern = re.search(r'(.*?)\s+at\s+(.*?)$', line, re.IGNORECASE)
-            
-            # If a line contains a job title keyword followed by date pattern, it's likely a job title
-            job_title_with_date = False
-            if any(keyword in line for keyword in job_title_keywords) and re.search(r'\b(19|20)\d{2}\s*[-–—]\s*(19|20)\d{2}|\b(19|20)\d{2}\s*[-–—]', line):
-                job_title_with_date = True
-            
-            if date_pattern_match or at_company_pattern or job_title_with_date:
-                # Add a job title heading
-                heading = doc.add_heading(line, level=2)
-                
-                # Customize heading based on style
-                for run in heading.runs:
-                    run.font.name = font_name
-                    run.font.size = Pt(12)
-                    if style == STYLE_PROFESSIONAL:
-                        heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                
-                previous_line_was_job_title = True
-                company_found = False
-                in_bullet_list = False
+
+    def add_block(block):
+        if isinstance(block, BulletList):
+            for item in block.items:
+                doc.add_paragraph(item, style=bullet_style)
+        elif block.kind == "project-title":
+            doc.add_paragraph(block.text, style=project_title_style)
+        else:
+            doc.add_paragraph(block.text)
+
+    # Walk the parsed document tree (shared with the HTML/TXT/Markdown renderers)
+    document = parse_resume_text(resume_text)
+
+    for block in document.preamble:
+        add_block(block)
+
+    for section in document.sections:
+        doc.add_paragraph(section.title, style=heading1_style)
+
+        for block in section.blocks:
+            if not isinstance(block, ExperienceEntry):
+                add_block(block)
                 continue
-            
-            # Handle company name after job title
-            if previous_line_was_job_title and not company_found:
-                if (not line.startswith(('•', '-', '*')) and 
-                    not re.match(r'^\d+\.', line) and 
-                    len(line) < 100):
-                    
-                    # Handle company with "at" format (e.g., "at Company Name")
-                    if line.lower().startswith('at '):
-                        company_name = line[3:].strip()  # Remove 'at ' prefix
-                    else:
-                        company_name = line
-                    
-                    # Add the company name as italicized paragraph
-                    p = doc.add_paragraph()
-                    p.add_run(company_name).italic = True
-                    
-                    for run in p.runs:
-                        run.font.name = font_name
-                        run.font.size = Pt(11)
-                        if style == STYLE_PROFESSIONAL:
-                            p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                    
-                    previous_line_was_job_title = False
-                    company_found = True
-                    continue
-        
-        # Handle bullet points
-        if line.startswith('•') or line.startswith('-') or line.startswith('*') or (line.strip().startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.'))):
-            # If the previous line was a job title and no company was found, this isn't a real bullet point yet
-            if previous_line_was_job_title and not company_found:
-                # We'll assume no company name was provided, so continue to bullet points
-                company_found = True
-                previous_line_was_job_title = False
-            
-            # Add a bullet point
-            bullet_text = line.lstrip('•-*123456789. \t')
-            p = doc.add_paragraph(bullet_text)
-            p.style = 'List Bullet'
-            
-            # Format the bullet point
-            for run in p.runs:
-                run.font.name = font_name
-                run.font.size = Pt(11)
-            
-            in_bullet_list = True
-            continue
-        
-        # Regular paragraph text
-        p = doc.add_paragraph(line)
-        
-        # Format paragraph
-        for run in p.runs:
-            run.font.name = font_name
-            run.font.size = Pt(11)
+
+            # Job title heading, then the company as an italic line
+            doc.add_paragraph(block.title, style=heading2_style)
+            if block.company:
+                doc.add_paragraph(block.company, style=company_style)
+
+            for inner in block.blocks:
+                add_block(inner)
     
     # Save the document to a byte stream
     docx_bytes = io.BytesIO()
@@ -994,7 +521,96 @@ def generate_docx(resume_text, style=STYLE_ATS, name="Resume", email=None, phone
     
     return docx_bytes.getvalue()
 
+def generate_txt(resume_text):
+    """
+    Generate a normalized plain-text version of the resume.
+
+    Returns:
+        bytes: UTF-8 encoded text
+    """
+    return render_text(parse_resume_text(resume_text)).encode('utf-8')
+
+def generate_markdown(resume_text, name=None):
+    """
+    Generate a Markdown version of the resume.
+
+    Returns:
+        bytes: UTF-8 encoded Markdown
+    """
+    return render_markdown(parse_resume_text(resume_text), name=name).encode('utf-8')
+
 # List of available styles
 def get_available_styles():
     """Return a list of available resume styles."""
-    return [STYLE_ATS, STYLE_MODERN, STYLE_PROFESSIONAL] 
\ No newline at end of file
+    return list(template_files)
+
+# ---------------------------------
+# Cached Export Dispatch
+# ---------------------------------
+
+# Bump when templates or rendering change so cached files and ETags are invalidated
+EXPORT_RENDER_VERSION = "2"
+
+EXPORT_MEDIA_TYPES = {
+    "PDF": "application/pdf",
+    "DOCX": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "TXT": "text/plain; charset=utf-8",
+}
+EXPORT_FORMATS = tuple(EXPORT_MEDIA_TYPES)
+
+# Contact fields forwarded to the PDF/DOCX header
+CONTACT_FIELDS = ("name", "email", "phone", "location", "linkedin", "github", "website")
+
+_export_cache = ExportCache()
+
+
+def contact_kwargs(contact_info):
+    """Map a contact_info dict (as returned by the pipeline) to generate_pdf/generate_docx kwargs."""
+    contact_info = contact_info or {}
+    kwargs = {field: contact_info.get(field) or None for field in CONTACT_FIELDS}
+    kwargs["name"] = kwargs["name"] or contact_info.get("full_name") or "Resume"
+    return kwargs
+
+
+def export_etag(resume_text, style, fmt, contact_info=None):
+    """ETag for an export, computed from the inputs without rendering."""
+    # TXT output ignores style and contact info
+    if fmt == "TXT":
+        style, contact_info = None, None
+    if fmt == "PDF":
+        version = f"{EXPORT_RENDER_VERSION}:{resolve_pdf_backend()}"
+    else:
+        version = EXPORT_RENDER_VERSION
+    return format_etag(export_key(resume_text, style, fmt, contact_info, version))
+
+
+def export_resume(resume_text, style=STYLE_ATS, fmt="PDF", contact_info=None, use_cache=True):
+    """
+    Render the resume in one format, reusing a cached result for identical inputs.
+
+    Args:
+        resume_text (str): Plain text resume content
+        style (str): Template style to use
+        fmt (str): One of EXPORT_FORMATS
+        contact_info (dict, optional): Name and contact fields for the header
+        use_cache (bool): Set False to always render (e.g. when profiling the render)
+
+    Returns:
+        tuple: (etag, file bytes)
+    """
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unknown export format: {fmt}. Available: {list(EXPORT_FORMATS)}")
+
+    etag = export_etag(resume_text, style, fmt, contact_info)
+    data = _export_cache.get(etag) if use_cache else None
+    if data is not None:
+        return etag, data
+
+    if fmt == "TXT":
+        data = generate_txt(resume_text)
+    else:
+        generate = generate_pdf if fmt == "PDF" else generate_docx
+        data = generate(resume_text, style=style, **contact_kwargs(contact_info))
+
+    _export_cache.put(etag, data)
+    return etag, data
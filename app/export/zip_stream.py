@@ -0,0 +1,55 @@
+"""
+ZIP Stream - Builds a ZIP archive on the fly and yields it in chunks.
+
+zipfile is pointed at a write-only sink. It cannot seek that sink, so it
+writes data descriptors after each entry. Everything written is handed to
+the caller and then dropped, so the archive is never held in memory as a
+whole: at most one entry's compressed bytes are buffered at a time.
+"""
+import zipfile
+
+
+class _ChunkSink:
+    """Write-only file object that buffers bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """
+    Stream a ZIP archive built from (arcname, data) pairs.
+
+    Entries are consumed lazily, so each one can be produced (e.g. rendered)
+    just before it is written.
+
+    Args:
+        entries (iterable): (arcname, bytes or str) pairs
+        compression (int): zipfile compression method
+
+    Yields:
+        bytes: The next part of the archive; the chunks concatenated form a valid ZIP
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=compression) as archive:
+        for arcname, data in entries:
+            archive.writestr(arcname, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Closing the archive writes the central directory
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -1,5 +1,4 @@
 import streamlit as st
-from export.resume_export import generate_pdf, generate_docx, get_available_styles
 import requests
 import json
 from pathlib import Path
@@ -15,6 +14,9 @@ if ENV == "dev":
 else:
     BACKEND_URL = "http://localhost:8000"
 
+# Styles the backend's /export renders (app/export/resume_export.py template_files)
+RESUME_STYLES = ["ATS-Friendly", "Modern", "Professional"]
+
 
 def extract_contact_info(resume_text):
     """Extract basic contact information from resume text."""
@@ -98,6 +100,47 @@ st.set_page_config(
     layout="wide"
 )
 
+def fetch_export(export_config):
+    """
+    Get a rendered resume file from the backend's /export endpoint.
+
+    The last file for each (style, format) is kept in session state with its
+    ETag. The same configuration is served from there without a request; a
+    changed one is re-requested with If-None-Match, and a 304 (the rendered
+    content would be identical) reuses the kept bytes.
+    """
+    resume_text, style, fmt, contact_items = export_config
+    kept = st.session_state.exports.get((style, fmt))
+    if kept and kept['config'] == export_config:
+        return kept
+
+    headers = {'If-None-Match': kept['etag']} if kept and kept['etag'] else {}
+    response = requests.post(
+        f"{BACKEND_URL}/export",
+        json={"resume_text": resume_text, "style": style, "format": fmt, "contact_info": dict(contact_items)},
+        headers=headers,
+        timeout=120
+    )
+    if response.status_code == 304 and kept:
+        kept['config'] = export_config
+        return kept
+    if response.status_code != 200:
+        try:
+            detail = response.json().get('detail', response.text)
+        except ValueError:
+            detail = response.text
+        raise RuntimeError(detail)
+
+    kept = {
+        'config': export_config,
+        'etag': response.headers.get('ETag'),
+        'data': response.content,
+        'mime': response.headers.get('Content-Type', 'application/octet-stream')
+    }
+    st.session_state.exports[(style, fmt)] = kept
+    return kept
+
+
 # Title and description
 st.title("📄 Resume Optimizer")
 st.markdown("""
@@ -123,6 +166,8 @@ if 'contact_info' not in st.session_state:
         'github': '',
         'website': ''
     }
+if 'exports' not in st.session_state:
+    st.session_state.exports = {}  # (style, format) -> last file from /export, with its ETag
 
 # Create two columns for input
 col1, col2 = st.columns(2)
@@ -230,6 +275,12 @@ if st.button("Optimize Resume", type="primary"):
 
 
                     
+                    if result.get('partial'):
+                        st.warning(
+                            "Some sections were not enhanced in time and keep their original text: "
+                            + ", ".join(result.get('degraded_stages', []))
+                        )
+
                     # Display enhanced resume
                     st.subheader("Enhanced Resume")
                     st.text_area("Enhanced resume content", st.session_state.enhanced_resume, height=400)
@@ -300,7 +351,7 @@ if st.session_state.enhanced_resume:
     format_col1, format_col2 = st.columns(2)
     with format_col1:
         st.markdown("**Resume Style**")
-        resume_style = st.selectbox("Choose formatting style:", options=get_available_styles(), index=0, key="resume_style")
+        resume_style = st.selectbox("Choose formatting style:", options=RESUME_STYLES, index=0, key="resume_style")
         if resume_style == "ATS-Friendly":
             st.info("Simple, clean format optimized for Applicant Tracking Systems.")
         elif resume_style == "Modern":
@@ -312,61 +363,36 @@ if st.session_state.enhanced_resume:
         st.markdown("**File Format**")
         export_format = st.radio("Choose export format:", ["PDF", "DOCX", "TXT"], index=0, horizontal=True, key="export_format")
         if export_format == "PDF":
-            with st.expander("PDF Generation Troubleshooting"):
-                st.markdown("""
-                **Note:** PDF generation requires wkhtmltopdf to be installed on your system.
-
-                If you're having issues:
-                1. Make sure [wkhtmltopdf](https://wkhtmltopdf.org/downloads.html) is installed
-                2. If installed but not found, specify the path below
-                """)
-                wkhtmltopdf_path = st.text_input("Path to wkhtmltopdf (optional):", placeholder="e.g. C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe", key="wkhtmltopdf_path")
-                if wkhtmltopdf_path:
-                    import resume_export
-                    resume_export.WKHTMLTOPDF_PATH = wkhtmltopdf_path
+            st.caption("PDFs are rendered by the backend; if generation fails, wkhtmltopdf may be missing there.")
 
     # Download section
     export_col1, export_col2, export_col3 = st.columns([1, 2, 1])
     with export_col2:
-        if export_format == "PDF":
-            try:
-                from resume_export import ENABLE_PDF_GENERATION
-                if ENABLE_PDF_GENERATION:
-                    pdf_bytes = generate_pdf(
-                        st.session_state.enhanced_resume,
-                        style=resume_style,
-                        name=st.session_state.contact_info.get('name', ''),
-                        email=st.session_state.contact_info.get('email'),
-                        phone=st.session_state.contact_info.get('phone'),
-                        location=st.session_state.contact_info.get('location'),
-                        linkedin=st.session_state.contact_info.get('linkedin'),
-                        github=st.session_state.contact_info.get('github'),
-                        website=st.session_state.contact_info.get('website')
-                    )
-                    st.download_button(f"Download {resume_style} Resume as PDF", pdf_bytes, f"enhanced_resume_{resume_style.lower().replace('-', '_')}.pdf", mime="application/pdf", use_container_width=True)
-                else:
-                    raise ImportError
-            except Exception as e:
-                st.error(f"PDF generation failed: {e}")
-                st.download_button("Download as Text (Fallback)", st.session_state.enhanced_resume, "enhanced_resume.txt", mime="text/plain", use_container_width=True)
+        if export_format in ("PDF", "DOCX"):
+            # Render only when asked, and only once per distinct configuration.
+            # Editing contact info or switching style just hides the download
+            # until the user asks again. The backend renders and caches the file
+            # (/export); fetch_export() keeps it here with its ETag.
+            export_config = (
+                st.session_state.enhanced_resume,
+                resume_style,
+                export_format,
+                tuple(sorted(st.session_state.contact_info.items()))
+            )
+            prepared = st.session_state.get('prepared_export') == export_config
+            if not prepared and st.button(f"Generate {resume_style} {export_format}", use_container_width=True):
+                st.session_state.prepared_export = export_config
+                prepared = True
 
-        elif export_format == "DOCX":
-            try:
-                docx_bytes = generate_docx(
-                    st.session_state.enhanced_resume,
-                    style=resume_style,
-                    name=st.session_state.contact_info.get('name', ''),
-                    email=st.session_state.contact_info.get('email'),
-                    phone=st.session_state.contact_info.get('phone'),
-                    location=st.session_state.contact_info.get('location'),
-                    linkedin=st.session_state.contact_info.get('linkedin'),
-                    github=st.session_state.contact_info.get('github'),
-                    website=st.session_state.contact_info.get('website')
-                )
-                st.download_button(f"Download {resume_style} Resume as DOCX", docx_bytes, f"enhanced_resume_{resume_style.lower().replace('-', '_')}.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True)
-            except Exception as e:
-                st.error(f"Error generating DOCX: {e}")
-                st.download_button("Download as Text (Fallback)", st.session_state.enhanced_resume, "enhanced_resume.txt", mime="text/plain", use_container_width=True)
+            if prepared:
+                try:
+                    with st.spinner(f"Generating {export_format}..."):
+                        export = fetch_export(export_config)
+                    extension = export_format.lower()
+                    st.download_button(f"Download {resume_style} Resume as {export_format}", export['data'], f"enhanced_resume_{resume_style.lower().replace('-', '_')}.{extension}", mime=export['mime'], use_container_width=True)
+                except Exception as e:
+                    st.error(f"{export_format} generation failed: {e}")
+                    st.download_button("Download as Text (Fallback)", st.session_state.enhanced_resume, "enhanced_resume.txt", mime="text/plain", use_container_width=True)
 
         else:  # TXT fallback
             st.download_button("Download as Plain Text", st.session_state.enhanced_resume, "enhanced_resume.txt", mime="text/plain", use_container_width=True)
@@ -0,0 +1,238 @@
+"""
+Benchmark resume conversion on image-heavy documents.
+
+Compares the legacy conversion path (mammoth base64-encodes every image, then a
+regex strips them; PDFs go through pdf2docx → mammoth) against the current
+convert_resume_to_html(), which discards images at the source.
+
+Each measurement runs in a fresh subprocess so peak RSS is not polluted by
+earlier cases. Reports wall time, Python peak allocation (tracemalloc) and
+process peak RSS.
+
+Usage:
+    python benchmarks/bench_conversion.py [--images 6] [--image-px 900] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+RESUME_LINES = [
+    "PROFESSIONAL SUMMARY",
+    "Data analyst with 6 years of experience in SQL, Python and Tableau.",
+    "EXPERIENCE",
+    "Senior Data Analyst, Acme Corp, Jan 2020 - Present",
+    "• Built automated reporting pipelines in Python and Airflow",
+    "• Reduced dashboard refresh time by 40% with incremental SQL models",
+    "EDUCATION",
+    "B.S. Statistics, State University",
+]
+
+
+# === Synthetic sample builders ===
+
+def _noise_rgb(width: int, height: int, seed: int) -> bytes:
+    # Random pixels compress poorly, like real photos
+    return random.Random(seed).randbytes(width * height * 3)
+
+
+def _png(width: int, height: int, seed: int) -> bytes:
+    rgb = _noise_rgb(width, height, seed)
+    stride = width * 3
+    raw = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def build_image_heavy_docx(path: Path, images: int, image_px: int) -> None:
+    import io
+    from docx import Document
+    from docx.shared import Inches
+
+    doc = Document()
+    for i in range(images):
+        doc.add_picture(io.BytesIO(_png(image_px, image_px, seed=i)), width=Inches(1.5))
+        for line in RESUME_LINES:
+            doc.add_paragraph(line)
+    doc.save(str(path))
+
+
+def build_image_heavy_pdf(path: Path, images: int, image_px: int) -> None:
+    """Minimal hand-written PDF: one page per image, each with the resume text."""
+    objects = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    pages_id = len(objects) + 1 + images * 3  # reserved after page objects
+
+    for i in range(images):
+        pixels = zlib.compress(_noise_rgb(image_px, image_px, seed=i), 1)
+        image_id = add(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % (image_px, image_px, len(pixels))
+            + pixels + b"\nendstream"
+        )
+        text_ops = b"".join(
+            b"BT /F1 11 Tf 72 %d Td (%s) Tj ET\n" % (700 - 16 * n, line.replace("•", "-").encode("cp1252"))
+            for n, line in enumerate(RESUME_LINES)
+        )
+        content = b"q 108 0 0 108 432 650 cm /Im1 Do Q\n" + text_ops
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> /XObject << /Im1 %d 0 R >> >> >>"
+            % (pages_id, content_id, font_id, image_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + obj + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at)
+    path.write_bytes(bytes(out))
+
+
+# === Conversion paths under test ===
+
+def legacy_convert(file_path: str) -> str:
+    """The pre-change conversion path, kept here only for comparison."""
+    import mammoth
+
+    if file_path.endswith(".pdf"):
+        from pdf2docx import Converter
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docx_path = os.path.join(temp_dir, "converted.docx")
+            converter = Converter(file_path)
+            converter.convert(docx_path, start=0, end=None)
+            converter.close()
+            with open(docx_path, "rb") as docx_file:
+                html_content = mammoth.convert_to_html(docx_file).value
+    else:
+        with open(file_path, "rb") as docx_file:
+            html_content = mammoth.convert_to_html(docx_file).value
+
+    return re.sub(r'<img\s+src="data:image/[^>]+>', '', html_content)
+
+
+def current_convert(file_path: str) -> str:
+    from api_utils.html_converter import convert_resume_to_html
+    return convert_resume_to_html(file_path, compact=False)
+
+
+MODES = {"legacy": legacy_convert, "current": current_convert}
+
+
+def run_case(mode: str, file_path: str, repeat: int) -> dict:
+    """Runs inside the child process."""
+    import resource
+
+    convert = MODES[mode]
+    convert(file_path)  # warm imports so they don't count towards timing
+
+    timings = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = convert(file_path)
+        timings.append(time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+    return {
+        "mode": mode,
+        "file": os.path.basename(file_path),
+        "best_s": round(min(timings), 4),
+        "py_peak_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": round(rss_mb, 1),
+        "html_chars": len(html),
+    }
+
+
+def measure(mode: str, file_path: Path, repeat: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--run-case", mode, str(file_path), "--repeat", str(repeat)],
+        capture_output=True, text=True, cwd=str(ROOT),
+    )
+    if proc.returncode != 0:
+        return {"mode": mode, "file": file_path.name, "error": proc.stderr.strip().splitlines()[-1:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=6, help="images per synthetic document")
+    parser.add_argument("--image-px", type=int, default=900, help="width/height of each synthetic image")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--run-case", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case[0], args.run_case[1], args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        samples = [ROOT / "docs" / "sample_resume.docx", ROOT / "docs" / "sample_resume.pdf"]
+
+        docx_path = Path(temp_dir) / "image_heavy.docx"
+        pdf_path = Path(temp_dir) / "image_heavy.pdf"
+        build_image_heavy_pdf(pdf_path, args.images, args.image_px)
+        samples.append(pdf_path)
+        try:
+            build_image_heavy_docx(docx_path, args.images, args.image_px)
+            samples.append(docx_path)
+        except ImportError:
+            print("python-docx not installed; skipping synthetic DOCX sample")
+
+        print(f"{'file':<24}{'mode':<9}{'size_mb':>9}{'best_s':>9}{'py_peak_mb':>12}{'max_rss_mb':>12}{'html_chars':>12}")
+        for sample in samples:
+            size_mb = sample.stat().st_size / (1024 * 1024)
+            for mode in MODES:
+                r = measure(mode, sample, args.repeat)
+                if "error" in r:
+                    print(f"{sample.name:<24}{mode:<9}{size_mb:>9.2f}  error: {r['error']}")
+                    continue
+                print(
+                    f"{r['file']:<24}{mode:<9}{size_mb:>9.2f}{r['best_s']:>9.3f}"
+                    f"{r['py_peak_mb']:>12.2f}{r['max_rss_mb']:>12.1f}{r['html_chars']:>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark DOCX generation on a ~3-page resume.
+
+Compares the legacy generator (blank Document(), font name/size set on every
+run, alignment applied per paragraph) against the current generate_docx(),
+which opens a per-style base template whose styles are defined once in
+styles.xml and only references those styles per paragraph.
+
+Reports best wall time per document, output size, and the size of
+word/document.xml, which is where run-level formatting used to accumulate.
+
+Usage:
+    python benchmarks/bench_docx.py [--jobs 8] [--bullets 6] [--repeat 10]
+"""
+import argparse
+import io
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api_utils.resume_formatter import assemble_resume, format_experience_section
+from app.export import resume_export
+from app.export.resume_document import BulletList, ExperienceEntry, parse_resume_text
+
+CONTACT = {
+    "name": "Jane Doe", "email": "jane@example.com", "phone": "(555) 010-0000",
+    "location": "Austin, TX", "linkedin": "linkedin.com/in/janedoe", "github": "github.com/janedoe",
+}
+
+
+def build_resume(jobs: int, bullets: int) -> str:
+    """Synthetic resume; the defaults fill roughly three Letter pages."""
+    experience = format_experience_section([
+        {
+            "title": f"Senior Data Analyst {i}",
+            "company": f"Company {i}, Austin TX",
+            "date_range": f"Jan '{10 + i:02d} - Dec '{11 + i:02d}",
+            "bullets": [
+                f"Built automated reporting pipeline #{b} in Python and Airflow, cutting manual effort by {10 + b}%"
+                for b in range(bullets)
+            ],
+        }
+        for i in range(jobs)
+    ])
+    return assemble_resume(
+        summary="Data analyst with 10 years of experience in SQL, Python and Tableau. " * 3,
+        skills="Python, SQL, Tableau, Airflow, dbt, Snowflake, Spark, Pandas, Looker, Excel",
+        experience=experience,
+        education="B.S. Statistics, State University\nM.S. Data Science, Tech University",
+        projects='<p class="project-title">RESUME TOOL</p>\n• Built a resume optimizer in Python',
+    )
+
+
+def legacy_generate_docx(resume_text, style, name, email=None, phone=None, location=None,
+                         linkedin=None, github=None, website=None):
+    """The pre-change generator (run-level formatting), kept here only for comparison."""
+    from docx import Document
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.shared import Inches, Pt
+
+    doc = Document()
+    font_name = {"Modern": "Calibri", "Professional": "Times New Roman"}.get(style, "Arial")
+    centered = style == "Professional"
+
+    for section in doc.sections:
+        section.top_margin = section.right_margin = Inches(0.5)
+        section.bottom_margin = section.left_margin = Inches(0.5)
+
+    def fmt(paragraph, size=None):
+        if centered:
+            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        for run in paragraph.runs:
+            run.font.name = font_name
+            if size:
+                run.font.size = Pt(size)
+
+    fmt(doc.add_heading(name, level=0), 16)
+    for line in (" | ".join(v for v in (email, phone, location) if v),
+                 " | ".join(v for v in (linkedin, github, website) if v)):
+        if line:
+            p = doc.add_paragraph()
+            p.add_run(line)
+            fmt(p, 10)
+    doc.add_paragraph()
+
+    def add_block(block):
+        if isinstance(block, BulletList):
+            for item in block.items:
+                p = doc.add_paragraph(item)
+                p.style = 'List Bullet'
+                for run in p.runs:
+                    run.font.name = font_name
+                    run.font.size = Pt(11)
+        elif block.kind == "project-title":
+            p = doc.add_paragraph()
+            p.add_run(block.text).bold = True
+            for run in p.runs:
+                run.font.name = font_name
+                run.font.size = Pt(11)
+        else:
+            p = doc.add_paragraph(block.text)
+            for run in p.runs:
+                run.font.name = font_name
+                run.font.size = Pt(11)
+
+    document = parse_resume_text(resume_text)
+    for block in document.preamble:
+        add_block(block)
+    for section in document.sections:
+        fmt(doc.add_heading(section.title, level=1))
+        for block in section.blocks:
+            if not isinstance(block, ExperienceEntry):
+                add_block(block)
+                continue
+            fmt(doc.add_heading(block.title, level=2), 12)
+            if block.company:
+                p = doc.add_paragraph()
+                p.add_run(block.company).italic = True
+                fmt(p, 11)
+            for inner in block.blocks:
+                add_block(inner)
+
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def current_generate_docx(resume_text, style, **contact):
+    return resume_export.generate_docx(resume_text, style=style, **contact)
+
+
+MODES = {"legacy": legacy_generate_docx, "current": current_generate_docx}
+
+
+def measure(generate, resume_text: str, style: str, repeat: int) -> dict:
+    data = generate(resume_text, style, **CONTACT)  # warm caches (templates, parse)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = generate(resume_text, style, **CONTACT)
+        timings.append(time.perf_counter() - start)
+
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        document_xml = package.getinfo("word/document.xml").file_size
+
+    return {"best_ms": min(timings) * 1000, "size_kb": len(data) / 1024, "document_xml_kb": document_xml / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--bullets", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    resume_text = build_resume(args.jobs, args.bullets)
+    print(f"Resume: {len(resume_text.splitlines())} lines, {len(resume_text)} chars\n")
+    print(f"{'style':<16}{'mode':<9}{'best_ms':>10}{'size_kb':>10}{'document_xml_kb':>17}")
+    for style in resume_export.get_available_styles():
+        for mode, generate in MODES.items():
+            r = measure(generate, resume_text, style, args.repeat)
+            print(f"{style:<16}{mode:<9}{r['best_ms']:>10.1f}{r['size_kb']:>10.1f}{r['document_xml_kb']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
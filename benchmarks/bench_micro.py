@@ -0,0 +1,268 @@
+"""
+Micro-benchmarks for the CPU-bound code that runs on every request.
+
+Each case is timed on synthetic inputs at several scales (1x, 10x and 100x
+by default). The 1x input is about one resume and one job posting. Timing
+uses timeit-style auto-ranging: each sample runs enough loops to last at
+least --min-time seconds, and the best of --repeat samples is kept. The
+result is reported as time per call.
+
+Results can be saved as a JSON baseline and compared against on later runs.
+A case counts as a regression when it is slower than its baseline by more
+than --threshold (default 20%). The script exits with status 1 if any case
+regressed, so it can gate CI. Baselines are machine-specific; record one per
+machine and keep it out of the repo.
+
+No network is used. compute_keyword_match reads the keyword filter from the
+in-memory cache, which is its warm-request path.
+
+Usage:
+    python benchmarks/bench_micro.py --save                 # record a baseline
+    python benchmarks/bench_micro.py                        # compare against it
+    python benchmarks/bench_micro.py --only keyword --scales 1 10 --threshold 0.1
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from hashlib import md5
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "micro_baseline.json"
+
+SKILLS = [
+    "python", "sql", "tableau", "airflow", "snowflake", "excel", "looker", "spark", "pandas", "dbt",
+    "statistics", "forecasting", "dashboards", "stakeholder management", "communication", "leadership",
+    "aws", "azure", "kubernetes", "docker", "machine learning", "regression", "a/b testing", "etl",
+    "pmp", "cpa", "gaap", "hipaa", "salesforce", "jira", "agile", "scrum", "power bi", "r",
+]
+FILLER = (
+    "We are looking for a motivated analyst to join our growing team and partner with stakeholders "
+    "across finance, operations and product to deliver insights that drive decisions."
+)
+CATEGORIES = ("tool_platform", "certification_license", "domain_knowledge", "soft_skill", "other")
+
+
+# === Synthetic inputs ===
+
+def skill_terms(scale: int) -> list:
+    """len(SKILLS) * scale distinct terms; variants beyond the first copy get a numeric suffix."""
+    return [skill if copy == 0 else f"{skill}{copy}" for copy in range(scale) for skill in SKILLS]
+
+
+def build_job_posting(scale: int) -> str:
+    terms = skill_terms(scale)
+    lines = [FILLER]
+    for i in range(0, len(terms), 6):
+        lines.append(f"Experience with {', '.join(terms[i:i + 6])} is required for this role.")
+        lines.append(FILLER)
+    return "\n".join(lines)
+
+
+def build_jobs(scale: int) -> list:
+    terms = skill_terms(scale)
+    return [
+        {
+            "title": f"Senior Data Analyst {i}",
+            "company": f"Company {i}, Austin TX",
+            "date_range": f"Jan '{i % 90 + 10:02d} - Dec '{i % 90 + 11:02d}",
+            "bullets": [
+                f"Built reporting pipeline #{b} with {terms[(i * 6 + b) % len(terms)]}, cutting manual effort by {10 + b}%"
+                for b in range(6)
+            ],
+        }
+        for i in range(4 * scale)
+    ]
+
+
+def build_resume(scale: int) -> str:
+    from api_utils.resume_formatter import assemble_resume, format_experience_section
+
+    return assemble_resume(
+        summary="Data analyst with 10 years of experience in SQL, Python and Tableau.",
+        skills=", ".join(skill_terms(scale)[: len(SKILLS) * scale // 2]),
+        experience=format_experience_section(build_jobs(scale)),
+        education="B.S. Statistics, State University",
+        projects='<p class="project-title">RESUME TOOL</p>\n• Built a resume optimizer in Python',
+    )
+
+
+def build_classified(scale: int) -> dict:
+    classified = {category: [] for category in CATEGORIES}
+    for i, term in enumerate(skill_terms(scale)):
+        classified[CATEGORIES[i % len(CATEGORIES)]].append(term)
+    return classified
+
+
+# === Cases: setup(scale) -> zero-argument callable ===
+
+def case_extract_keywords(scale):
+    from api_utils.keyword_matcher import extract_keywords
+    posting = build_job_posting(scale)
+    return lambda: extract_keywords(posting)
+
+
+def case_normalize_keyword(scale):
+    from api_utils.keyword_classifier import normalize_keyword
+    terms = [t.title() + " " for t in skill_terms(scale)] * 4
+    return lambda: [normalize_keyword(t) for t in terms]
+
+
+def case_compute_keyword_match(scale):
+    from api_utils import keyword_matcher
+    from api_utils.keyword_classifier import normalize_keyword
+
+    posting = build_job_posting(scale)
+    resume = build_resume(scale)
+    # Seed the in-memory filter cache exactly as filter_relevant_keywords keys it
+    filtered_input = sorted(set(normalize_keyword(k) for k in keyword_matcher.extract_keywords(posting) if len(k) > 3))
+    keyword_matcher.filter_cache[md5(" ".join(filtered_input).encode()).hexdigest()] = filtered_input
+    return lambda: keyword_matcher.compute_keyword_match(resume, posting)
+
+
+def case_category_scoring(scale):
+    from api_utils.keyword_scorer import compute_category_matches, compute_weighted_score
+    classified = build_classified(scale)
+    matched = skill_terms(scale)[::2]
+    return lambda: compute_weighted_score(compute_category_matches(classified, matched))
+
+
+def case_format_experience_section(scale):
+    from api_utils.resume_formatter import format_experience_section
+    jobs = build_jobs(scale)
+    return lambda: format_experience_section(jobs)
+
+
+def case_format_text_to_html(scale):
+    from app.export.resume_export import format_text_to_html
+    resume = build_resume(scale)
+    return lambda: format_text_to_html(resume)
+
+
+def case_generate_docx(scale):
+    from app.export.resume_export import generate_docx
+    resume = build_resume(scale)
+    return lambda: generate_docx(resume, name="Jane Doe", email="jane@example.com", phone="(555) 010-0000")
+
+
+def _sample_case(filename):
+    def case(scale):
+        from api_utils.html_converter import convert_resume_to_html
+        path = str(ROOT / "docs" / filename)
+        return lambda: convert_resume_to_html(path)
+    return case
+
+
+# name -> (setup, scaled?)
+CASES = {
+    "extract_keywords": (case_extract_keywords, True),
+    "normalize_keyword": (case_normalize_keyword, True),
+    "compute_keyword_match": (case_compute_keyword_match, True),
+    "category_scoring": (case_category_scoring, True),
+    "format_experience_section": (case_format_experience_section, True),
+    "format_text_to_html": (case_format_text_to_html, True),
+    "generate_docx": (case_generate_docx, True),
+    **{
+        f"convert_resume_to_html[{path.name}]": (_sample_case(path.name), False)
+        for path in sorted((ROOT / "docs").glob("sample_resume*"))
+    },
+}
+
+
+# === Timing and baselines ===
+
+def time_per_call(fn, repeat: int, min_time: float) -> float:
+    """Best-of-`repeat` seconds per call, with loops auto-ranged to last at least `min_time`."""
+    fn()  # warm-up: imports, template and parse caches
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / loops
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.2f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing sample")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    baseline = {} if args.save else load_baseline(args.baseline)
+    results, regressions = {}, []
+
+    print(f"{'case':<44}{'scale':>6}{'per_call':>12}{'baseline':>12}{'change':>9}")
+    for name, (setup, scaled) in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        for scale in (args.scales if scaled else [1]):
+            key = f"{name}@{scale}x"
+            try:
+                seconds = time_per_call(setup(scale), args.repeat, args.min_time)
+            except Exception as e:  # missing optional dependency or sample
+                print(f"{name:<44}{scale:>5}x  skipped: {type(e).__name__}: {e}")
+                continue
+
+            results[key] = seconds
+            reference = baseline.get(key)
+            change = ""
+            if reference:
+                ratio = seconds / reference - 1
+                change = f"{ratio:+.1%}"
+                if ratio > args.threshold:
+                    regressions.append(key)
+                    change += " !"
+            print(f"{name:<44}{scale:>5}x{format_seconds(seconds):>12}"
+                  f"{format_seconds(reference) if reference else '-':>12}{change:>9}")
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+            "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "results": results,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one.")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark for ranking a resume against the posting corpus.
+
+Builds a synthetic corpus (--postings, default 100k) in a temp directory.
+Keyword popularity is skewed: a few hundred common keywords appear in many
+postings, and the long tail appears in few. The script then times ranking
+--resumes different resumes against it. It reports the build and open times
+and the p50/max rank latency. It exits with status 1 when p50 is over
+--budget seconds.
+
+No network is used: the postings carry precomputed keyword profiles.
+
+Usage:
+    python benchmarks/bench_ranking.py
+    python benchmarks/bench_ranking.py --postings 20000 --top-k 25 --budget 0.2
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api_utils.posting_corpus import BASE_CATEGORIES, PostingCorpus, build_corpus  # noqa: E402
+
+
+def synthetic_vocab(size_per_category: int) -> dict:
+    return {category: [f"{category.split('_')[0]} skill {i}" for i in range(size_per_category)]
+            for category in BASE_CATEGORIES}
+
+
+def pick(rng, keywords):
+    # ~half the picks come from the 200 most common keywords
+    return rng.choice(keywords[:200] if rng.random() < 0.5 else keywords)
+
+
+def synthetic_postings(n: int, vocab: dict, seed: int):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "posting_id": f"posting-{i}",
+            "title": f"Synthetic role {i}",
+            "classified_keywords": {
+                category: [pick(rng, keywords) for _ in range(rng.randint(0, 12))]
+                for category, keywords in vocab.items()
+            },
+        }
+
+
+def synthetic_resume(vocab: dict, rng) -> str:
+    lines = [f"Experience with {pick(rng, keywords)} and {pick(rng, keywords)}."
+             for keywords in vocab.values() for _ in range(40)]
+    return "<p>" + "</p><p>".join(lines) + "</p>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100_000)
+    parser.add_argument("--vocab", type=int, default=5000, help="keywords per category")
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=0.5, help="allowed p50 rank seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    vocab = synthetic_vocab(args.vocab)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        start = time.perf_counter()
+        build_corpus(synthetic_postings(args.postings, vocab, args.seed), corpus_dir)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        corpus = PostingCorpus(corpus_dir)
+        open_seconds = time.perf_counter() - start
+
+        latencies = []
+        for _ in range(args.resumes):
+            resume = synthetic_resume(vocab, rng)
+            start = time.perf_counter()
+            corpus.rank(resume, args.top_k)
+            latencies.append(time.perf_counter() - start)
+
+    p50 = statistics.median(latencies)
+    print(f"postings:  {args.postings}  terms: {len(corpus.term_keyword)}")
+    print(f"build:     {build_seconds:.2f}s")
+    print(f"open:      {open_seconds * 1000:.0f}ms")
+    print(f"rank p50:  {p50 * 1000:.0f}ms  max: {max(latencies) * 1000:.0f}ms  (top {args.top_k}, budget {args.budget * 1000:.0f}ms)")
+    if p50 > args.budget:
+        print(f"\nFAIL: p50 rank latency is over the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
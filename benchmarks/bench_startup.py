@@ -0,0 +1,89 @@
+"""
+Cold-start benchmark for the API process.
+
+Imports a module (default: api, the FastAPI app) in a fresh interpreter
+--runs times and reports the median wall time. It also lists the slowest
+imports from `python -X importtime`, and any module from
+warmup.DEFERRED_MODULES that was imported eagerly. The script exits with
+status 1 when the median is over --budget seconds or a deferred module was
+imported, so it can gate CI.
+
+The app import runs setup_environment(), so OPENAI_API_KEY must be set (any
+value will do).
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --module api_utils.workflow --budget 0.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api_utils.warmup import DEFERRED_MODULES  # noqa: E402
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def probe(module: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)], cwd=ROOT,
+                            capture_output=True, text=True, env=os.environ)
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """(cumulative_us, name) for the slowest imports, from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True, env=os.environ)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="api")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.5, help="allowed median import seconds")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench-startup")
+    probes = [probe(args.module) for _ in range(args.runs)]
+    median = statistics.median(p["seconds"] for p in probes)
+    eager = [name for name in DEFERRED_MODULES if name in probes[0]["modules"]]
+
+    print(f"import {args.module}: median {median * 1000:.0f}ms over {args.runs} runs (budget {args.budget * 1000:.0f}ms)")
+    print(f"\n{'cumulative':>12}  module")
+    for cumulative, name in slowest_imports(args.module, args.top):
+        print(f"{cumulative / 1000:>10.1f}ms  {name}")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"median import time {median:.2f}s is over the {args.budget:.2f}s budget")
+    if eager:
+        failures.append(f"deferred modules imported at startup: {', '.join(eager)}")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
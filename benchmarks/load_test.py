@@ -0,0 +1,215 @@
+"""
+Load test /extract-text and /optimize-resume at a target concurrency.
+
+By default this starts the mock OpenAI server (mock_openai.py) and an API
+server (uvicorn) pointed at it, both on free local ports. The API runs in a
+scratch working directory, so the keyword caches and upload temp files start
+empty and the repo stays clean. Use --api-url to drive an API that is already
+running instead.
+
+Reports p50/p95/p99 latency, throughput and error rate per endpoint, plus how
+many upstream LLM calls each prompt type made. Use --unique-postings to give
+every request its own job posting; that defeats the filter/classify caches, so
+you can compare cold and warm runs.
+
+Usage:
+    python benchmarks/load_test.py [--endpoint both] [--concurrency 8] [--requests 40]
+                                   [--file docs/sample_resume.docx] [--latency-ms 800] [--error-rate 0.02]
+                                   [--unique-postings] [--json results.json]
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from mock_openai import MockOpenAIServer, add_mock_arguments, config_from_args
+
+JOB_POSTING = (
+    "Senior Data Analyst. We are looking for an analyst with strong SQL, Python and Tableau skills "
+    "to build reporting pipelines in Airflow and Snowflake, define KPI metrics with finance, "
+    "and communicate insights to stakeholders. Experience with dbt, Looker and A/B testing is a plus. "
+    "Bachelor's degree in statistics, economics or a related field required."
+)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def multipart_body(field, filename, data):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def post(url, body, content_type, timeout):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def start_api(mock_url: str, port: int, workdir: str):
+    env = dict(
+        os.environ,
+        OPENAI_API_BASE=mock_url,
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "mock"),
+        PYTHONPATH=str(ROOT),
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            return process
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API server did not start within 60s")
+
+
+def run_load(name, make_request, concurrency, total):
+    """Issue `total` requests with `concurrency` in flight; return the latency/error summary."""
+    latencies, errors = [], {}
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            make_request(i)
+            return time.perf_counter() - start, None
+        except urllib.error.HTTPError as e:
+            return time.perf_counter() - start, f"HTTP {e.code}"
+        except Exception as e:
+            return time.perf_counter() - start, type(e).__name__
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for seconds, error in executor.map(one, range(total)):
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+            else:
+                latencies.append(seconds)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    failed = sum(errors.values())
+    return {
+        "endpoint": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(failed / total, 4) if total else 0.0,
+        "errors": errors,
+        **{f"p{q}_ms": round(percentile(latencies, q) * 1000, 1) if latencies else None for q in (50, 95, 99)},
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+def print_report(results):
+    print(f"\n{'endpoint':<18}{'reqs':>6}{'conc':>6}{'rps':>8}{'err%':>7}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for r in results:
+        fmt = lambda v: f"{v:>10.1f}" if v is not None else f"{'-':>10}"
+        print(f"{r['endpoint']:<18}{r['requests']:>6}{r['concurrency']:>6}{r['throughput_rps']:>8.2f}"
+              f"{r['error_rate'] * 100:>7.1f}{fmt(r['p50_ms'])}{fmt(r['p95_ms'])}{fmt(r['p99_ms'])}")
+        if r["errors"]:
+            print(f"{'':<18}errors: {r['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=("extract-text", "optimize-resume", "both"), default="both")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=40, help="requests per endpoint")
+    parser.add_argument("--file", type=Path, default=ROOT / "docs" / "sample_resume.docx")
+    parser.add_argument("--api-url", help="drive an already running API instead of starting one")
+    parser.add_argument("--unique-postings", action="store_true", help="new job posting per request (cold caches)")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = api_process = None
+    workdir = tempfile.TemporaryDirectory(prefix="rex-load-")
+    try:
+        if args.api_url:
+            api_url = args.api_url.rstrip("/")
+        else:
+            mock = MockOpenAIServer(config=config_from_args(args)).start()
+            port = free_port()
+            api_process = start_api(mock.base_url, port, workdir.name)
+            api_url = f"http://127.0.0.1:{port}"
+            print(f"Mock OpenAI on {mock.base_url}, API on {api_url}")
+
+        file_bytes = args.file.read_bytes()
+
+        def extract(_):
+            body, content_type = multipart_body("file", args.file.name, file_bytes)
+            _, data = post(f"{api_url}/extract-text", body, content_type, args.timeout)
+            return json.loads(data)["html_resume"]
+
+        results = []
+        if args.endpoint in ("extract-text", "both"):
+            results.append(run_load("/extract-text", extract, args.concurrency, args.requests))
+
+        if args.endpoint in ("optimize-resume", "both"):
+            html_resume = extract(0)
+
+            def optimize(i):
+                posting = JOB_POSTING + (f" Requisition {uuid.uuid4().hex[:10]}." if args.unique_postings else "")
+                body = json.dumps({"html_resume": html_resume, "job_posting": posting}).encode()
+                post(f"{api_url}/optimize-resume", body, "application/json", args.timeout)
+
+            results.append(run_load("/optimize-resume", optimize, args.concurrency, args.requests))
+
+        print_report(results)
+        if mock is not None:
+            with mock.config.lock:
+                print(f"\nUpstream LLM calls: {dict(sorted(mock.config.calls.items()))}, "
+                      f"injected errors: {mock.config.errors}")
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    finally:
+        if api_process is not None:
+            api_process.terminate()
+            api_process.wait(timeout=10)
+        if mock is not None:
+            mock.stop()
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
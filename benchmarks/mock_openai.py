@@ -0,0 +1,293 @@
+"""
+Local OpenAI-compatible stand-in for load tests.
+
+Serves POST /v1/chat/completions (plain and stream=True) with canned
+responses for each prompt the pipeline sends. It tells them apart by the
+prompt text. Every response is valid for the stage that asked: the parse
+stream matches RESUME_SCHEMA, the keyword filter gets a Python list, and
+classification gets a category label. Latency and error rate are configurable,
+so concurrency and caching changes can be measured without network access.
+
+Point the API at it with:
+
+    OPENAI_API_BASE=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock uvicorn api:app
+
+Usage:
+    python benchmarks/mock_openai.py [--port 8001] [--latency-ms 800] [--jitter-ms 200]
+                                     [--latency parse=3000 --latency classify=150] [--error-rate 0.02]
+"""
+import argparse
+import ast
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Canned parse result; must satisfy api_utils.gpt_parser.RESUME_SCHEMA
+PARSED_RESUME = {
+    "contact_info": {
+        "name": "Jane Doe", "title": "Data Analyst", "email": "jane@example.com", "phone": "(555) 010-0000",
+        "location": "Austin, TX", "linkedin": "linkedin.com/in/janedoe", "github": "github.com/janedoe",
+        "website": "",
+    },
+    "summary": "Data analyst with 6 years of experience in SQL, Python and Tableau.",
+    "skills": "Python, SQL, Tableau, Airflow, Excel, Snowflake",
+    "experience": [
+        {
+            "title": f"Senior Data Analyst {i}",
+            "company": f"Company {i}, Austin TX",
+            "date_range": f"Jan 20{10 + i} - Dec 20{11 + i}",
+            "bullets": [
+                "Built automated reporting pipelines in Python and Airflow",
+                "Reduced dashboard refresh time by 40% with incremental SQL models",
+                "Partnered with finance to define KPI metrics for quarterly planning",
+            ],
+        }
+        for i in range(4)
+    ],
+    "education": "B.S. Statistics, State University",
+    "projects": '<p class="project-title">RESUME TOOL</p>\n• Built a resume optimizer in Python',
+}
+
+CANNED_TEXT = {
+    "summary": "Data analyst with 6 years of experience turning SQL, Python and Tableau analysis into decisions. "
+               "Builds reliable reporting pipelines and KPI frameworks for finance and operations teams.",
+    "skills": "Analytics & BI: Tableau, Looker, Excel\nData Engineering: Python, SQL, Airflow, Snowflake, dbt",
+    "projects": '<p class="project-title">RESUME TOOL</p>\n• Built a resume optimizer in Python and FastAPI',
+}
+
+# Prompt type -> marker text that only appears in that prompt
+PROMPT_MARKERS = (
+    ("parse_retry", "You previously extracted"),
+    ("parse", "You are a resume parser"),
+    ("filter", "clean a list of job posting keywords"),
+    ("classify", "Classify the term"),
+    ("summary", "*Professional Summary*"),
+    ("skills", "'Skills' section"),
+    ("experience", "bullet points of a single job"),
+    ("projects", "'Projects' section"),
+)
+
+CATEGORIES = ("tool_platform", "certification_license", "domain_knowledge", "soft_skill")
+
+
+def prompt_kind(messages) -> str:
+    text = "\n".join(m.get("content") or "" for m in messages)
+    for kind, marker in PROMPT_MARKERS:
+        if marker in text:
+            return kind
+    return "unknown"
+
+
+def canned_content(kind: str, messages) -> str:
+    """Response text for a prompt of the given kind."""
+    prompt = messages[-1].get("content") or ""
+
+    if kind == "parse":
+        return json.dumps(PARSED_RESUME)
+
+    if kind == "parse_retry":
+        key = re.search(r"`(\w+)`", prompt)
+        key = key.group(1) if key else "summary"
+        value = PARSED_RESUME.get(key, "")
+        job = re.search(r"job #(\d+)", prompt)
+        if job and isinstance(value, list):
+            value = value[min(int(job.group(1)) - 1, len(value) - 1)]
+        return json.dumps({"value": value})
+
+    if kind == "filter":
+        listed = re.search(r"List:\n(\[.*?\])\n", prompt, re.S)
+        keywords = ast.literal_eval(listed.group(1)) if listed else []
+        return repr([k for k in keywords if len(k) > 4][:40])
+
+    if kind == "classify":
+        term = re.search(r"Classify the term '(.*?)'", prompt)
+        # Stable per term, like the real model
+        return CATEGORIES[sum(map(ord, term.group(1) if term else "")) % len(CATEGORIES)]
+
+    if kind == "experience":
+        bullets = re.findall(r"^- (.+)$", prompt.split("---")[1] if "---" in prompt else "", re.M)
+        return "\n".join(f"• {b.strip()}, improving accuracy and turnaround" for b in bullets) or "• Delivered analysis"
+
+    return CANNED_TEXT.get(kind, "OK")
+
+
+class MockConfig:
+    def __init__(self, latency_ms=800.0, jitter_ms=200.0, error_rate=0.0, per_kind=None, chunk_chars=24):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.per_kind = per_kind or {}
+        self.chunk_chars = chunk_chars
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.errors = 0
+
+    def latency(self, kind: str) -> float:
+        base = self.per_kind.get(kind, self.latency_ms)
+        return max(0.0, random.gauss(base, self.jitter_ms)) / 1000 if self.jitter_ms else base / 1000
+
+    def count(self, kind: str, error: bool):
+        with self.lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            self.errors += error
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config: MockConfig = None
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a load test's output
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with self.config.lock:
+                body = {"calls": dict(self.config.calls), "errors": self.config.errors}
+            self._send_json(200, body)
+        else:
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        messages = request.get("messages") or []
+        kind = prompt_kind(messages)
+        failed = random.random() < self.config.error_rate
+        self.config.count(kind, failed)
+
+        delay = self.config.latency(kind)
+        if failed:
+            time.sleep(delay / 4)
+            status = random.choice((429, 503))
+            self._send_json(status, {"error": {"message": f"mock {status}", "type": "server_error"}})
+            return
+
+        content = canned_content(kind, messages)
+        model = request.get("model", "mock")
+        if request.get("stream"):
+            self._stream(model, content, delay)
+            return
+
+        time.sleep(delay)
+        prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        completion_tokens = len(content) // 4
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def _stream(self, model, content, delay):
+        """Server-sent events: first token after ~1/4 of the latency, the rest spread over the remainder."""
+        pieces = [content[i:i + self.config.chunk_chars] for i in range(0, len(content), self.config.chunk_chars)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        time.sleep(delay / 4)
+        event({"role": "assistant"})
+        per_piece = (delay * 3 / 4) / max(len(pieces), 1)
+        for piece in pieces:
+            event({"content": piece})
+            time.sleep(per_piece)
+        event({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockOpenAIServer:
+    """Run the mock in a background thread (for use from load_test.py)."""
+
+    def __init__(self, host="127.0.0.1", port=0, config: MockConfig = None):
+        self.config = config or MockConfig()
+        handler = type("Handler", (_Handler,), {"config": self.config})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def parse_kind_latencies(values):
+    per_kind = {}
+    for value in values or []:
+        kind, _, ms = value.partition("=")
+        per_kind[kind] = float(ms)
+    return per_kind
+
+
+def add_mock_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=800, help="mean upstream latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="standard deviation of the latency")
+    parser.add_argument("--latency", action="append", metavar="KIND=MS",
+                        help="per prompt type latency, e.g. parse=3000 (repeatable)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 429/503")
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, parse_kind_latencies(args.latency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(args.host, args.port, config_from_args(args))
+    print(f"Mock OpenAI API on {server.base_url} (GET {server.base_url}/stats for call counts)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Build the posting corpus that /rank-postings ranks resumes against.
+
+Reads a JSONL file with one job posting per line:
+
+    {"posting_id": "acme-data-analyst", "title": "Data Analyst", "company": "Acme",
+     "classified_keywords": {"tool_platform": ["sql", "tableau"], "soft_skill": ["communication"]}}
+
+Postings without "classified_keywords" need a "text" field. Their profile is
+then computed the way the pipeline does it: keyword extraction, the LLM
+filter, then classification. Both LLM steps go through the on-disk caches,
+so re-running a build only pays for postings it has not seen. Every other
+field is stored as metadata and returned with the ranking.
+
+Usage:
+    python scripts/build_posting_corpus.py postings.jsonl [--out posting_corpus]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api_utils.posting_corpus import POSTING_CORPUS_DIR, build_corpus
+
+
+def read_postings(path):
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            posting = json.loads(line)
+            posting.setdefault("posting_id", f"line-{line_number}")
+            if "classified_keywords" not in posting and "text" not in posting:
+                raise SystemExit(f"line {line_number}: needs classified_keywords or text")
+            yield posting
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("postings", help="JSONL file, one posting per line")
+    parser.add_argument("--out", type=Path, default=POSTING_CORPUS_DIR, help="corpus directory to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    corpus = build_corpus(read_postings(args.postings), args.out)
+    print(f"Built {len(corpus)} postings, {len(corpus.term_keyword)} terms "
+          f"into {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Bulk export: re-render stored enhanced resumes in every requested style and format.
+
+Reads a JSONL file with one resume per line:
+
+    {"id": "jane-doe-acme", "resume_text": "...", "contact_info": {"name": "Jane Doe", ...},
+     "styles": ["Modern"], "formats": ["PDF", "DOCX"]}
+
+"enhanced_resume" is accepted in place of "resume_text". "styles" and
+"formats" are optional and default to the --styles/--formats options.
+Output goes to OUT_DIR/<id>/<style>.<ext>, plus OUT_DIR/<id>/resume.txt.
+Ids are made path-safe; a record without one gets "record-" plus a hash of
+its content, so inserting lines into the input never renames other records.
+
+Resumes are rendered in a process pool. Each finished resume is appended
+to a checkpoint file in OUT_DIR with a hash of its record. Re-running the
+same command skips everything already done, so an interrupted run resumes
+where it stopped. Failures are written to OUT_DIR/failures.jsonl and
+retried on the next run. Lines that aren't valid JSON, records naming
+unknown styles, and records whose id (after sanitizing) is already taken,
+by an earlier line or by a different record exported in a previous run,
+are logged there as failures too, with their line number, and the run
+carries on. A colliding record never writes into the other one's directory.
+
+Usage:
+    python scripts/bulk_export.py resumes.jsonl exports/ [--workers 4] [--styles ATS-Friendly Modern] [--formats PDF DOCX TXT]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Every file is rendered once and written straight to disk; don't keep copies in memory
+os.environ.setdefault("EXPORT_CACHE_MAX_BYTES", "0")
+
+from app.export import resume_export
+from app.export.export_bundle import style_slug
+
+CHECKPOINT_FILE = ".bulk_export_checkpoint"
+FAILURES_FILE = "failures.jsonl"
+
+
+def record_digest(record):
+    """Hash of a record's content, independent of key order and of where it sits in the input."""
+    return hashlib.sha256(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def record_id(record, digest):
+    """Path-safe id for a record, falling back to a hash of its content."""
+    raw = str(record.get("id") or "")
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', raw).strip('._') or f"record-{digest[:12]}"
+
+
+def read_records(path):
+    """
+    Yield (id, record, digest, line_number, line) for each non-blank line of
+    the JSONL input. A line that isn't a JSON object yields record None, so it
+    can be logged as a failure without stopping the run.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if not isinstance(record, dict):
+                yield f"line-{line_number}", None, None, line_number, line.rstrip("\n")
+                continue
+            digest = record_digest(record)
+            yield record_id(record, digest), record, digest, line_number, line
+
+
+def load_checkpoint(out_dir):
+    """{id: record digest} of exported resumes (digest None for entries written without one)."""
+    path = out_dir / CHECKPOINT_FILE
+    if not path.exists():
+        return {}
+    done = {}
+    for entry in path.read_text(encoding="utf-8").splitlines():
+        rid, _, digest = entry.strip().partition("\t")
+        if rid:
+            done[rid] = digest or None
+    return done
+
+
+def _write_atomic(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def export_record(rid, record, out_dir, default_styles, default_formats):
+    """
+    Render one resume in all of its styles and formats (runs in a worker process).
+
+    Returns:
+        tuple: (id, number of files written)
+    """
+    resume_text = record.get("resume_text") or record.get("enhanced_resume")
+    if not resume_text:
+        raise ValueError("record has no resume_text")
+
+    contact_info = record.get("contact_info") or {}
+    styles = record.get("styles") or default_styles
+    unknown_styles = set(styles) - set(resume_export.get_available_styles())
+    if unknown_styles:
+        # export_resume would fall back to ATS and the file would be named after the bogus style
+        raise ValueError(f"unknown styles {sorted(unknown_styles)}")
+    formats = [fmt.upper() for fmt in (record.get("formats") or default_formats)]
+
+    target = Path(out_dir) / rid
+    target.mkdir(parents=True, exist_ok=True)
+    written = 0
+
+    for fmt in formats:
+        if fmt == "TXT":
+            _, data = resume_export.export_resume(resume_text, fmt="TXT")
+            _write_atomic(target / "resume.txt", data)
+            written += 1
+            continue
+        for style in styles:
+            _, data = resume_export.export_resume(resume_text, style=style, fmt=fmt, contact_info=contact_info)
+            _write_atomic(target / f"{style_slug(style)}.{fmt.lower()}", data)
+            written += 1
+
+    return rid, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="JSONL file of resumes")
+    parser.add_argument("out_dir", type=Path, help="output directory (also holds the checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--styles", nargs="+", default=resume_export.get_available_styles())
+    parser.add_argument("--formats", nargs="+", default=list(resume_export.EXPORT_FORMATS))
+    parser.add_argument("--progress-every", type=int, default=50, help="print progress every N resumes")
+    args = parser.parse_args()
+
+    unknown_styles = set(args.styles) - set(resume_export.get_available_styles())
+    unknown_formats = {fmt.upper() for fmt in args.formats} - set(resume_export.EXPORT_FORMATS)
+    if unknown_styles or unknown_formats:
+        parser.error(f"unknown styles {sorted(unknown_styles)} / formats {sorted(unknown_formats)}")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    done_ids = load_checkpoint(args.out_dir)
+    if done_ids:
+        print(f"Resuming: {len(done_ids)} resumes already exported")
+
+    succeeded = failed = skipped = files = 0
+    start = time.perf_counter()
+    records = read_records(args.input)
+    pending = {}
+    claimed = {}  # id -> line number of the record that owns its directory in this run
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, \
+            open(args.out_dir / CHECKPOINT_FILE, "a", encoding="utf-8") as checkpoint, \
+            open(args.out_dir / FAILURES_FILE, "a", encoding="utf-8") as failures:
+
+        def record_failure(rid, error, **extra):
+            nonlocal failed
+            failed += 1
+            failures.write(json.dumps({"id": rid, "error": error, **extra}) + "\n")
+            failures.flush()
+            print(f"❌ {rid}: {error}")
+
+        def submit_next():
+            nonlocal skipped
+            for rid, record, digest, line_number, line in records:
+                if record is None:
+                    record_failure(rid, "malformed JSON line", line_number=line_number, line=line)
+                    continue
+                if rid in claimed:
+                    record_failure(rid, f"duplicate id (already used on line {claimed[rid]})",
+                                   line_number=line_number, source_id=record.get("id"))
+                    continue
+                claimed[rid] = line_number
+                if rid in done_ids:
+                    if done_ids[rid] not in (None, digest):
+                        record_failure(rid, "id already exported from a different record in an earlier run",
+                                       line_number=line_number, source_id=record.get("id"))
+                    else:
+                        skipped += 1
+                    continue
+                future = executor.submit(export_record, rid, record, str(args.out_dir), args.styles, args.formats)
+                pending[future] = (rid, digest)
+                return
+
+        # Keep the pool busy without reading the whole input into memory
+        for _ in range(args.workers * 2):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rid, digest = pending.pop(future)
+                submit_next()
+                try:
+                    _, written = future.result()
+                except Exception as e:
+                    record_failure(rid, str(e))
+                    continue
+
+                succeeded += 1
+                files += written
+                checkpoint.write(f"{rid}\t{digest}\n")
+                checkpoint.flush()
+
+                if succeeded % args.progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"{succeeded} resumes, {files} files in {elapsed:.1f}s ({succeeded / elapsed:.1f} resumes/s)")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\nExported {succeeded} resumes ({files} files) in {elapsed:.1f}s — "
+        f"{succeeded / elapsed if elapsed else 0:.1f} resumes/s, {files / elapsed if elapsed else 0:.1f} files/s"
+    )
+    print(f"Skipped (already done): {skipped}  Failed: {failed}")
+    if failed:
+        print(f"Failures logged to {args.out_dir / FAILURES_FILE}; re-run to retry them.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Tests for request deadlines and degraded-stage tracking.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_utils import deadline as deadline_module
+from api_utils.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    llm_call_timeout,
+    start_deadline,
+)
+from api_utils.metrics import submit_in_context
+
+
+def _in_new_context(fn):
+    return contextvars.copy_context().run(fn)
+
+
+def test_call_timeouts_are_clamped_to_the_time_left():
+    def run():
+        deadline = start_deadline(10)
+        timeout = llm_call_timeout("summary", 30)
+        assert timeout <= 10 - deadline_module.DEADLINE_FINALIZE_RESERVE
+        assert llm_call_timeout("classify", 2) == 2
+        assert not deadline.partial
+
+    _in_new_context(run)
+
+
+def test_spent_deadline_refuses_calls_and_records_the_stage():
+    def run():
+        deadline = start_deadline(0)
+        with pytest.raises(DeadlineExceeded):
+            llm_call_timeout("skills", 30)
+        with pytest.raises(DeadlineExceeded):
+            llm_call_timeout("skills", 30)
+        deadline.degrade("experience", "error")
+        assert deadline.partial
+        assert deadline.degraded_stages == ["experience", "skills"]
+        assert deadline.degraded == {"skills": "deadline", "experience": "error"}
+
+    _in_new_context(run)
+
+
+def test_worker_threads_see_the_request_deadline():
+    def run():
+        deadline = start_deadline(5)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert submit_in_context(executor, current_deadline).result() is deadline
+        assert time.monotonic() < deadline.expires_at
+
+    _in_new_context(run)
+    assert current_deadline() is None
+
+
+def test_deadline_counts_from_when_the_request_arrived():
+    def run():
+        deadline = start_deadline(10, started_at=time.monotonic() - 9.5)
+        assert deadline.remaining() <= 0.5
+        with pytest.raises(DeadlineExceeded):
+            llm_call_timeout("summary", 30)  # less than the finalize reserve is left
+
+    _in_new_context(run)
@@ -0,0 +1,40 @@
+"""
+Tests for the export cache and the ETag helpers behind /export.
+"""
+from app.export.export_cache import ExportCache, etag_matches, export_key, format_etag
+
+
+def test_key_depends_on_every_input():
+    base = export_key("resume", "Modern", "PDF", {"name": "Jane"})
+    assert base == export_key("resume", "Modern", "PDF", {"name": "Jane", "phone": ""})
+    assert base != export_key("resume!", "Modern", "PDF", {"name": "Jane"})
+    assert base != export_key("resume", "ATS-Friendly", "PDF", {"name": "Jane"})
+    assert base != export_key("resume", "Modern", "DOCX", {"name": "Jane"})
+    assert base != export_key("resume", "Modern", "PDF", {"name": "John"})
+    assert base != export_key("resume", "Modern", "PDF", {"name": "Jane"}, version="2")
+
+
+def test_if_none_match_parsing():
+    etag = format_etag("abc")
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"old", "abc"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"old"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_cache_is_bounded_by_total_size():
+    cache = ExportCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")  # a is now most recently used
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache.size == 8
+
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
@@ -0,0 +1,114 @@
+"""
+Regression tests for the HTML compaction stage that runs before GPT parsing.
+
+Compaction must only drop markup: the text the parser sees, block by block,
+has to stay identical for the docs/ samples. Text is compared one line per
+block element, so words from adjacent blocks being merged is caught too.
+"""
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+
+html_converter = pytest.importorskip("api_utils.html_converter")
+
+DOCS_DIR = Path(__file__).resolve().parent.parent / "docs"
+SAMPLES = sorted(
+    p for p in DOCS_DIR.iterdir()
+    if p.suffix.lower() in (".txt", ".docx", ".pdf")
+)
+# The converter imports these on first use of each format
+CONVERTER_DEPENDENCIES = {".docx": "mammoth", ".pdf": "pdfminer"}
+
+
+def require_converter(sample):
+    dependency = CONVERTER_DEPENDENCIES.get(sample.suffix.lower())
+    if dependency:
+        pytest.importorskip(dependency)
+
+
+# Elements that start a new line of text when a browser renders them
+BLOCK_ELEMENTS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+    "nav", "ol", "p", "pre", "section", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+}
+
+
+class _BlockTextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def _boundary(self, tag):
+        if tag in BLOCK_ELEMENTS:
+            self.parts.append("\n")
+
+    def handle_starttag(self, tag, attrs):
+        self._boundary(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._boundary(tag)
+
+    def handle_endtag(self, tag):
+        self._boundary(tag)
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def block_text(html):
+    """Visible text, one line per block with whitespace collapsed; empty blocks are dropped."""
+    collector = _BlockTextCollector()
+    collector.feed(html)
+    collector.close()
+    lines = (re.sub(r"\s+", " ", line).strip() for line in "".join(collector.parts).split("\n"))
+    return [line for line in lines if line]
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_compaction_preserves_parser_input_text(sample):
+    """The compacted HTML carries exactly the same text as the full converter output."""
+    require_converter(sample)
+    full_html = html_converter.convert_resume_to_html(str(sample), compact=False)
+    assert full_html, f"conversion failed for {sample.name}"
+
+    compact, stats = html_converter.compact_html_with_stats(full_html)
+
+    assert block_text(compact) == block_text(full_html)
+    assert stats["chars_after"] <= stats["chars_before"]
+    assert stats["tokens_after"] <= stats["tokens_before"]
+
+
+def test_samples_cover_docx_and_pdf():
+    assert {".docx", ".pdf"} <= {sample.suffix.lower() for sample in SAMPLES}
+
+
+def test_block_text_tells_merged_blocks_apart():
+    html = "<div><p>Python</p><p>SQL</p></div><ul><li>Built<br>dashboards</li></ul>"
+    assert block_text(html) == ["Python", "SQL", "Built", "dashboards"]
+    assert block_text("<p>Python SQL</p><p>Built dashboards</p>") != block_text(html)
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_compaction_is_idempotent(sample):
+    """Compacting already-compact HTML is a no-op, so re-running the stage is safe."""
+    require_converter(sample)
+    compact = html_converter.convert_resume_to_html(str(sample))
+    assert html_converter.compact_html(compact) == compact
+
+
+def test_compaction_keeps_only_semantic_tags():
+    html = (
+        '<div class="wrapper"><h1>Jane  Doe</h1><p></p><p>   </p>'
+        '<p>Data <a href="https://x.y">analyst</a> &amp; <strong>engineer</strong></p>'
+        '<ul><li><p>Built   dashboards</p></li><li></li></ul>'
+        '<table><tr><td>Python</td><td>SQL</td></tr></table></div>'
+    )
+    assert html_converter.compact_html(html) == (
+        "<h1>Jane Doe</h1>"
+        "<p>Data analyst &amp; engineer</p>"
+        "<li>Built dashboards</li>"
+        "<p>Python</p><p>SQL</p>"
+    )
@@ -0,0 +1,64 @@
+"""
+Tests for the incremental section parser used by the streaming resume parse.
+"""
+import json
+import random
+
+from api_utils.json_stream import SectionStreamParser
+
+SAMPLE = {
+    "contact_info": {"name": "Jane \"JD\" Doe", "email": "jane@example.com"},
+    "summary": "Analyst, {curly} and [square] text",
+    "skills": ["Python", "SQL"],
+    "experience": [
+        {"title": "Analyst", "company": "Acme", "date_range": "2020 - 2022", "bullets": ["Built, shipped", "a ] b"]},
+        {"title": "Intern", "company": "Beta", "date_range": "", "bullets": []},
+    ],
+    "education": "BS Statistics",
+    "projects": [],
+}
+
+
+def feed_in_chunks(text, max_chunk=7, seed=0):
+    rng = random.Random(seed)
+    parser = SectionStreamParser(stream_arrays={"experience"})
+    events = []
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, max_chunk)
+        events.extend(parser.feed(text[i:i + n]))
+        i += n
+    return parser, events
+
+
+def test_sections_and_items_survive_arbitrary_chunking():
+    """Every section and experience job decodes identically regardless of chunk boundaries."""
+    text = "```json\n" + json.dumps(SAMPLE, indent=2) + "\n```"
+    for seed in range(20):
+        parser, events = feed_in_chunks(text, seed=seed)
+        sections = {e.key: e.value for e in events if e.index is None}
+        jobs = [e.value for e in events if e.index is not None]
+        assert parser.done
+        assert sections == SAMPLE
+        assert jobs == SAMPLE["experience"]
+
+
+def test_jobs_are_emitted_before_the_rest_of_the_document():
+    """The first job is available before the closing bracket of the experience array arrives."""
+    text = json.dumps(SAMPLE)
+    cut = text.index('{"title": "Intern"')
+    parser = SectionStreamParser(stream_arrays={"experience"})
+    events = parser.feed(text[:cut])
+    assert [(e.key, e.index) for e in events][-1] == ("experience", 0)
+
+
+def test_malformed_fragment_is_reported_without_losing_siblings():
+    """A broken job is flagged with its raw text while its neighbours still decode."""
+    parser = SectionStreamParser(stream_arrays={"experience"})
+    events = parser.feed('{"summary": "ok", "experience": [{"title": "a",}, {"title": "b"}], "skills": "x"}')
+    by_pos = {(e.key, e.index): e for e in events}
+    assert by_pos[("summary", None)].value == "ok"
+    assert by_pos[("experience", 0)].error is not None
+    assert by_pos[("experience", 0)].raw == '{"title": "a",}'
+    assert by_pos[("experience", 1)].value == {"title": "b"}
+    assert by_pos[("skills", None)].value == "x"
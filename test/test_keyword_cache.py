@@ -0,0 +1,33 @@
+"""
+Tests for the on-disk keyword caches under concurrent writes.
+"""
+import json
+import threading
+
+from api_utils.keyword_cache import KeywordCache
+
+
+def test_concurrent_writes_and_saves_leave_a_complete_file(tmp_path):
+    cache = KeywordCache(tmp_path / "cache.json")
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(200):
+                cache[f"{n}-{i}"] = [f"keyword {i}"]
+                if i % 20 == 0:
+                    cache.save()
+        except Exception as e:  # e.g. "dictionary changed size during iteration"
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.save()
+
+    assert errors == []
+    assert len(json.loads((tmp_path / "cache.json").read_text())) == 800
+    assert list(tmp_path.iterdir()) == [tmp_path / "cache.json"]  # no temp files left behind
+    assert len(KeywordCache(tmp_path / "cache.json")) == 800
@@ -0,0 +1,52 @@
+"""
+Tests for hedged LLM calls.
+"""
+import threading
+import time
+
+from api_utils import llm_hedging
+from api_utils.llm_hedging import HedgeBudget, hedged_call, observe_latency
+from api_utils.metrics import REGISTRY
+
+
+def _warm(stage_name, seconds=0.01):
+    for _ in range(llm_hedging.LLM_HEDGE_MIN_SAMPLES):
+        observe_latency(stage_name, "m", seconds)
+
+
+def test_no_hedge_until_the_stage_has_latency_samples():
+    calls = []
+    assert hedged_call("hedge-cold", "m", lambda: calls.append(1) or "ok") == "ok"
+    assert calls == [1]
+    assert REGISTRY.counter("rex_llm_hedges_total", stage="hedge-cold", result="issued") == 0
+
+
+def test_hedge_wins_when_the_first_attempt_hangs(monkeypatch):
+    _warm("hedge-slow")
+    monkeypatch.setattr(llm_hedging, "_budget", lambda stage_name: HedgeBudget(ratio=1, burst=1))
+    release = threading.Event()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(5)  # the hung request
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    try:
+        assert hedged_call("hedge-slow", "m", call) == "fast"
+    finally:
+        release.set()
+    assert time.perf_counter() - start < 1
+    assert REGISTRY.counter("rex_llm_hedges_total", stage="hedge-slow", result="won") == 1
+
+
+def test_budget_caps_extra_load():
+    budget = HedgeBudget(ratio=0.25, burst=2)
+    spent = 0
+    for _ in range(100):
+        budget.deposit()
+        spent += budget.try_spend()
+    assert spent == 25
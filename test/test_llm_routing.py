@@ -0,0 +1,56 @@
+"""
+Tests for the per-stage LLM routing table.
+"""
+import pytest
+
+from api_utils import llm_routing
+from api_utils.llm_routing import Route, load_routing_table, set_routing_table, stage_routes, suspend_primary
+
+EXAMPLE = {
+    "providers": {"local": {"api_base": "http://localhost:8080/v1"}},
+    "stages": {
+        "classify": {
+            "primary": {"provider": "local", "model": "llama3.1:8b", "timeout": 3},
+            "fallback": {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 8, "timeout": 10},
+        },
+        "experience": {"primary": {"timeout": 25}, "fallback": None},
+    },
+}
+
+
+def test_overrides_merge_over_the_default_routes():
+    providers, routes = load_routing_table(EXAMPLE)
+
+    assert providers["local"].api_base == "http://localhost:8080/v1"
+    assert routes["classify"].primary == Route("local", "llama3.1:8b", max_tokens=8, timeout=3)
+    assert routes["classify"].fallback.model == "gpt-4o-mini"
+    # Only the timeout changed; the model and max_tokens stay, and null drops the fallback
+    assert routes["experience"].primary.timeout == 25
+    assert routes["experience"].primary.model == llm_routing.DEFAULT_ROUTES["experience"].primary.model
+    assert routes["experience"].fallback is None
+    assert routes["parse"] == llm_routing.DEFAULT_ROUTES["parse"]
+
+
+@pytest.mark.parametrize("config", [
+    {"stages": {"rerank": {"primary": {"model": "x"}}}},
+    {"stages": {"classify": {"primary": {"provider": "nowhere"}}}},
+    {"stages": {"classify": {"primary": {"temperature": 0.2}}}},
+])
+def test_invalid_tables_are_rejected(config):
+    with pytest.raises(ValueError):
+        load_routing_table(config)
+
+
+def test_budget_breach_sends_the_stage_to_its_fallback(monkeypatch):
+    set_routing_table(EXAMPLE)
+    try:
+        assert [r.provider for r in stage_routes("classify")] == ["local", "openai"]
+        assert len(stage_routes("experience")) == 1
+
+        suspend_primary("classify")
+        assert [r.provider for r in stage_routes("classify")] == ["openai"]
+
+        monkeypatch.setattr(llm_routing.time, "monotonic", lambda: float("inf"))
+        assert [r.provider for r in stage_routes("classify")] == ["local", "openai"]
+    finally:
+        set_routing_table()
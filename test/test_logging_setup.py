@@ -0,0 +1,109 @@
+"""
+Tests for lazy payload logging and the non-blocking queue handler.
+"""
+import io
+import json
+import logging
+import queue
+
+from api_utils import logging_setup
+from api_utils.logging_setup import (
+    DroppingQueueHandler,
+    configure_logging,
+    log_sampled,
+    shutdown_logging,
+    truncated,
+)
+
+
+class _Payload:
+    """Counts how often it is rendered into a log message."""
+
+    def __init__(self):
+        self.rendered = 0
+
+    def __repr__(self):
+        self.rendered += 1
+        return "x" * 2000
+
+
+def test_truncated_is_only_rendered_when_emitted():
+    logger = logging.getLogger("test.lazy")
+    logger.setLevel(logging.INFO)
+    payload = _Payload()
+
+    logger.debug("dump: %s", truncated(payload))
+    assert payload.rendered == 0
+
+    text = str(truncated(payload, limit=10))
+    assert text == "xxxxxxxxxx... [1990 more chars]"
+    assert str(truncated("short")) == "short"
+
+
+def test_log_sampled_respects_level_and_rate(caplog):
+    logger = logging.getLogger("test.sampled")
+    with caplog.at_level(logging.INFO, logger="test.sampled"):
+        log_sampled(logger, "dump %s", "a", rate=1.0)
+    assert not caplog.records
+
+    with caplog.at_level(logging.DEBUG, logger="test.sampled"):
+        log_sampled(logger, "never %s", "b", rate=0.0)
+        log_sampled(logger, "always %s", "c", rate=1.0)
+    assert [r.getMessage() for r in caplog.records] == ["always c"]
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("test.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_configured_listener_writes_json_lines():
+    stream = io.StringIO()
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    configure_logging(level="INFO", fmt="json", stream=stream)
+    try:
+        logging.getLogger("test.json").info("stage %s done", "parse", extra={"ms": 12.5})
+    finally:
+        shutdown_logging()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    entry = json.loads(stream.getvalue().strip())
+    assert entry["msg"] == "stage parse done"
+    assert entry["logger"] == "test.json"
+    assert entry["ms"] == 12.5
+
+
+def test_settings_are_read_when_logging_is_configured(monkeypatch):
+    # As if loaded from .env after this module was imported
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_PAYLOAD_MAX_CHARS", "8")
+    monkeypatch.setattr(logging_setup, "LOG_PAYLOAD_MAX_CHARS", logging_setup.LOG_PAYLOAD_MAX_CHARS)  # restored after
+    stream = io.StringIO()
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    configure_logging(stream=stream)
+    try:
+        assert root.level == logging.WARNING
+        assert str(truncated("x" * 20)) == "xxxxxxxx... [12 more chars]"
+        logging.getLogger("test.env").warning("from env")
+    finally:
+        shutdown_logging()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    assert json.loads(stream.getvalue().strip())["msg"] == "from env"
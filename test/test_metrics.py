@@ -0,0 +1,61 @@
+"""
+Tests for per-request traces and the Prometheus exposition.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from api_utils.metrics import (
+    Histogram,
+    MetricsRegistry,
+    REGISTRY,
+    record_cache_lookup,
+    record_llm_call,
+    stage,
+    start_trace,
+    submit_in_context,
+)
+
+
+def test_worker_threads_record_into_the_request_trace():
+    trace = start_trace()
+
+    def enhance():
+        with stage("experience"):
+            record_llm_call("experience", "gpt-4", 0.5, prompt_tokens=120, completion_tokens=40)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for future in [submit_in_context(executor, enhance) for _ in range(3)]:
+            future.result()
+    with stage("filter"):
+        record_cache_lookup("filter", hit=True)
+
+    summary = trace.summary()
+    assert set(summary["stages_ms"]) == {"experience", "filter"}
+    assert len(summary["llm_calls"]) == 3
+    assert summary["cache_lookups"] == {"filter": {"hit": 1, "miss": 0}}
+    assert trace.server_timing().startswith("experience;dur=")
+    assert REGISTRY.counter("rex_llm_tokens_total", stage="experience", model="gpt-4", kind="prompt") >= 360
+
+
+def test_prometheus_histogram_exposition():
+    registry = MetricsRegistry()
+    registry.describe("rex_stage_duration_seconds", "Wall time of each pipeline stage.")
+    for seconds in (0.003, 0.2, 7):
+        registry.observe("rex_stage_duration_seconds", seconds, stage="parse")
+    registry.inc("rex_llm_calls_total", stage="parse", model="gpt-4o", outcome="ok")
+
+    text = registry.render_prometheus()
+    assert "# TYPE rex_stage_duration_seconds histogram" in text
+    assert 'rex_stage_duration_seconds_bucket{stage="parse",le="0.005"} 1' in text
+    assert 'rex_stage_duration_seconds_bucket{stage="parse",le="0.25"} 2' in text
+    assert 'rex_stage_duration_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'rex_stage_duration_seconds_count{stage="parse"} 3' in text
+    assert 'rex_llm_calls_total{model="gpt-4o",outcome="ok",stage="parse"} 1' in text
+
+
+def test_histogram_quantile_is_a_bucket_upper_bound():
+    histogram = Histogram()
+    assert histogram.quantile(0.9) is None
+    for seconds in [0.3] * 9 + [30]:
+        histogram.observe(seconds)
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.99) == 40
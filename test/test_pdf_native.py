@@ -0,0 +1,76 @@
+"""
+Tests for the in-process PDF backend.
+"""
+import re
+import time
+import zlib
+
+from api_utils.resume_formatter import assemble_resume, format_experience_section
+from app.export.pdf_native import PdfStyle, render_pdf, text_width, wrap_text
+from app.export.pdf_renderer import pdf_stats
+from app.export.resume_document import parse_resume_text
+
+PROFESSIONAL = PdfStyle(regular_font="Times-Roman", bold_font="Times-Bold", italic_font="Times-Italic", centered=True)
+
+
+def build_resume(jobs):
+    return assemble_resume(
+        summary="Data analyst (SQL \\ Python) with 6 years of experience — café & co.",
+        skills="Python, SQL, Tableau",
+        experience=format_experience_section([
+            {"title": f"Data Analyst {i}", "company": f"Company {i}", "date_range": "Jan '20 - Present",
+             "bullets": [f"Built reporting pipeline {b} in Python, cutting manual effort by {10 + b}% across teams"
+                         for b in range(5)]}
+            for i in range(jobs)
+        ]),
+        education="B.S. Statistics, State University",
+    )
+
+
+def page_text(pdf):
+    """Decoded text operands of every content stream, in order."""
+    streams = re.findall(rb"/FlateDecode >>\nstream\n(.*?)\nendstream", pdf, re.S)
+    content = b"\n".join(zlib.decompress(stream) for stream in streams)
+    return [m.decode('cp1252').replace('\\(', '(').replace('\\)', ')').replace('\\\\', '\\')
+            for m in re.findall(rb"\((.*?)(?<!\\)\) Tj", content)]
+
+
+def test_output_is_well_formed_and_uses_standard_fonts():
+    pdf = render_pdf(parse_resume_text(build_resume(2)), name="Jane Doe", contact_lines=["jane@example.com"])
+
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    xref_at = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    assert pdf[xref_at:].startswith(b"xref")
+    for number, offset in enumerate(re.findall(rb"(\d{10}) 00000 n", pdf), start=1):
+        assert pdf[int(offset):].startswith(b"%d 0 obj" % number)
+
+    assert b"/FontFile" not in pdf
+    text = page_text(pdf)
+    assert text[:2] == ["Jane Doe", "jane@example.com"]
+    assert "Data analyst (SQL \\ Python) with 6 years of experience — café & co." in text
+
+
+def test_long_resumes_flow_onto_more_pages():
+    pdf = render_pdf(parse_resume_text(build_resume(20)), style=PROFESSIONAL, name="Jane Doe")
+    text = page_text(pdf)
+
+    assert pdf_stats(pdf)["pages"] > 1
+    titles = [line for line in text if line.startswith("Data Analyst ")]
+    assert titles == [f"Data Analyst {i} Jan '20 - Present" for i in range(20)]
+
+
+def test_wrapping_fits_the_line_and_keeps_every_word():
+    text = "Built automated reporting pipelines in Python and Airflow " * 6 + "x" * 200
+    lines = wrap_text(text, "Helvetica", 10, 300)
+
+    assert all(text_width(line, "Helvetica", 10) <= 300 for line in lines)
+    assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+
+
+def test_render_time_budget():
+    """Renders run in-process in tens of milliseconds at most, even for a 3-page resume."""
+    document = parse_resume_text(build_resume(12))
+    start = time.perf_counter()
+    for _ in range(20):
+        render_pdf(document, name="Jane Doe")
+    assert (time.perf_counter() - start) / 20 < 0.05
@@ -0,0 +1,48 @@
+"""
+Tests for the pooled wkhtmltopdf renderer.
+"""
+from concurrent.futures import wait
+
+import pytest
+
+from app.export.pdf_renderer import PdfRenderer, PdfRenderError, options_to_args, pdf_stats
+
+renderer = PdfRenderer()
+needs_wkhtmltopdf = pytest.mark.skipif(not renderer.available, reason="wkhtmltopdf not installed")
+
+
+def test_options_to_args():
+    assert options_to_args({'page-size': 'Letter', 'quiet': '', 'margin-top': '0.5in'}) == [
+        '--page-size', 'Letter', '--quiet', '--margin-top', '0.5in'
+    ]
+
+
+def test_pdf_stats_counts_page_objects_not_the_page_tree():
+    pdf = (
+        b"%PDF-1.4\n1 0 obj << /Type /Pages /Kids [2 0 R 3 0 R] /Count 2 >> endobj\n"
+        b"2 0 obj << /Type /Page /Parent 1 0 R >> endobj\n"
+        b"3 0 obj << /Type/Page /Parent 1 0 R >> endobj\n%%EOF"
+    )
+    stats = pdf_stats(pdf)
+    assert stats["pages"] == 2
+    assert stats["bytes_per_page"] == len(pdf) // 2
+
+
+def test_missing_binary_raises_before_queueing(monkeypatch):
+    monkeypatch.setattr('shutil.which', lambda name: None)
+    missing = PdfRenderer(configured_path='/nonexistent/wkhtmltopdf')
+    assert not missing.available
+    with pytest.raises(PdfRenderError):
+        missing.submit('<p>x</p>')
+
+
+@needs_wkhtmltopdf
+def test_concurrent_renders_return_distinct_pdfs():
+    """Concurrent renders never share a path, so each gets its own document back."""
+    futures = [
+        renderer.submit(f"<html><body><h1>Resume {i}</h1></body></html>", {'quiet': ''})
+        for i in range(8)
+    ]
+    wait(futures)
+    pdfs = [f.result() for f in futures]
+    assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
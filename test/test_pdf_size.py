@@ -0,0 +1,61 @@
+"""
+Size budgets for exported PDFs in each built-in style.
+
+Budgets are per page, so they hold as the sample resume grows. They catch
+regressions such as full font embedding, rasterized shadows or uncompressed
+streams slipping back into the templates or render options. The native
+backend is the small-output path: its budget is a thirtieth of the wkhtmltopdf
+one, and when wkhtmltopdf is installed its output must be at most a quarter
+the size.
+"""
+import pytest
+
+pytest.importorskip("jinja2")
+pytest.importorskip("docx")
+
+from api_utils.resume_formatter import assemble_resume, format_experience_section
+from app.export import resume_export
+from app.export.pdf_renderer import pdf_stats
+
+# Bytes per page; a one-page native render of RESUME is about 1.7 KiB
+STANDARD_BUDGET = 120 * 1024
+NATIVE_BUDGET = 4 * 1024
+
+requires_wkhtmltopdf = pytest.mark.skipif(not resume_export.is_wkhtmltopdf_installed(),
+                                          reason="wkhtmltopdf not installed")
+
+RESUME = assemble_resume(
+    summary="Data analyst with 6 years of experience in SQL, Python and Tableau.",
+    skills="Python, SQL, Tableau, Airflow, dbt, Snowflake",
+    experience=format_experience_section([
+        {"title": f"Data Analyst {i}", "company": f"Company {i}", "date_range": f"Jan '{10 + i} - Dec '{11 + i}",
+         "bullets": [f"Built reporting pipeline {b} in Python, cutting manual effort by {10 + b}%" for b in range(5)]}
+        for i in range(4)
+    ]),
+    education="B.S. Statistics, State University",
+)
+
+
+def _render(style, backend):
+    return pdf_stats(resume_export.generate_pdf(RESUME, style=style, name="Jane Doe", backend=backend))
+
+
+@requires_wkhtmltopdf
+@pytest.mark.parametrize("style", resume_export.get_available_styles())
+def test_pdf_size_budget(style):
+    standard = _render(style, "wkhtmltopdf")
+    assert standard["bytes_per_page"] <= STANDARD_BUDGET, standard
+
+
+@pytest.mark.parametrize("style", resume_export.get_available_styles())
+def test_native_pdf_size_budget(style):
+    native = _render(style, "native")
+    assert native["bytes_per_page"] <= NATIVE_BUDGET, native
+
+
+@requires_wkhtmltopdf
+@pytest.mark.parametrize("style", resume_export.get_available_styles())
+def test_native_pdf_is_smaller_than_wkhtmltopdf(style):
+    native = _render(style, "native")
+    standard = _render(style, "wkhtmltopdf")
+    assert native["bytes"] * 4 <= standard["bytes"], (native, standard)
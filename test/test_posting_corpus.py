@@ -0,0 +1,47 @@
+"""
+Tests for ranking a resume against the posting corpus.
+"""
+import pytest
+
+pytest.importorskip("numpy")
+
+from api_utils.keyword_scorer import score_keywords  # noqa: E402
+from api_utils.posting_corpus import PostingCorpus, build_corpus  # noqa: E402
+
+POSTINGS = [
+    {"posting_id": "analyst", "title": "Data Analyst", "classified_keywords": {
+        "tool_platform": ["SQL", "tableau", "python"], "certification_license": [],
+        "domain_knowledge": ["forecasting"], "soft_skill": ["communication"], "other": []}},
+    {"posting_id": "nurse", "title": "Registered Nurse", "classified_keywords": {
+        "tool_platform": ["epic"], "certification_license": ["bls", "rn license"],
+        "domain_knowledge": ["patient care"], "soft_skill": ["empathy"], "other": ["night shifts"]}},
+    {"posting_id": "engineer", "title": "Data Engineer", "classified_keywords": {
+        "tool_platform": ["sql", "airflow", "spark", "python"], "other": ["on-call"]}},
+]
+RESUME = "<p>Built SQL and Python pipelines in Airflow; Tableau dashboards; clear communication.</p>"
+
+
+def test_rank_matches_keyword_scorer(tmp_path):
+    corpus = build_corpus(POSTINGS, tmp_path)
+    ranked = corpus.rank(RESUME, top_k=3)
+
+    assert [r["posting_id"] for r in ranked] == ["engineer", "analyst", "nurse"]
+    profiles = {p["posting_id"]: p["classified_keywords"] for p in POSTINGS}
+    for result in ranked:
+        profile = profiles[result["posting_id"]]
+        matched = [k.lower() for keywords in profile.values() for k in keywords if k.lower() in RESUME.lower()]
+        expected = score_keywords(profile, matched)
+        assert result["score"] == expected.pop("final_score")
+        assert result["category_scores"] == expected
+
+
+def test_corpus_reopens_from_disk(tmp_path):
+    build_corpus(POSTINGS, tmp_path)
+    corpus = PostingCorpus(tmp_path)
+
+    assert len(corpus) == 3
+    keywords = {category: sorted(words) for category, words in corpus.posting_keywords(2).items()}
+    assert keywords == {"tool_platform": ["airflow", "python", "spark", "sql"], "other": ["on-call"]}
+    top = corpus.rank(RESUME, top_k=1)
+    assert [r["posting_id"] for r in top] == ["engineer"]
+    assert top[0]["categories"]["tool_platform"]["matched_words"] == ["airflow", "python", "sql"]
@@ -0,0 +1,47 @@
+"""
+Tests for the on-demand request profiler.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_utils import profiler
+from api_utils.metrics import submit_in_context
+from api_utils.profiler import categorize, load_profile, profile_request, render_flamegraph_svg
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_samples_request_and_worker_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+
+    with profile_request("/optimize-resume") as active:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            submit_in_context(executor, _spin, 0.1).result()
+        _spin(0.05)
+
+    # Threads outside a profiled request are never sampled
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        submit_in_context(executor, _spin, 0.02).result()
+
+    report = load_profile(active.profile_id)
+    assert report["label"] == "/optimize-resume"
+    assert report["samples"] > 0
+    assert report["threads"] == 2
+    assert any(spot["function"].startswith("_spin (test/test_profiler.py") for spot in report["hot_spots"])
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in report["folded"])
+    assert "<svg" in render_flamegraph_svg(report["folded"])
+    assert load_profile("../etc/passwd") is None
+
+
+def test_categorize_by_innermost_rex_frame():
+    assert categorize(["api.py", "api_utils/html_converter.py", "pdf2docx/converter.py"]) == "conversion"
+    assert categorize(["api.py", "api_utils/workflow.py", "api_utils/keyword_matcher.py"]) == "keyword"
+    assert categorize(["api_utils/workflow.py", "api_utils/gpt_parser.py", "openai/api_requestor.py",
+                       "ssl.py"]) == "llm_wait"
+    assert categorize(["api.py", "app/export/resume_export.py", "docx/document.py"]) == "export"
+    assert categorize(["api_utils/workflow.py", "concurrent/futures/_base.py", "threading.py"]) == "waiting"
+    assert categorize(["threading.py"]) == "other"
@@ -0,0 +1,72 @@
+"""
+Tests for the shared resume document model and its text renderers.
+"""
+from api_utils.resume_formatter import assemble_resume, format_experience_section
+from app.export.resume_document import (
+    BulletList,
+    ExperienceEntry,
+    Paragraph,
+    parse_resume_text,
+    render_html,
+    render_markdown,
+    render_text,
+)
+
+JOBS = [
+    {"title": "Data Analyst", "company": "Acme", "date_range": "Jan 2020 - Present",
+     "bullets": ["Cut report time 40% at scale", "Led a team of 3"]},
+    {"title": "Intern", "company": "", "date_range": "", "bullets": ["Cleaned data"]},
+]
+
+RESUME = assemble_resume(
+    summary="Analyst with 5 years of SQL.",
+    skills="Python, SQL",
+    experience=format_experience_section(JOBS),
+    education="BS Statistics",
+    projects='<p class="project-title">RESUME TOOL</p>\n• Built it in Python',
+)
+
+
+def test_pipeline_output_parses_into_sections_and_jobs():
+    document = parse_resume_text(RESUME)
+    titles = [s.title for s in document.sections]
+    assert titles == ["SUMMARY", "SKILLS", "EXPERIENCE", "EDUCATION", "PROJECTS"]
+
+    experience = document.sections[2]
+    assert experience.blocks == (
+        ExperienceEntry("Data Analyst Jan 2020 - Present", "Acme",
+                        (BulletList(("Cut report time 40% at scale", "Led a team of 3")),)),
+        ExperienceEntry("Intern", None, (BulletList(("Cleaned data",)),)),
+    )
+
+    projects = document.sections[4]
+    assert projects.blocks[0] == Paragraph("RESUME TOOL", kind="project-title")
+
+
+def test_parse_is_cached_per_text():
+    assert parse_resume_text(RESUME) is parse_resume_text(RESUME)
+
+
+def test_renderers_agree_on_content():
+    document = parse_resume_text(RESUME)
+    html = render_html(document)
+    text = render_text(document)
+    markdown = render_markdown(document, name="Jane Doe")
+
+    assert '<h3>Data Analyst Jan 2020 - Present</h3>' in html
+    assert '<p class="company-name"><strong>Acme</strong></p>' in html
+    assert '<p class="project-title">RESUME TOOL</p>' in html
+    assert html.count('<div') == html.count('</div>')
+
+    assert '• Cut report time 40% at scale' in text
+    assert '<p' not in text
+
+    assert markdown.startswith('# Jane Doe\n')
+    assert '### Intern' in markdown
+    assert '- Built it in Python' in markdown
+
+
+def test_text_render_round_trips():
+    """Re-parsing rendered plain text yields the same document."""
+    document = parse_resume_text(RESUME)
+    assert parse_resume_text(render_text(document)).sections[2] == document.sections[2]
@@ -0,0 +1,39 @@
+"""
+Startup budget: the pipeline imports quickly and leaves heavy dependencies,
+.env loading and the keyword caches for first use.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from api_utils.warmup import DEFERRED_MODULES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Fresh-interpreter import of the whole pipeline; generous for slow CI machines
+IMPORT_BUDGET_SECONDS = 1.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import api_utils.workflow
+seconds = time.perf_counter() - start
+from api_utils.keyword_classifier import keyword_cache
+from api_utils.keyword_matcher import filter_cache
+print(json.dumps({
+    "seconds": seconds,
+    "modules": sorted(sys.modules),
+    "caches_loaded": keyword_cache.loaded or filter_cache.loaded,
+}))
+"""
+
+
+def test_pipeline_import_is_lazy_and_within_budget():
+    result = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    probe = json.loads(result.stdout)
+
+    eager = [name for name in DEFERRED_MODULES + ("dotenv",) if name in probe["modules"]]
+    assert eager == []
+    assert not probe["caches_loaded"]
+    assert probe["seconds"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,94 @@
+"""
+Tests for size-capped, streamed resume uploads.
+"""
+import asyncio
+import hashlib
+import io
+import zipfile
+
+import pytest
+
+from api_utils import uploads
+from api_utils.uploads import UploadRejected, check_content_length, sniff_format, spool_upload
+
+
+class FakeUpload:
+    """The slice of FastAPI's UploadFile that spool_upload uses."""
+
+    def __init__(self, content: bytes, size=None):
+        self._stream = io.BytesIO(content)
+        self.size = size
+        self.bytes_read = 0
+
+    async def read(self, n=-1):
+        chunk = self._stream.read(n)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _docx_bytes(document=True) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        if document:
+            archive.writestr("word/document.xml", "<w:document/>")
+    return buffer.getvalue()
+
+
+def test_format_comes_from_content_not_filename():
+    assert sniff_format(b"%PDF-1.7\n%\xe2\xe3") == ".pdf"
+    assert sniff_format(_docx_bytes()[:64]) == ".docx"
+    assert sniff_format("Jane Doe — Data Analyst\nSQL, Python".encode("utf-8")) == ".txt"
+    assert sniff_format("Résumé".encode("latin-1")) == ".txt"
+    assert sniff_format(b"\x89PNG\r\n\x1a\n\x00\x00") is None
+    assert sniff_format(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00") is None  # legacy .doc
+
+
+def test_spooled_upload_spills_to_disk_and_hashes_content(monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_SPOOL_BYTES", 1024)
+    content = b"%PDF-1.4\n" + b"x" * 200_000
+
+    with asyncio.run(spool_upload(FakeUpload(content))) as upload:
+        assert upload.format == ".pdf"
+        assert upload.size == len(content)
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.file._rolled  # only the spool threshold stayed in memory
+        assert upload.file.read() == content
+
+
+def test_oversized_and_unsupported_uploads_are_rejected_early():
+    declared = FakeUpload(b"%PDF-" + b"x" * 100, size=10_000)
+    with pytest.raises(UploadRejected) as e:
+        asyncio.run(spool_upload(declared, max_bytes=1000))
+    assert e.value.status_code == 413 and declared.bytes_read == 0
+
+    streamed = FakeUpload(b"%PDF-" + b"x" * 1_000_000)
+    with pytest.raises(UploadRejected) as e:
+        asyncio.run(spool_upload(streamed, max_bytes=100_000))
+    assert e.value.status_code == 413 and streamed.bytes_read < 200_000
+
+    image = FakeUpload(b"\x89PNG\r\n\x1a\n" + b"\x00" * 1_000_000)
+    with pytest.raises(UploadRejected) as e:
+        asyncio.run(spool_upload(image))
+    assert e.value.status_code == 415 and image.bytes_read == uploads.UPLOAD_CHUNK_BYTES
+
+    with pytest.raises(UploadRejected) as e:
+        asyncio.run(spool_upload(FakeUpload(_docx_bytes(document=False))))
+    assert e.value.status_code == 415
+
+    with pytest.raises(UploadRejected) as e:
+        asyncio.run(spool_upload(FakeUpload(b"")))
+    assert e.value.status_code == 400
+
+
+def test_content_length_is_checked_before_the_body_is_read():
+    check_content_length(None, max_bytes=1000)  # chunked: left to spool_upload
+    check_content_length(str(1000 + uploads.MULTIPART_OVERHEAD_BYTES), max_bytes=1000)
+
+    with pytest.raises(UploadRejected) as e:
+        check_content_length(str(1001 + uploads.MULTIPART_OVERHEAD_BYTES), max_bytes=1000)
+    assert e.value.status_code == 413
+
+    with pytest.raises(UploadRejected) as e:
+        check_content_length("lots")
+    assert e.value.status_code == 400
@@ -0,0 +1,32 @@
+"""
+Tests for the on-the-fly ZIP writer used by the export bundle endpoint.
+"""
+import io
+import zipfile
+
+from app.export.zip_stream import iter_zip
+
+
+def test_chunks_form_a_valid_archive():
+    entries = [("job_posting.txt", "Data Analyst at Acme"), ("pdf/resume_ats.pdf", b"%PDF-1.4 fake" * 100)]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip(entries))))
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ["job_posting.txt", "pdf/resume_ats.pdf"]
+    assert archive.read("pdf/resume_ats.pdf") == b"%PDF-1.4 fake" * 100
+
+
+def test_entries_are_streamed_as_they_are_produced():
+    """Each entry is flushed before the next is produced, so nothing accumulates."""
+    produced = []
+
+    def entries():
+        for i in range(3):
+            produced.append(i)
+            yield f"file_{i}.txt", f"content {i}" * 50
+
+    stream = iter_zip(entries())
+    next(stream)
+    assert produced == [0]
+    next(stream)
+    assert produced == [0, 1]